@@ -4,6 +4,7 @@
 """
 
 import streamlit as st
+from config import get_flag
 from style import (
     apply_common_style, 
     render_header, 
@@ -19,6 +20,13 @@ st.set_page_config(
     page_icon="🛣️"
 )
 
+# ==================== 워밍업 ====================
+# 엔진 / 후보 (설정 시 코스 / 경로 / TTS) 캐시를 백그라운드로 미리 준비 (프로세스당 1회, warmup.py)
+# 임베딩 등 유료 API를 호출하므로 배포 환경에서 WARMUP=1로 켤 때만
+if get_flag("WARMUP", False):
+    from warmup import start_warmup
+    start_warmup()
+
 # ==================== 초기화 ====================
 # 세션 상태 초기화 (사용자 선택 정보 저장)
 init_session_state()
@@ -0,0 +1,122 @@
+"""
+📋 구조화 로깅 (표준 logging 기반)
+- 요청 경로에서는 레코드를 큐에 넣기만 하고, 출력은 별도 스레드(QueueListener)가 담당
+- 레벨: LOG_LEVEL (기본 INFO), LOG_DEBUG=1이면 DEBUG (GPT 원본 응답 등 디버그 덤프)
+- 샘플링: LOG_SAMPLE_RATE (0~1, WARNING 미만 레코드에만 적용)
+- 큐 크기: LOG_QUEUE_SIZE (가득 차면 요청 경로를 막지 않고 버림)
+- 형식: LOG_FORMAT=text (기본, 기존 콘솔 출력과 같은 모양) / json (한 줄 JSON, extra 필드 포함)
+
+사용: logger = get_logger(__name__)
+      logger.debug("코스 %s 원본 응답:\n%s", course_id, content)  # 비활성 레벨이면 문자열 포맷 없음
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from config import get_flag, get_setting
+
+ROOT_LOGGER_NAME = "goungil"
+
+# LogRecord 기본 속성 (json 형식에서 extra 필드만 골라내기 위함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_setup_lock = threading.Lock()
+_listener = None
+
+
+class SamplingFilter(logging.Filter):
+    """WARNING 미만 레코드를 rate 비율만 통과 (경고 / 오류는 항상 기록)"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = min(max(rate, 0.0), 1.0)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON (시각, 레벨, 로거, 메시지 + extra 필드)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """레코드를 큐에 넣기만 하는 핸들러 (큐가 가득 차면 버리고 개수만 셈)"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 포맷은 리스너 스레드에서 (같은 프로세스이므로 메시지를 미리 합칠 필요 없음)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _level() -> int:
+    """LOG_DEBUG 우선, 없으면 LOG_LEVEL (잘못된 값은 INFO)"""
+    if get_flag("LOG_DEBUG", False):
+        return logging.DEBUG
+    level = logging.getLevelName(str(get_setting("LOG_LEVEL", "INFO")).upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def setup_logging() -> logging.Logger:
+    """루트 로거 1회 설정 (큐 핸들러 + 리스너 스레드)"""
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    with _setup_lock:
+        if _listener is not None:
+            return root
+
+        output = logging.StreamHandler(sys.stdout)
+        if get_setting("LOG_FORMAT", "text") == "json":
+            output.setFormatter(JsonFormatter())
+        else:
+            output.setFormatter(logging.Formatter("%(message)s"))
+
+        log_queue = queue.Queue(maxsize=int(get_setting("LOG_QUEUE_SIZE", "10000")))
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter(float(get_setting("LOG_SAMPLE_RATE", "1.0"))))
+
+        root.handlers = [handler]
+        root.setLevel(_level())
+        root.propagate = False
+
+        _listener = QueueListener(log_queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """goungil.<name> 로거 (처음 호출 시 설정)"""
+    setup_logging()
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
@@ -0,0 +1,115 @@
+"""
+🧮 임베딩 백엔드 벤치마크 (openai vs local)
+- 인덱싱 시간 (전체 문서 배치 임베딩)
+- 쿼리 지연 시간 (embed_query + 코사인 top-10)
+- 메모리 (벡터 크기 + 프로세스 RSS 증가량)
+- 백엔드 간 검색 결과 겹침 비율 (동행 × 테마 × 카테고리, 상위 10개)
+
+실행: python benchmarks/bench_embeddings.py [--backends local,openai]
+"""
+
+import argparse
+import os
+import resource
+import statistics
+import time
+
+import numpy as np
+
+from common import CATEGORIES, COMPANIONS, THEMES, load_documents, search_query
+
+from embedding_backends import create_embeddings
+
+
+def rss_mb() -> float:
+    """
+    프로세스 현재 RSS (MB)
+    ru_maxrss는 최대치라 같은 프로세스에서 두 번째 백엔드부터 증가량이 0이 되므로 /proc/self/statm 사용
+    (statm이 없는 OS에서는 최대 RSS로 근사)
+    """
+    try:
+        with open('/proc/self/statm', encoding='ascii') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(backend: str, documents):
+    """백엔드 하나에 대해 인덱싱/쿼리 측정 → 결과 dict"""
+    rss_before = rss_mb()
+
+    start = time.perf_counter()
+    embeddings = create_embeddings(backend, api_key=os.getenv("OPENAI_API_KEY"))
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = np.asarray(embeddings.embed_documents([d.page_content for d in documents]), dtype=np.float32)
+    index_s = time.perf_counter() - start
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+
+    categories = np.array([d.metadata['category'] for d in documents])
+    latencies = []
+    rankings = {}
+    for companion in COMPANIONS:
+        for theme in THEMES:
+            for category in CATEGORIES:
+                start = time.perf_counter()
+                query_vec = np.asarray(embeddings.embed_query(search_query(companion, theme, category)),
+                                       dtype=np.float32)
+                scores = matrix @ (query_vec / (np.linalg.norm(query_vec) + 1e-12))
+                scores[categories != category] = -np.inf
+                top = np.argsort(-scores)[:10]
+                latencies.append((time.perf_counter() - start) * 1000)
+                rankings[(companion, theme, category)] = [documents[i].metadata['title'] for i in top]
+
+    latencies.sort()
+    return {
+        'backend': backend,
+        'dim': matrix.shape[1],
+        'model_load_s': load_s,
+        'index_s': index_s,
+        'query_p50_ms': statistics.median(latencies),
+        'query_p95_ms': latencies[int(len(latencies) * 0.95)],
+        'vector_mb': matrix.nbytes / 1024 / 1024,
+        'rss_delta_mb': rss_mb() - rss_before,
+        'rankings': rankings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 백엔드 벤치마크")
+    parser.add_argument("--backends", default="local,openai")
+    args = parser.parse_args()
+
+    documents = load_documents()
+    results = []
+    for backend in args.backends.split(','):
+        if backend == "openai" and not os.getenv("OPENAI_API_KEY"):
+            print("⚠️ OPENAI_API_KEY가 없어 openai 백엔드를 건너뜁니다.")
+            continue
+        try:
+            results.append(run_backend(backend, documents))
+        except ImportError as e:
+            print(f"⚠️ {backend} 백엔드를 건너뜁니다: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"📊 임베딩 백엔드 비교 (문서 {len(documents)}개)")
+    print("=" * 60)
+    for r in results:
+        print(f"  [{r['backend']}] dim={r['dim']} | 모델 로드 {r['model_load_s']:.2f}s | "
+              f"인덱싱 {r['index_s']:.2f}s | 쿼리 p50 {r['query_p50_ms']:.1f}ms / p95 {r['query_p95_ms']:.1f}ms | "
+              f"벡터 {r['vector_mb']:.2f}MB | RSS +{r['rss_delta_mb']:.0f}MB")
+
+    if len(results) == 2:
+        base, other = results
+        overlaps = [
+            len(set(base['rankings'][key]) & set(other['rankings'][key])) / 10
+            for key in base['rankings']
+        ]
+        print(f"\n  🔁 상위 10개 겹침 ({base['backend']} vs {other['backend']}): "
+              f"평균 {statistics.mean(overlaps):.0%} / 최소 {min(overlaps):.0%}")
+
+
+if __name__ == "__main__":
+    main()
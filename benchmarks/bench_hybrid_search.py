@@ -0,0 +1,94 @@
+"""
+🔎 하이브리드 검색 벤치마크
+- BM25 인덱스 생성 / 쿼리 지연 시간 측정 (API 불필요)
+- OPENAI_API_KEY가 있으면 기존 MMR 결과와 하이브리드 결과 비교
+  (겹침 비율, 상위 10개 중 테마 키워드 포함 비율)
+
+실행: python benchmarks/bench_hybrid_search.py
+"""
+
+import os
+import time
+import statistics
+
+from common import (CATEGORIES, COMPANIONS, DATA_PATHS, THEMES,
+                    load_documents, search_query)
+
+from lexical_index import LexicalIndex
+from rag_engine import THEME_KEYWORDS, TourRecommendationEngine
+
+
+def keyword_hit_rate(docs, theme):
+    """상위 문서 중 테마 키워드가 제목/태그에 포함된 비율"""
+    if not docs:
+        return 0.0
+    keywords = THEME_KEYWORDS.get(theme, [theme])
+    hits = sum(
+        1 for doc in docs
+        if any(kw in doc.metadata.get('title', '') + doc.metadata.get('tags', '') for kw in keywords)
+    )
+    return hits / len(docs)
+
+
+def bench_lexical(documents):
+    """BM25 생성/쿼리 지연 시간"""
+    start = time.perf_counter()
+    index = LexicalIndex.from_documents(documents)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for theme in THEMES:
+        query = " ".join([theme] + THEME_KEYWORDS[theme])
+        for category in CATEGORIES:
+            for _ in range(200):
+                start = time.perf_counter()
+                index.search(query, top_k=50, category=category)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    print("\n" + "=" * 60)
+    print("⚡ BM25 인덱스")
+    print("=" * 60)
+    print(f"  문서 수: {len(documents)} / 토큰 수: {len(index.postings)}")
+    print(f"  인덱스 생성: {build_ms:.2f}ms")
+    print(f"  쿼리 p50: {statistics.median(latencies):.3f}ms / "
+          f"p95: {latencies[int(len(latencies) * 0.95)]:.3f}ms")
+
+
+def bench_against_mmr():
+    """기존 MMR 후보 vs 하이브리드 후보 비교 (OpenAI 임베딩 필요)"""
+    engine = TourRecommendationEngine()
+    engine.load_json_with_dedup(*DATA_PATHS)
+    engine.setup_vectorstore()
+
+    print("\n" + "=" * 60)
+    print("📊 MMR vs 하이브리드 (상위 10개)")
+    print("=" * 60)
+
+    for companion in COMPANIONS:
+        for theme in THEMES:
+            for category in CATEGORIES:
+                query = search_query(companion, theme, category)
+                retriever = engine.vectorstore.as_retriever(
+                    search_type="mmr",
+                    search_kwargs={"k": 50, "fetch_k": 100, "lambda_mult": 0.7,
+                                   "filter": {"category": category}}
+                )
+                mmr = retriever.invoke(query)
+                hybrid = engine.hybrid_candidates(theme, category, mmr, k=50)
+
+                mmr_top = {d.metadata['title'] for d in mmr[:10]}
+                hybrid_top = {d.metadata['title'] for d in hybrid[:10]}
+                overlap = len(mmr_top & hybrid_top) / max(len(mmr_top), 1)
+                print(f"  {companion}/{theme}/{category}: 겹침 {overlap:.0%} | "
+                      f"키워드 적중 MMR {keyword_hit_rate(mmr[:10], theme):.0%} → "
+                      f"하이브리드 {keyword_hit_rate(hybrid[:10], theme):.0%}")
+
+
+if __name__ == "__main__":
+    bench_lexical(load_documents())
+
+    if os.getenv("OPENAI_API_KEY"):
+        bench_against_mmr()
+    else:
+        print("\n⚠️ OPENAI_API_KEY가 없어 MMR 비교를 건너뜁니다.")
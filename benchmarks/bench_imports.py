@@ -0,0 +1,113 @@
+"""
+💤 페이지별 임포트 시간 프로파일 (-X importtime)
+- 각 페이지 상단(모듈 수준)의 import 문만 새 프로세스에서 실행 (streamlit 임포트는 기준선으로 제외)
+- 페이지별 임포트 합계 + 패키지별(최상위 이름) self 시간 상위 목록
+- 결과 JSON 저장 + 기준 결과와 비교해 페이지 임포트 시간 회귀 시 종료 코드 1
+
+실행: python benchmarks/bench_imports.py [--pages app.py pages/5_map.py] [--repeat 3] [--top 8]
+      [--output imports.json] [--compare baseline.json --threshold 0.2]
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import statistics
+import sys
+from collections import defaultdict
+
+from common import ROOT_DIR, import_profile
+
+BASELINE = "import streamlit"
+
+
+def page_imports(path: str) -> str:
+    """페이지의 모듈 수준 import 문 (try 블록 안 포함, 함수 안의 지연 임포트 제외)"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    statements = []
+    for node in tree.body:
+        nodes = node.body if isinstance(node, ast.Try) else [node]
+        for child in nodes:
+            if isinstance(child, (ast.Import, ast.ImportFrom)):
+                statements.append(ast.unparse(child))
+    return "\n".join(statements)
+
+
+def profile_page(path: str, repeat: int):
+    """→ (임포트 합계 중앙값 ms, 패키지별 self 시간 ms)"""
+    statement = page_imports(path)
+    totals = []
+    packages = defaultdict(list)
+    for _ in range(repeat):
+        entries = import_profile(statement, setup=BASELINE)
+        # 깊이 0 항목의 누적 시간 합 = 이 페이지가 추가로 임포트한 시간
+        totals.append(sum(cumulative for _, _, cumulative, depth in entries if depth == 0) / 1000)
+        per_package = defaultdict(int)
+        for name, self_us, _, _ in entries:
+            per_package[name.split(".")[0]] += self_us
+        for package, self_us in per_package.items():
+            packages[package].append(self_us / 1000)
+    return statistics.median(totals), {package: statistics.median(values) for package, values in packages.items()}
+
+
+def main():
+    default_pages = ["app.py"] + sorted(os.path.relpath(p, ROOT_DIR) for p in glob.glob(os.path.join(ROOT_DIR, "pages", "*.py")))
+    parser = argparse.ArgumentParser(description="페이지별 임포트 시간 프로파일")
+    parser.add_argument("--pages", nargs="*", default=default_pages, help="저장소 루트 기준 경로")
+    parser.add_argument("--repeat", type=int, default=3, help="페이지별 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=5, help="페이지별로 보여줄 패키지 수")
+    parser.add_argument("--output", default="")
+    parser.add_argument("--compare", default="", help="기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 임포트 시간 회귀 비율")
+    parser.add_argument("--min-delta-ms", type=float, default=20.0, help="회귀로 보는 최소 증가량(ms)")
+    args = parser.parse_args()
+
+    baseline_ms = statistics.median(
+        sum(cumulative for _, _, cumulative, depth in import_profile(BASELINE) if depth == 0) / 1000
+        for _ in range(args.repeat)
+    )
+
+    results = {'baseline': {'statement': BASELINE, 'import_ms': round(baseline_ms, 1)}, 'pages': {}}
+    print("\n" + "=" * 60)
+    print(f"💤 페이지별 임포트 시간 (기준선 '{BASELINE}' {baseline_ms:.0f}ms 제외, {args.repeat}회 중앙값)")
+    print("=" * 60)
+    for page in args.pages:
+        try:
+            total_ms, packages = profile_page(os.path.join(ROOT_DIR, page), args.repeat)
+        except RuntimeError as e:
+            print(f"  {page:<22} ⚠️ 측정 실패: {e}")
+            continue
+        top = sorted(packages.items(), key=lambda item: -item[1])[:args.top]
+        results['pages'][page] = {
+            'import_ms': round(total_ms, 1),
+            'top_packages': {package: round(ms, 1) for package, ms in top},
+        }
+        print(f"  {page:<22} {total_ms:>8.1f}ms  " + ", ".join(f"{package} {ms:.0f}ms" for package, ms in top))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = []
+        for page, current in results['pages'].items():
+            base = baseline.get('pages', {}).get(page)
+            if not base or base['import_ms'] <= 0:
+                continue
+            ratio = current['import_ms'] / base['import_ms'] - 1
+            if ratio > args.threshold and current['import_ms'] - base['import_ms'] >= args.min_delta_ms:
+                regressions.append((page, base['import_ms'], current['import_ms'], ratio))
+        for page, base_ms, current_ms, ratio in regressions:
+            print(f"❌ 회귀: {page} 임포트 {base_ms:.1f}ms → {current_ms:.1f}ms (+{ratio:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ 기준 대비 임포트 시간 회귀 없음 (허용 {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+👥 다중 사용자 부하 테스트 (Streamlit AppTest, 헤드리스)
+- 가상 사용자 N명이 app → 동행 → 테마 → 지역 → 추천 → 상세 지도 흐름 실행
+- AppTest는 전역 Runtime / secrets를 바꾸므로 한 프로세스에서 동시에 돌릴 수 없음
+  → 워커 프로세스 --concurrency개가 동시에 실행, 워커마다 엔진 1개를 세션들이 공유
+- 엔진은 가짜 LLM / 임베딩으로 만든 인스턴스 주입, ORS는 FakeORSClient로 대체 (지연 주입 가능)
+- 페이지별 렌더링 지연 p50 / p95, st.rerun 횟수, 세션당 CPU 시간 / 최대 RSS 증가량
+
+실행: python benchmarks/bench_load.py --users 20 --concurrency 4 [--llm-latency 1.0] [--output load.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# 영속 캐시 / 작업 결과 저장소 / 외부 API 속도 제한은 끄고 매번 실제로 생성
+os.environ.setdefault("LLM_CACHE", "0")
+os.environ.setdefault("RATE_LIMIT", "0")
+os.environ.setdefault("COURSE_JOB_DB", ":memory:")
+# 백그라운드 워밍업이 측정 대상 요청과 겹치지 않도록
+os.environ.setdefault("WARMUP", "0")
+
+from common import COMPANIONS, DATA_PATHS, ROOT_DIR, THEMES, percentile
+from fakes import FakeChatModel, FakeEmbeddings, FakeORSClient
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from slot_extractor import SEOUL_DISTRICTS
+
+RERUN_COUNTER_KEY = "_load_test_reruns"
+
+
+def install_fakes(args):
+    """공용 엔진 / ORS 클라이언트를 가짜로 교체"""
+    import openrouteservice
+    import engine_provider
+    from rag_engine import TourRecommendationEngine
+
+    engine = TourRecommendationEngine(
+        llm=FakeChatModel("gpt-5.1", latency=args.llm_latency),
+        rerank_llm=FakeChatModel("gpt-4o-mini", latency=args.rerank_latency),
+        embeddings=FakeEmbeddings(latency=args.embed_latency),
+    )
+    engine.load_json_with_dedup(*DATA_PATHS)
+    engine.load_place_snippets()
+    engine.setup_vectorstore()
+    engine_provider.set_recommender(engine)
+
+    openrouteservice.Client = lambda key=None, **kwargs: FakeORSClient(key, latency=args.ors_latency)
+
+
+def install_rerun_counter():
+    """st.rerun 호출 횟수를 세션별로 기록 (원래 동작은 그대로)"""
+    original_rerun = st.rerun
+
+    def counting_rerun(*args, **kwargs):
+        st.session_state[RERUN_COUNTER_KEY] = st.session_state.get(RERUN_COUNTER_KEY, 0) + 1
+        return original_rerun(*args, **kwargs)
+
+    st.rerun = counting_rerun
+
+
+class VirtualUser:
+    """가상 사용자 1명의 페이지 흐름"""
+
+    def __init__(self, user_id: int, timeout: float, seed: int, poll_interval: float = 0.2):
+        rng = random.Random(seed + user_id)
+        self.user_id = user_id
+        self.companion = rng.choice(COMPANIONS)
+        self.theme_index = rng.randrange(len(THEMES))
+        self.region_index = rng.randrange(len(SEOUL_DISTRICTS))
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.polls = 0
+        self.at = AppTest.from_file(os.path.join(ROOT_DIR, "app.py"), default_timeout=timeout)
+        self.at.secrets["OPENROUTESERVICE_API_KEY"] = "fake"
+        self.timings = {}
+        self.reruns = {}
+
+    def _reruns(self) -> int:
+        try:
+            return self.at.session_state[RERUN_COUNTER_KEY]
+        except KeyError:
+            return 0
+
+    def _step(self, name: str, action, until=None) -> None:
+        before = self._reruns()
+        started = time.perf_counter()
+        action()
+        self.at.run()
+        if until is not None:
+            until()
+        self.timings[name] = (time.perf_counter() - started) * 1000
+        self.reruns[name] = self._reruns() - before
+        if self.at.exception:
+            raise RuntimeError(f"{name}: {self.at.exception[0].message}")
+
+    def _has_button(self, key: str) -> bool:
+        try:
+            self.at.button(key=key)
+            return True
+        except KeyError:
+            return False
+
+    def _poll_until_button(self, page: str, key: str) -> None:
+        """st.fragment(run_every) 주기 재실행 대신 page를 직접 재실행하며 버튼이 나타날 때까지 대기"""
+        self.at.switch_page(page)
+        deadline = time.perf_counter() + self.timeout
+        while not self._has_button(key):
+            if self.at.exception or time.perf_counter() > deadline:
+                return
+            time.sleep(self.poll_interval)
+            self.at.run()
+            self.polls += 1
+
+    def run(self) -> None:
+        at = self.at
+        self._step("app", lambda: None)
+        self._step("companion", lambda: at.switch_page("pages/1_companion.py"))
+        # 동행 선택은 이미지 버튼(커스텀 컴포넌트)이라 세션 상태로 지정
+        at.session_state["companion"] = self.companion
+        self._step("travel", lambda: at.switch_page("pages/2_travel.py"))
+        # 버튼 클릭 → 페이지 내 switch_page로 다음 페이지까지 렌더링, 이후 AppTest 경로 동기화
+        self._step("region", lambda: at.button(key=f"travel_{self.theme_index}").click())
+        at.switch_page("pages/3_region.py")
+        # 추천 페이지는 작업 큐 결과를 폴링 → 카드 버튼이 나타날 때까지 포함
+        self._step("rec", lambda: at.button(key=f"region_{self.region_index}").click(),
+                   until=lambda: self._poll_until_button("pages/4_rec.py", "btn_1"))
+        self._step("map", lambda: at.button(key="btn_1").click())
+
+
+def init_worker(args):
+    """워커 프로세스 준비 (가짜 엔진 / ORS, rerun 카운터)"""
+    install_fakes(args)
+    install_rerun_counter()
+
+
+def run_user(user_id: int, timeout: float, seed: int, poll_interval: float) -> dict:
+    """가상 사용자 1명 실행 → 페이지별 시간 / rerun / 세션 CPU / RSS 증가"""
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cpu_before = time.process_time()
+    main_module = sys.modules['__main__']
+    user = VirtualUser(user_id, timeout, seed, poll_interval)
+    error = None
+    try:
+        user.run()
+    except Exception as e:
+        traceback.print_exc()
+        error = str(e)
+    finally:
+        # 스크립트 실행기가 __main__을 페이지 모듈로 바꿈 → 다음 작업을 unpickle할 수 있도록 복원
+        sys.modules['__main__'] = main_module
+    return {
+        'user': user_id,
+        'timings': user.timings,
+        'reruns': user.reruns,
+        'polls': user.polls,
+        # 워커 프로세스 안에서는 세션이 하나씩 실행되므로 프로세스 CPU 증가분 = 세션 CPU (엔진 백그라운드 스레드 포함)
+        'cpu_s': time.process_time() - cpu_before,
+        'rss_growth_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before,
+        'error': error,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 페이지 다중 사용자 부하 테스트")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 실행 워커 프로세스 수")
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    parser.add_argument("--rerank-latency", type=float, default=0.0)
+    parser.add_argument("--embed-latency", type=float, default=0.0)
+    parser.add_argument("--ors-latency", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="페이지 실행 1회 제한 시간(초)")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="추천 작업 폴링 간격(초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+
+    timings = defaultdict(list)
+    reruns = defaultdict(int)
+    sessions = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.concurrency, initializer=init_worker, initargs=(args,)) as executor:
+        futures = [executor.submit(run_user, i, args.timeout, args.seed, args.poll_interval) for i in range(args.users)]
+        for future in as_completed(futures):
+            session = future.result()
+            sessions.append(session)
+            for name, value in session['timings'].items():
+                timings[name].append(value)
+            for name, value in session['reruns'].items():
+                reruns[name] += value
+    wall_s = time.perf_counter() - started
+
+    failures = [{'user': s['user'], 'error': s['error']} for s in sessions if s['error']]
+    cpu_values = [s['cpu_s'] * 1000 for s in sessions]
+    rss_values = [s['rss_growth_kb'] / 1024 for s in sessions]
+    results = {
+        'config': {k: v for k, v in vars(args).items() if k != 'output'},
+        'wall_s': round(wall_s, 2),
+        'failures': failures,
+        'pages': {
+            name: {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 50), 1),
+                'p95_ms': round(percentile(values, 95), 1),
+                'reruns': reruns[name],
+            }
+            for name, values in timings.items()
+        },
+        'per_session': {
+            'cpu_p50_ms': round(percentile(cpu_values, 50), 1),
+            'cpu_p95_ms': round(percentile(cpu_values, 95), 1),
+            # 최대 RSS는 줄지 않으므로 워커의 첫 세션에 엔진 준비 이후 증가분이 몰림
+            'max_rss_growth_mb': round(max(rss_values, default=0.0), 1),
+            'rec_polls': sum(s['polls'] for s in sessions) / max(len(sessions), 1),
+        },
+    }
+
+    print("\n" + "=" * 60)
+    print(f"👥 부하 테스트: 사용자 {args.users}명 (동시 {args.concurrency}), {wall_s:.1f}s, 실패 {len(failures)}건")
+    print("=" * 60)
+    for name, stat in results['pages'].items():
+        print(f"  {name:<10} n={stat['count']:<4} p50 {stat['p50_ms']:>8.1f}ms  p95 {stat['p95_ms']:>8.1f}ms  rerun {stat['reruns']}")
+    print(f"  세션당 CPU: {results['per_session']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+🏁 추천 파이프라인 오프라인 벤치마크 (OpenAI / ORS 호출 없음)
+- 동행 × 테마 × 지역 전체 조합에 대해 iter_courses 실행 (가짜 LLM / 임베딩 / ORS, 지연 주입 가능)
+- 단계별(span) p50 / p95, 첫 카드까지 시간, 전체 시간
+- 메모리 최고치 (max RSS, --tracemalloc 시 Python 할당 최고치), rag_engine 임포트 시간
+- 결과 JSON 저장 + 기준 결과와 비교해 p95 회귀 시 종료 코드 1
+
+실행: python benchmarks/bench_pipeline.py [--llm-latency 0.5] [--regions 종로구 중구]
+      [--output results.json] [--compare baseline.json --threshold 0.2]
+녹화: python benchmarks/bench_pipeline.py --record fixtures.json --regions 종로구  (실제 LLM 호출, 1회)
+      → python benchmarks/bench_pipeline.py --fixtures fixtures.json --regions 종로구
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+# 영속 LLM 캐시 / 외부 API 속도 제한은 끄고, 단계별 시간은 tracing span으로 수집
+os.environ.setdefault("LLM_CACHE", "0")
+os.environ.setdefault("RATE_LIMIT", "0")
+os.environ.setdefault("TRACING", "1")
+
+from common import COMPANIONS, DATA_PATHS, THEMES, import_time, percentile
+from fakes import FakeChatModel, FakeEmbeddings, FakeORSClient, RecordingChatModel, load_fixtures
+
+from slot_extractor import SEOUL_DISTRICTS
+
+
+def recording_models(path: str):
+    """실제 ChatOpenAI(gpt-5.1 / gpt-4o-mini) 응답을 path에 녹화하는 모델 쌍 (임베딩 / ORS는 가짜 그대로)"""
+    from langchain_openai import ChatOpenAI
+
+    from config import get_setting
+
+    api_key = get_setting("OPENAI_API_KEY")
+    if not api_key:
+        sys.exit("❌ --record에는 OPENAI_API_KEY가 필요합니다.")
+    # 재생 때와 같은 프롬프트가 나오도록 임베딩은 가짜(결정적) 그대로 두고 LLM만 실제 호출
+    fixtures = load_fixtures(path)
+    llm = RecordingChatModel(ChatOpenAI(model="gpt-5.1", temperature=0.7, api_key=api_key), path, fixtures)
+    rerank_llm = RecordingChatModel(ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key), path, fixtures)
+    return llm, rerank_llm
+
+
+def build_engine(args):
+    from rag_engine import TourRecommendationEngine
+
+    if args.record:
+        llm, rerank_llm = recording_models(args.record)
+    else:
+        fixtures = load_fixtures(args.fixtures)
+        llm = FakeChatModel("gpt-5.1", latency=args.llm_latency, fixtures=fixtures)
+        rerank_llm = FakeChatModel("gpt-4o-mini", latency=args.rerank_latency, fixtures=fixtures)
+    engine = TourRecommendationEngine(
+        llm=llm,
+        rerank_llm=rerank_llm,
+        embeddings=FakeEmbeddings(size=args.embedding_dim, latency=args.embed_latency),
+    )
+    engine.load_json_with_dedup(*DATA_PATHS)
+    engine.load_place_snippets()
+    engine.setup_vectorstore()
+    return engine
+
+
+def route_coordinates(course):
+    """4_rec.py와 같은 순서의 [lng, lat] 좌표"""
+    coordinates = []
+    for category in course.get('optimized_order', ['tour', 'cafe', 'restaurant']):
+        coords = course[category].get('coordinates', {})
+        if coords.get('latitude') and coords.get('longitude'):
+            coordinates.append([float(coords['longitude']), float(coords['latitude'])])
+    return coordinates
+
+
+def run_once(engine, ors_client, companion, theme, region):
+    """조합 1개 실행 → (span 목록, 첫 카드까지 시간, 전체 시간)"""
+    from tracing import span, tracer
+
+    started = time.perf_counter()
+    first_card = None
+    completed = []
+    with span("bench_run", companion=companion, theme=theme, region=region) as run_span:
+        for course in engine.iter_courses(companion, [theme], region):
+            if first_card is None:
+                first_card = time.perf_counter() - started
+            if course['explanation_ready']:
+                completed.append(course)
+
+        # 결과 페이지처럼 코스별 도보 거리 계산
+        for course in completed:
+            with span("ors.directions", points=3):
+                ors_client.directions(coordinates=route_coordinates(course))
+    total = time.perf_counter() - started
+    return tracer.get_trace(run_span.trace_id), first_card or total, total
+
+
+def summarize(values_ms):
+    return {
+        'count': len(values_ms),
+        'p50_ms': round(percentile(values_ms, 50), 2),
+        'p95_ms': round(percentile(values_ms, 95), 2),
+        'mean_ms': round(sum(values_ms) / len(values_ms), 2) if values_ms else 0.0,
+    }
+
+
+def compare(results, baseline_path, threshold, min_delta_ms):
+    """기준 결과 대비 p95가 threshold 이상, min_delta_ms 이상 느려진 단계 목록 (1ms 미만 잡음 제외)"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for section in ('stages', 'request'):
+        for name, current in results[section].items():
+            base = baseline.get(section, {}).get(name)
+            if not base or base['p95_ms'] <= 0:
+                continue
+            ratio = current['p95_ms'] / base['p95_ms'] - 1
+            if ratio > threshold and current['p95_ms'] - base['p95_ms'] >= min_delta_ms:
+                regressions.append((name, base['p95_ms'], current['p95_ms'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추천 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="gpt-5.1 대역 호출당 지연(초)")
+    parser.add_argument("--rerank-latency", type=float, default=0.0, help="gpt-4o-mini 대역 호출당 지연(초)")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="임베딩 호출당 지연(초)")
+    parser.add_argument("--ors-latency", type=float, default=0.0, help="ORS 호출당 지연(초)")
+    parser.add_argument("--embedding-dim", type=int, default=256)
+    parser.add_argument("--regions", nargs="*", default=SEOUL_DISTRICTS)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--fixtures", default="", help="--record로 녹화한 응답 JSON")
+    parser.add_argument("--record", default="", metavar="PATH",
+                        help="실제 OpenAI 호출 응답을 PATH에 녹화 (OPENAI_API_KEY 필요, 이후 --fixtures PATH로 재생)")
+    parser.add_argument("--tracemalloc", action="store_true", help="Python 할당 최고치 측정 (느려짐)")
+    parser.add_argument("--output", default="")
+    parser.add_argument("--compare", default="", help="기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 p95 회귀 비율")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="회귀로 보는 최소 p95 증가량(ms)")
+    args = parser.parse_args()
+
+    rag_import_s = import_time("import rag_engine")
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    setup_started = time.perf_counter()
+    engine = build_engine(args)
+    setup_s = time.perf_counter() - setup_started
+    ors_client = FakeORSClient(latency=args.ors_latency)
+
+    stage_ms = defaultdict(list)
+    request_ms = defaultdict(list)
+    grid = [(c, t, r) for c in COMPANIONS for t in THEMES for r in args.regions]
+    for _ in range(args.repeat):
+        for companion, theme, region in grid:
+            spans, first_card, total = run_once(engine, ors_client, companion, theme, region)
+            for item in spans:
+                if item['duration_ms'] is not None and item['name'] != "bench_run":
+                    stage_ms[item['name']].append(item['duration_ms'])
+            request_ms['first_card'].append(first_card * 1000)
+            request_ms['total'].append(total * 1000)
+
+    results = {
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'threshold', 'min_delta_ms')},
+        'runs': len(grid) * args.repeat,
+        'import_time_s': round(rag_import_s, 3),
+        'setup_s': round(setup_s, 3),
+        'stages': {name: summarize(values) for name, values in sorted(stage_ms.items())},
+        'request': {name: summarize(values) for name, values in request_ms.items()},
+        'memory': {
+            # Linux ru_maxrss 단위는 KB
+            'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+        'llm_calls': {'courses_and_explanations': engine.llm.calls, 'rerank': engine.rerank_llm.calls},
+    }
+    if args.tracemalloc:
+        results['memory']['tracemalloc_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+
+    print("\n" + "=" * 60)
+    print(f"🏁 파이프라인 벤치마크 ({results['runs']}회, 임포트 {rag_import_s:.2f}s, 준비 {setup_s:.2f}s)")
+    print("=" * 60)
+    for name, stat in list(results['stages'].items()) + list(results['request'].items()):
+        print(f"  {name:<22} n={stat['count']:<5} p50 {stat['p50_ms']:>9.2f}ms  p95 {stat['p95_ms']:>9.2f}ms")
+    print(f"  메모리 최고치: {results['memory']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold, args.min_delta_ms)
+        for name, base, current, ratio in regressions:
+            print(f"❌ 회귀: {name} p95 {base:.2f}ms → {current:.2f}ms (+{ratio:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ 기준 대비 p95 회귀 없음 (허용 {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+📦 압축 벡터 저장소 벤치마크
+- 설정별 메모리 (원본 float32 대비 축소 배율)
+- 원본 벡터 정확 검색 대비 recall@10 (재점수화 유무)
+
+임베딩 입력 (우선순위):
+  1. --embeddings docs.npy [--queries queries.npy]
+  2. OPENAI_API_KEY가 있으면 text-embedding-3-large로 실제 데이터 임베딩
+  3. 없으면 합성 벡터 (저차원 구조 + 노이즈, 경향 확인용)
+
+실행: python benchmarks/bench_quantized_index.py
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from common import CATEGORIES, COMPANIONS, THEMES, load_documents, search_query
+
+from vector_index import CompactVectorMatrix, normalize_rows
+
+CONFIGS = [
+    (None, None), (1024, None), (512, None), (256, None),
+    (None, "int8"), (512, "int8"), (256, "int8"),
+]
+
+
+def load_vectors(args):
+    """(문서 벡터, 쿼리 벡터, 출처 설명)"""
+    if args.embeddings:
+        docs = np.load(args.embeddings)
+        queries = np.load(args.queries) if args.queries else docs[:: max(len(docs) // 36, 1)]
+        return docs, queries, args.embeddings
+
+    if os.getenv("OPENAI_API_KEY"):
+        from embedding_backends import create_embeddings
+        embeddings = create_embeddings("openai", api_key=os.getenv("OPENAI_API_KEY"))
+        docs = np.asarray(embeddings.embed_documents([d.page_content for d in load_documents()]))
+        queries = np.asarray(embeddings.embed_documents([
+            search_query(c, t, cat) for c in COMPANIONS for t in THEMES for cat in CATEGORIES
+        ]))
+        return docs, queries, "text-embedding-3-large"
+
+    rng = np.random.default_rng(0)
+    basis = rng.normal(size=(32, 3072))
+    docs = rng.normal(size=(102, 32)) @ basis + rng.normal(scale=2.0, size=(102, 3072))
+    queries = docs[rng.choice(len(docs), 36)] + rng.normal(scale=4.0, size=(36, 3072))
+    return docs, queries, "합성 벡터"
+
+
+def recall_at_k(index, queries, truth, k, rescore):
+    hits = 0
+    for query, expected in zip(queries, truth):
+        found, _ = index.search(query, k=k, rescore=rescore)
+        hits += len(set(found.tolist()) & expected)
+    return hits / (len(queries) * k)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="압축 벡터 저장소 벤치마크")
+    parser.add_argument("--embeddings")
+    parser.add_argument("--queries")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    docs, queries, source = load_vectors(args)
+    docs = docs.astype(np.float32)
+    full = normalize_rows(docs)
+    truth = [set(np.argsort(-(full @ normalize_rows(q)))[:args.k].tolist()) for q in queries]
+    baseline_bytes = full.nbytes
+
+    print("\n" + "=" * 60)
+    print(f"📦 압축 벡터 저장소 ({source}, 문서 {len(docs)}개 × {docs.shape[1]}차원)")
+    print("=" * 60)
+    for dim, quantize in CONFIGS:
+        index = CompactVectorMatrix(docs, dim=dim, quantize=quantize, rescore_vectors=full)
+        label = f"{index.dim}차원 {quantize or 'float32'}"
+        print(f"  {label:<16} | {index.nbytes / 1024:8.1f}KB (×{baseline_bytes / index.nbytes:4.1f} 축소) | "
+              f"recall@{args.k} {recall_at_k(index, queries, truth, args.k, rescore=False):.3f} | "
+              f"재점수화 {recall_at_k(index, queries, truth, args.k, rescore=True):.3f}")
+
+
+if __name__ == "__main__":
+    main()
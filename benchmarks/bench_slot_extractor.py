@@ -0,0 +1,54 @@
+"""
+🧩 규칙 기반 슬롯 추출 벤치마크
+- 발화 예시별 추출 지연 시간 (마이크로초)
+- fast path 적중률 (LLM fallback이 필요한 비율)
+
+실행: python benchmarks/bench_slot_extractor.py
+"""
+
+import statistics
+import time
+
+import common  # noqa: F401 (저장소 루트를 sys.path에 추가)
+
+from slot_extractor import SlotExtractionStats, extract_slots, resolve_user_info
+import slot_extractor
+
+UTTERANCES = [
+    "예술 전시를 보러 종로구에 가고 싶어요",
+    "유모차를 끌고 공원 산책하러 강남구에 갈래요",
+    "휠체어 타고 고궁 구경하고 싶어요",
+    "부모님 모시고 마포구 가려고요",
+    "아이랑 체험할 수 있는 곳이요",
+    "종로요",
+    "송파구",
+    "할머니랑 한옥마을 가고 싶어",
+    "전통이요",
+    "노원구나 도봉구 쪽이요",
+    "음 잘 모르겠어요",
+    "어르신이랑 미술관",
+]
+
+
+def main():
+    latencies = []
+    for text in UTTERANCES:
+        for _ in range(1000):
+            start = time.perf_counter()
+            extract_slots(text)
+            latencies.append((time.perf_counter() - start) * 1e6)
+
+    slot_extractor.stats = SlotExtractionStats()
+    for text in UTTERANCES:
+        resolve_user_info(text, lambda _: {})
+
+    latencies.sort()
+    print("\n" + "=" * 60)
+    print(f"🧩 규칙 기반 슬롯 추출 (발화 {len(UTTERANCES)}개)")
+    print("=" * 60)
+    print(f"  지연 p50 {statistics.median(latencies):.1f}µs / p95 {latencies[int(len(latencies) * 0.95)]:.1f}µs")
+    print(f"  {slot_extractor.stats.summary()}")
+
+
+if __name__ == "__main__":
+    main()
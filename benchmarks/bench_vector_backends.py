@@ -0,0 +1,108 @@
+"""
+⚖️ 벡터 인덱스 백엔드 벤치마크 (Chroma vs 내장 NumPy)
+- 임포트 시간 (별도 프로세스에서 측정)
+- 인덱스 생성 시간 (임베딩 시간 제외: 사전 계산된 벡터 사용)
+- MMR 쿼리 지연 시간 (k=50, fetch_k=100, 카테고리 필터)
+- NumPy 인덱스 .npy 저장/로드 시간
+
+OPENAI_API_KEY가 없으면 결정적 가짜 임베딩(3072차원)을 사용합니다.
+
+실행: python benchmarks/bench_vector_backends.py
+"""
+
+import os
+import statistics
+import tempfile
+import time
+
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+
+from common import CATEGORIES, COMPANIONS, THEMES, import_time, load_documents, search_query
+
+from vector_index import NumpyVectorStore
+
+SEARCH_KWARGS = {"k": 50, "fetch_k": 100, "lambda_mult": 0.7}
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """한 번 계산한 벡터를 재사용 (백엔드 오버헤드만 측정)"""
+
+    def __init__(self, base: Embeddings):
+        self.base = base
+        self.cache = {}
+
+    def embed_documents(self, texts):
+        missing = [t for t in texts if t not in self.cache]
+        if missing:
+            self.cache.update(zip(missing, self.base.embed_documents(missing)))
+        return [self.cache[t] for t in texts]
+
+    def embed_query(self, text):
+        if text not in self.cache:
+            self.cache[text] = self.base.embed_query(text)
+        return self.cache[text]
+
+
+def query_latencies(store) -> list:
+    latencies = []
+    for companion in COMPANIONS:
+        for theme in THEMES:
+            for category in CATEGORIES:
+                retriever = store.as_retriever(search_type="mmr",
+                                               search_kwargs={**SEARCH_KWARGS, "filter": {"category": category}})
+                start = time.perf_counter()
+                retriever.invoke(search_query(companion, theme, category))
+                latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def report(name, build_s, latencies):
+    print(f"  [{name}] 생성 {build_s * 1000:.1f}ms | MMR 쿼리 p50 {statistics.median(latencies):.2f}ms / "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.2f}ms")
+
+
+def main():
+    documents = load_documents()
+
+    if os.getenv("OPENAI_API_KEY"):
+        from embedding_backends import create_embeddings
+        base = create_embeddings("openai", api_key=os.getenv("OPENAI_API_KEY"))
+    else:
+        base = DeterministicFakeEmbedding(size=3072)
+    embeddings = PrecomputedEmbeddings(base)
+    embeddings.embed_documents([d.page_content for d in documents])
+    for companion in COMPANIONS:
+        for theme in THEMES:
+            for category in CATEGORIES:
+                embeddings.embed_query(search_query(companion, theme, category))
+
+    print("\n" + "=" * 60)
+    print(f"⚖️ 벡터 인덱스 백엔드 비교 (문서 {len(documents)}개)")
+    print("=" * 60)
+    print(f"  임포트: chroma {import_time('import chromadb, langchain_chroma'):.2f}s | "
+          f"numpy {import_time('import vector_index'):.2f}s")
+
+    import chromadb
+    from langchain_chroma import Chroma
+
+    start = time.perf_counter()
+    chroma = Chroma.from_documents(documents=documents, embedding=embeddings,
+                                   client=chromadb.EphemeralClient(), collection_name="bench")
+    report("chroma", time.perf_counter() - start, query_latencies(chroma))
+
+    start = time.perf_counter()
+    store = NumpyVectorStore.from_documents(documents, embeddings)
+    report("numpy", time.perf_counter() - start, query_latencies(store))
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        store.save(directory)
+        save_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        NumpyVectorStore.load(directory, embeddings)
+        load_ms = (time.perf_counter() - start) * 1000
+    print(f"  [numpy] .npy 저장 {save_ms:.1f}ms / 로드 {load_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+벤치마크 공통 설정 / 데이터 로드 헬퍼
+"""
+
+import math
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from langchain_core.documents import Document
+
+from lexical_index import parse_list_field
+
+DATA_PATHS = [os.path.join(ROOT_DIR, 'data', f'{name}_final.json')
+              for name in ('tour', 'cafe', 'restaurant')]
+COMPANIONS = ["휠체어 사용자", "영유아", "고령자"]
+THEMES = ["예술", "전통", "자연", "체험"]
+CATEGORIES = ["관광지", "카페", "음식점"]
+IMPORT_PROFILE_MARKER = "--import-profile--"
+
+
+def load_documents():
+    """엔진과 동일한 형식의 Document 목록 생성 (임베딩 없이)"""
+    from rag_engine import TourRecommendationEngine
+
+    integrated = TourRecommendationEngine.read_place_files(*DATA_PATHS)
+    documents = []
+    for category_key, category_name in [('tour', '관광지'), ('cafe', '카페'), ('restaurant', '음식점')]:
+        for title, data in integrated[category_key].items():
+            if data.get('content'):
+                documents.append(Document(
+                    page_content=data['content'],
+                    metadata={
+                        'title': title,
+                        'category': category_name,
+                        'content': data['content'],
+                        'tags': ', '.join(parse_list_field(data.get('tags', ''))),
+                    }
+                ))
+    return documents
+
+
+def search_query(companion: str, theme: str, category: str) -> str:
+    """search_places와 동일한 쿼리 문자열"""
+    return f"{companion}에게 적합한 {theme} 분위기의 {category}. 접근성이 좋고 시설이 잘 갖춰진 곳."
+
+
+def import_time(statement: str) -> float:
+    """새 프로세스에서 임포트 시간 측정 (초)"""
+    code = f"import time; s = time.perf_counter(); {statement}; print(time.perf_counter() - s)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT_DIR)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def import_profile(statement: str, setup: str = "") -> List[Tuple[str, int, int, int]]:
+    """
+    새 프로세스에서 -X importtime으로 statement의 임포트 내역 측정
+    → [(모듈, self μs, 누적 μs, 깊이), ...] (setup에서 이미 임포트된 모듈은 제외)
+    """
+    code = f"{setup}\nimport sys; sys.stderr.write('{IMPORT_PROFILE_MARKER}\\n')\n{statement}"
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                         capture_output=True, text=True, cwd=ROOT_DIR)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "import failed")
+    entries = []
+    started = False
+    for line in out.stderr.splitlines():
+        if line == IMPORT_PROFILE_MARKER:
+            started = True
+            continue
+        if not started or not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def percentile(values, q: float) -> float:
+    """nearest-rank 백분위수 (q: 0~100)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
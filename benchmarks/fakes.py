@@ -0,0 +1,189 @@
+"""
+🎭 오프라인 벤치마크용 가짜 LLM / 임베딩 / ORS
+- 프롬프트 종류(rerank / 코스 생성 / 코스 설명)를 알아보고 엔진이 파싱할 수 있는 결정적 응답 생성
+- 녹화된 응답(fixtures JSON)이 있으면 우선 사용, RecordingChatModel로 실제 응답 녹화
+- 호출당 지연 시간 주입 (스트리밍은 청크마다 나누어 대기)
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+import common  # noqa: F401  (루트 모듈 import 경로 설정)
+from llm_cache import cache_key
+from prompt_budget import count_tokens
+
+_CANDIDATE_SECTION = r"\[{label} 후보\]\n(.*?)(?:\n\n|$)"
+
+
+def _candidates(prompt: str, label: str) -> List[str]:
+    match = re.search(_CANDIDATE_SECTION.format(label=label), prompt, re.DOTALL)
+    if not match:
+        return []
+    return [line[2:].strip() for line in match.group(1).splitlines() if line.startswith("- ")]
+
+
+def synthetic_response(prompt: str) -> str:
+    """프롬프트 종류별 결정적 응답"""
+    if "문서 목록:" in prompt:
+        top_k = int(re.search(r"상위 (\d+)개", prompt).group(1))
+        n_docs = len(re.findall(r"^\d+\. ", prompt.split("문서 목록:")[1], re.MULTILINE))
+        return ",".join(str(i) for i in range(1, min(top_k, n_docs) + 1))
+
+    if "[관광지 후보]" in prompt:
+        tours, cafes, restaurants = (_candidates(prompt, label) for label in ("관광지", "카페", "음식점"))
+        blocks = []
+        for i in range(min(3, len(tours), len(cafes), len(restaurants))):
+            blocks.append(
+                f"## 코스 {i + 1}: [{tours[i]}에서 시작하는 나들이]\n"
+                f"[관광지] {tours[i]}\n[카페] {cafes[i]}\n[음식점] {restaurants[i]}\n"
+            )
+        return "\n".join(blocks)
+
+    if "방문 장소:" in prompt:
+        return (
+            "### 코스 제목\n편안하게 즐기는 하루 나들이\n\n"
+            "**이 코스의 장점**\n"
+            "1. 문화유산 감상 후 여유로운 휴식\n"
+            "2. 도보 이동 가능한 최적의 동선\n"
+            "3. 전통과 현대의 조화로운 경험\n"
+        )
+
+    return ""
+
+
+def load_fixtures(path: Optional[str]) -> Dict[str, str]:
+    """녹화된 응답 {cache_key(model, prompt): response}"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class FakeChatModel:
+    """ChatOpenAI 대역 (invoke / stream만 지원, 호출별 timeout은 받기만 함)"""
+
+    def __init__(self, model_name: str = "fake-gpt", latency: float = 0.0,
+                 fixtures: Optional[Dict[str, str]] = None, chunk_size: int = 16):
+        self.model_name = model_name
+        self.latency = latency
+        self.fixtures = fixtures or {}
+        self.chunk_size = chunk_size
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+        return self.fixtures.get(cache_key(self.model_name, prompt)) or synthetic_response(prompt)
+
+    def _usage(self, prompt: str, content: str) -> Dict[str, int]:
+        input_tokens = count_tokens(prompt)
+        output_tokens = count_tokens(content)
+        return {'input_tokens': input_tokens, 'output_tokens': output_tokens,
+                'total_tokens': input_tokens + output_tokens}
+
+    def invoke(self, prompt: str, timeout: Optional[float] = None) -> AIMessage:
+        content = self._respond(prompt)
+        time.sleep(self.latency)
+        return AIMessage(content=content, usage_metadata=self._usage(prompt, content))
+
+    def stream(self, prompt: str, timeout: Optional[float] = None) -> Iterator[AIMessageChunk]:
+        content = self._respond(prompt)
+        pieces = [content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size)] or [""]
+        for piece in pieces:
+            time.sleep(self.latency / len(pieces))
+            yield AIMessageChunk(content=piece)
+        yield AIMessageChunk(content="", usage_metadata=self._usage(prompt, content))
+
+
+class RecordingChatModel:
+    """
+    실제 LLM 응답을 fixtures JSON에 녹화 (API 키가 있을 때 한 번 실행, bench_pipeline.py --record)
+    같은 파일에 녹화하는 모델끼리는 fixtures dict를 공유해야 서로 덮어쓰지 않음
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, llm, path: str, fixtures: Optional[Dict[str, str]] = None):
+        self.llm = llm
+        self.path = path
+        self.model_name = getattr(llm, "model_name", "")
+        self.fixtures = fixtures if fixtures is not None else load_fixtures(path)
+        self.calls = 0
+
+    def _save(self, prompt: str, content: str) -> None:
+        with self._lock:
+            self.calls += 1
+            self.fixtures[cache_key(self.model_name, prompt)] = content
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.fixtures, f, ensure_ascii=False, indent=2)
+
+    def invoke(self, prompt: str, **kwargs):
+        response = self.llm.invoke(prompt, **kwargs)
+        self._save(prompt, response.content)
+        return response
+
+    def stream(self, prompt: str, **kwargs):
+        parts = []
+        for chunk in self.llm.stream(prompt, **kwargs):
+            parts.append(chunk.content)
+            yield chunk
+        self._save(prompt, "".join(parts))
+
+
+class FakeEmbeddings(Embeddings):
+    """결정적 가짜 임베딩 + 호출당 지연"""
+
+    def __init__(self, size: int = 256, latency: float = 0.0):
+        self.base = DeterministicFakeEmbedding(size=size)
+        self.latency = latency
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency)
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency)
+        return self.base.embed_query(text)
+
+
+class FakeORSClient:
+    """openrouteservice.Client 대역 (직선 거리 × 1.3을 도보 거리로 반환)"""
+
+    def __init__(self, key: str = "", latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    @staticmethod
+    def _haversine_m(lng1, lat1, lng2, lat2) -> float:
+        r = 6371000
+        p1, p2 = math.radians(lat1), math.radians(lat2)
+        a = (math.sin((p2 - p1) / 2) ** 2
+             + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2)
+        return 2 * r * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    def directions(self, coordinates, profile: str = "foot-walking", format: str = "geojson", **kwargs) -> Dict:
+        self.calls += 1
+        time.sleep(self.latency)
+        distance = sum(
+            self._haversine_m(*coordinates[i], *coordinates[i + 1]) * 1.3
+            for i in range(len(coordinates) - 1)
+        )
+        return {
+            'type': 'FeatureCollection',
+            'features': [{
+                'type': 'Feature',
+                'geometry': {'type': 'LineString', 'coordinates': [list(c) for c in coordinates]},
+                'properties': {'segments': [{'distance': distance, 'duration': distance / 1.1}],
+                               'summary': {'distance': distance, 'duration': distance / 1.1}},
+            }],
+        }
@@ -0,0 +1,33 @@
+"""
+⚙️ 설정 조회 헬퍼
+Streamlit secrets 우선, 환경 변수 fallback
+"""
+
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+
+def get_setting(key: str, default: Optional[str] = None) -> Optional[str]:
+    """설정값 조회 (Streamlit secrets 우선, 환경 변수 fallback)"""
+    try:
+        import streamlit as st
+        value = st.secrets.get(key)
+    except:
+        value = None
+
+    if not value:
+        value = os.getenv(key, default)
+    return value
+
+
+def get_flag(key: str, default: bool = False) -> bool:
+    """on/off 설정값 조회 ('1', 'true', 'yes', 'on' → True)"""
+    value = get_setting(key)
+    if value is None or value == "":
+        return default
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,291 @@
+"""
+🧵 코스 생성 작업 큐
+- 코스 생성을 Streamlit 스크립트 스레드 밖의 워커 풀(동시 실행 수 제한)에서 실행
+- 세션에는 job_id만 저장 → 페이지를 벗어나거나 재실행해도 작업은 계속되고, 돌아오면 결과 사용
+- 진행 중에는 준비된 코스 카드(설명 전 포함)를 조회 가능 → 4_rec가 st.fragment로 주기적으로 확인
+- 끝난 작업은 SQLite에 저장 (프로세스 재시작 / 다른 프로세스에서도 job_id로 조회)
+- 취소: 같은 작업을 기다리는 세션이 모두 취소하면 코스 사이에서 중단
+
+설정: COURSE_JOB_WORKERS / COURSE_JOB_DB / COURSE_JOB_TTL
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from app_logging import get_logger
+from config import get_setting
+from engine_provider import condition_key, get_recommender
+from tracing import span
+
+logger = get_logger("course_jobs")
+
+DEFAULT_DB_PATH = ".cache/course_jobs.sqlite3"
+DEFAULT_TTL = 24 * 3600
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class CourseJob:
+    """코스 생성 작업 1개 (진행 상태 + 준비된 코스)"""
+
+    def __init__(self, companion: str, travel_type, region: str):
+        self.job_id = uuid.uuid4().hex
+        self.condition = condition_key(companion, travel_type, region)
+        self.companion = companion
+        self.trip_purpose = [travel_type] if isinstance(travel_type, str) else list(travel_type)
+        self.region = region
+        self.status = QUEUED
+        self.error = None
+        self.trace_id = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.subscribers = 1
+        self.cancel_event = threading.Event()
+        self._courses = {}
+        self._order = []
+        self._lock = threading.Lock()
+
+    def update_course(self, course: Dict) -> None:
+        with self._lock:
+            if course['course_id'] not in self._courses:
+                self._order.append(course['course_id'])
+            self._courses[course['course_id']] = course
+            self.updated_at = time.time()
+
+    def courses(self, completed_only: bool = False) -> List[Dict]:
+        """준비된 코스 (도착 순서, completed_only면 설명까지 끝난 코스만)"""
+        with self._lock:
+            courses = [self._courses[course_id] for course_id in self._order]
+        if completed_only:
+            return [course for course in courses if course.get('explanation_ready')]
+        return courses
+
+    def snapshot(self) -> Dict:
+        return {
+            'job_id': self.job_id,
+            'condition': self.condition,
+            'status': self.status,
+            'error': self.error,
+            'trace_id': self.trace_id,
+            'courses': self.courses(completed_only=self.status == DONE),
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+        }
+
+
+class CourseJobStore:
+    """끝난 작업 결과 저장소 (SQLite, 스레드 안전)"""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.path = path if path is not None else get_setting("COURSE_JOB_DB", DEFAULT_DB_PATH)
+        self.ttl = float(ttl if ttl is not None else get_setting("COURSE_JOB_TTL", str(DEFAULT_TTL)))
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:" and os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS course_jobs ("
+                " job_id TEXT PRIMARY KEY,"
+                " condition TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " snapshot TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_course_jobs_condition ON course_jobs (condition)")
+            # 조건별 요청 횟수 (저장된 결과를 재사용한 요청 포함, warmup.py가 자주 찾는 조건을 미리 생성)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS course_requests ("
+                " condition TEXT PRIMARY KEY,"
+                " companion TEXT NOT NULL,"
+                " travel_type TEXT NOT NULL,"
+                " region TEXT NOT NULL,"
+                " requests INTEGER NOT NULL,"
+                " last_requested_at REAL NOT NULL)"
+            )
+
+    def save(self, snapshot: Dict) -> None:
+        """작업 결과 저장 후 만료된 작업 정리"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO course_jobs (job_id, condition, status, snapshot, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (snapshot['job_id'], snapshot['condition'], snapshot['status'],
+                 json.dumps(snapshot, ensure_ascii=False), now)
+            )
+            if self.ttl > 0:
+                self._conn.execute("DELETE FROM course_jobs WHERE updated_at < ?", (now - self.ttl,))
+
+    def _load(self, query: str, params) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        if row is None:
+            return None
+        snapshot_json, updated_at = row
+        if self.ttl > 0 and time.time() - updated_at > self.ttl:
+            return None
+        return json.loads(snapshot_json)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self._load("SELECT snapshot, updated_at FROM course_jobs WHERE job_id = ?", (job_id,))
+
+    def record_request(self, companion: str, travel_type: str, region: str) -> None:
+        """조건별 요청 횟수 +1"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO course_requests (condition, companion, travel_type, region, requests, last_requested_at)"
+                " VALUES (?, ?, ?, ?, 1, ?)"
+                " ON CONFLICT(condition) DO UPDATE SET requests = requests + 1, last_requested_at = excluded.last_requested_at",
+                (condition_key(companion, travel_type, region), companion, travel_type, region, now)
+            )
+
+    def popular_conditions(self, n: int) -> List[Dict]:
+        """요청이 많은 조건 상위 n개 [{companion, travel_type, region, requests}, ...]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT companion, travel_type, region, requests FROM course_requests"
+                " ORDER BY requests DESC, last_requested_at DESC LIMIT ?",
+                (n,)
+            ).fetchall()
+        return [{'companion': companion, 'travel_type': travel_type, 'region': region, 'requests': requests}
+                for companion, travel_type, region, requests in rows]
+
+
+class CourseJobQueue:
+    """코스 생성 작업 큐 (워커 풀 + 조건별 중복 제거 + 결과 저장)"""
+
+    def __init__(self, max_workers: Optional[int] = None, store: Optional[CourseJobStore] = None,
+                 max_jobs: int = 256):
+        max_workers = max_workers or int(get_setting("COURSE_JOB_WORKERS", "2"))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="course-job")
+        self._jobs: Dict[str, CourseJob] = {}
+        self._active: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.store = store
+        self.max_jobs = max_jobs
+
+    def submit(self, companion: str, travel_type, region: str, record: bool = True) -> str:
+        """
+        작업 등록 → job_id
+        같은 조건의 작업이 진행 중이면 그 작업에 합류
+        (끝난 작업은 조건으로 재사용하지 않음 → 데이터 재로드 / 프롬프트 변경 후에도 엔진과 LLM 캐시가 판단,
+         저장된 결과는 job_id로만 조회)
+        record: 조건별 요청 횟수에 반영 (미리 생성(warmup)은 False)
+        """
+        condition = condition_key(companion, travel_type, region)
+        if record and self.store is not None:
+            try:
+                self.store.record_request(companion, " ".join(travel_type) if isinstance(travel_type, list) else travel_type, region)
+            except sqlite3.Error as e:
+                logger.warning("⚠️ 요청 횟수 기록 실패: %s", e)
+        with self._lock:
+            active_id = self._active.get(condition)
+            if active_id is not None:
+                job = self._jobs[active_id]
+                job.subscribers += 1
+                return active_id
+
+            job = CourseJob(companion, travel_type, region)
+            self._jobs[job.job_id] = job
+            self._active[condition] = job.job_id
+            self._evict()
+        self._executor.submit(self._run, job)
+        logger.info("🧵 코스 생성 작업 등록: %s (%s)", condition, job.job_id[:8])
+        return job.job_id
+
+    def _evict(self) -> None:
+        """오래된 끝난 작업부터 메모리에서 제거 (저장소에는 남음)"""
+        finished = [job for job in self._jobs.values() if job.status in FINISHED]
+        finished.sort(key=lambda job: job.updated_at)
+        while len(self._jobs) > self.max_jobs and finished:
+            del self._jobs[finished.pop(0).job_id]
+
+    def _run(self, job: CourseJob) -> None:
+        if job.cancel_event.is_set():
+            self._finish(job, CANCELLED)
+            return
+
+        job.status = RUNNING
+        try:
+            with span("course_job", condition=job.condition) as root:
+                job.trace_id = root.trace_id if root else None
+                # 코스가 하나씩 준비될 때마다 작업에 반영 → 4_rec가 완료 전에도 카드를 먼저 표시
+                generator = get_recommender().iter_courses(job.companion, job.trip_purpose, job.region)
+                try:
+                    for course in generator:
+                        job.update_course(course)
+                        if job.cancel_event.is_set():
+                            break
+                finally:
+                    generator.close()
+        except Exception as e:
+            job.error = f"{e.__class__.__name__}: {e}"
+            self._finish(job, FAILED)
+            return
+        self._finish(job, CANCELLED if job.cancel_event.is_set() else DONE)
+
+    def _finish(self, job: CourseJob, status: str) -> None:
+        with self._lock:
+            job.status = status
+            job.updated_at = time.time()
+            if self._active.get(job.condition) == job.job_id:
+                del self._active[job.condition]
+        # 빈 결과(파싱 실패 등)는 저장하지 않음 → 같은 조건의 다음 요청에서 다시 생성
+        if status == DONE and self.store is not None and job.courses(completed_only=True):
+            try:
+                self.store.save(job.snapshot())
+            except sqlite3.Error as e:
+                logger.warning("⚠️ 작업 결과 저장 실패: %s", e)
+        logger.info("🧵 코스 생성 작업 %s: %s (%s)", status, job.condition, job.job_id[:8])
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 {job_id, condition, status, error, trace_id, courses, ...} (없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.snapshot()
+        return self.store.get(job_id) if self.store else None
+
+    def cancel(self, job_id: str) -> bool:
+        """세션 1개의 구독 취소 (남은 구독자가 없으면 작업 중단) → 중단 요청 여부"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return False
+            job.subscribers -= 1
+            if job.subscribers > 0:
+                return False
+            job.cancel_event.set()
+            # 같은 조건의 새 요청은 중단 중인 작업에 합류하지 않음
+            if self._active.get(job.condition) == job.job_id:
+                del self._active[job.condition]
+        return True
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_course_jobs() -> CourseJobQueue:
+    """프로세스 공용 작업 큐 (저장소를 열 수 없으면 메모리에만 보관)"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                try:
+                    store = CourseJobStore()
+                except sqlite3.Error as e:
+                    logger.warning("⚠️ 작업 저장소 초기화 실패 (메모리에만 보관): %s", e)
+                    store = None
+                _job_queue = CourseJobQueue(store=store)
+    return _job_queue
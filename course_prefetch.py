@@ -0,0 +1,95 @@
+"""
+⚡ 코스 추천 선행 생성 (speculative prefetch)
+- 동행 + 테마가 정해지면(2단계) 지역과 무관한 장소 후보 검색을 미리 수행
+  (PREFETCH_FULL_COURSES=1이면 장소가 많은 지역의 전체 코스 생성까지)
+- 지역을 선택하는 즉시(3단계) 해당 조건의 코스 생성 작업(course_jobs) 등록
+- 세션에는 job_id만 저장 → 4_rec.py가 같은 작업에 합류해 준비되는 코스부터 표시
+  (결과를 조건으로 따로 캐시하지 않음 → 취소 / 중복 제거 / 트레이스는 작업 큐가 담당)
+"""
+
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from app_logging import get_logger
+from config import get_flag, get_setting
+from course_jobs import CANCELLED, FAILED, get_course_jobs
+from engine_provider import condition_key, get_recommender
+from slot_extractor import extract_district
+
+logger = get_logger("course_prefetch")
+
+CATEGORIES = ["관광지", "카페", "음식점"]
+
+
+def likely_regions(engine, n: int = 1) -> List[str]:
+    """장소 데이터가 가장 많은 자치구 상위 n개 (선택될 가능성이 높은 지역)"""
+    if hasattr(engine, 'likely_regions'):
+        # 엔진 서비스 클라이언트는 서비스 쪽 데이터로 계산
+        return engine.likely_regions(n)
+    counts = Counter(
+        extract_district(place.get('address', ''))
+        for places in engine.integrated_data.values()
+        for place in places.values()
+    )
+    counts.pop('', None)
+    return [district for district, _ in counts.most_common(n)]
+
+
+class CoursePrefetcher:
+    """선행 생성기 (후보 검색은 전용 워커, 코스 생성은 작업 큐에 위임)"""
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="course-prefetch")
+
+    def prefetch(self, companion: str, travel_type, region: str,
+                 replaces: Optional[str] = None, record: bool = True) -> str:
+        """
+        조건에 대한 코스 생성 작업 등록 → job_id (같은 조건의 작업이 진행 중이면 합류)
+        replaces: 세션에 남아 있던 이전 job_id (같은 조건이면 그대로 사용, 다른 작업이면 구독 취소)
+        """
+        jobs = get_course_jobs()
+        previous = jobs.get(replaces) if replaces else None
+        if (previous is not None and previous['condition'] == condition_key(companion, travel_type, region)
+                and previous['status'] not in (FAILED, CANCELLED)):
+            return replaces
+        job_id = jobs.submit(companion, travel_type, region, record=record)
+        if replaces and replaces != job_id:
+            jobs.cancel(replaces)
+        logger.info("⚡ 코스 선행 생성 시작: %s_%s_%s (%s)", companion, travel_type, region, job_id[:8])
+        return job_id
+
+    def prefetch_candidates(self, companion: str, travel_type,
+                            engine_getter: Callable = get_recommender) -> Future:
+        """
+        동행 + 테마만 알 때: 지역과 무관한 후보 검색(MMR + BM25)을 미리 수행해 엔진 캐시에 저장
+        PREFETCH_FULL_COURSES=1이면 장소가 많은 지역의 전체 코스 생성도 시작
+        """
+        full_courses = get_flag("PREFETCH_FULL_COURSES", False)
+        n_regions = int(get_setting("PREFETCH_REGION_COUNT", "1"))
+
+        def run():
+            engine = engine_getter()
+            for category in CATEGORIES:
+                engine.retrieve_candidates(companion, travel_type, category)
+            if full_courses:
+                for region in likely_regions(engine, n_regions):
+                    self.prefetch(companion, travel_type, region, record=False)
+
+        logger.info("⚡ 후보 선행 검색 시작: %s_%s", companion, travel_type)
+        return self._executor.submit(run)
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_course_prefetcher() -> CoursePrefetcher:
+    """프로세스 공용 선행 생성기"""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = CoursePrefetcher()
+    return _prefetcher
@@ -0,0 +1,255 @@
+"""
+⏳ 요청 마감 시간(deadline) + 헤지(hedged) 요청
+- create_courses 요청 전체 마감 시간을 contextvars로 전달 (설명 생성 스레드도 copy_context로 이어받음)
+- 단계별 예산: min(남은 시간, DEADLINE_<STAGE>초)
+- 헤지: 기본 모델 응답이 최근 지연 p(HEDGE_PERCENTILE)를 넘기면 빠른 모델로 예비 요청 → 먼저 끝난 응답 사용
+- 스트리밍 응답도 조각 사이 대기에 마감 시간 적용 (백그라운드 스레드가 받아서 큐로 전달)
+- 마감 후 버려진 호출이 작업 스레드를 계속 차지하지 않도록 LLM 호출에는 남은 예산을 timeout으로 전달,
+  스트림은 소비하는 쪽이 멈추면 받기를 중단
+
+설정: REQUEST_DEADLINE / DEADLINE_RERANK / DEADLINE_COURSES / DEADLINE_EXPLANATION / DEADLINE_WORKERS
+      HEDGE_MODEL (비어 있으면 헤지 없음) / HEDGE_PERCENTILE / HEDGE_MIN_SAMPLES / HEDGE_AFTER
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from config import get_setting
+
+# 단계별 기본 예산 (초)
+DEFAULT_STAGE_BUDGETS = {
+    'rerank': 8.0,
+    'courses': 30.0,
+    'explanation': 15.0,
+}
+DEFAULT_REQUEST_DEADLINE = 45.0
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar("current_deadline", default=None)
+
+# 마감 시간이 걸린 호출 / 헤지 요청 실행용
+# (마감 후에도 원래 호출은 끝날 때까지 실행됨 → 호출 쪽은 with_timeout으로 클라이언트 timeout을 함께 걸어 둠)
+_executor = ThreadPoolExecutor(max_workers=int(get_setting("DEADLINE_WORKERS", "32")),
+                               thread_name_prefix="deadline-call")
+
+_END = object()
+
+
+class DeadlineExceeded(TimeoutError):
+    """요청 / 단계 예산 초과"""
+
+
+class Deadline:
+    """요청 1개의 마감 시각"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def budget(self, stage: str) -> float:
+        """단계 예산: min(남은 시간, DEADLINE_<STAGE>)"""
+        return min(self.remaining(), stage_budget(stage))
+
+
+def stage_budget(stage: str) -> float:
+    return float(get_setting(f"DEADLINE_{stage.upper()}", str(DEFAULT_STAGE_BUDGETS.get(stage, 30.0))))
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float] = None) -> Iterator[Deadline]:
+    """요청 마감 시간 설정 (이미 바깥 요청의 마감 시간이 있으면 그대로 사용)"""
+    existing = _current_deadline.get()
+    if existing is not None:
+        yield existing
+        return
+    if seconds is None:
+        seconds = float(get_setting("REQUEST_DEADLINE", str(DEFAULT_REQUEST_DEADLINE)))
+    deadline = Deadline(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def time_budget(stage: str) -> float:
+    """현재 요청의 단계 예산 (요청 마감 시간이 없으면 단계 예산만)"""
+    deadline = _current_deadline.get()
+    return deadline.budget(stage) if deadline else stage_budget(stage)
+
+
+def _submit(fn: Callable, *args, **kwargs):
+    # span / 마감 시간이 호출 스레드에서도 이어지도록 context 복사
+    return _executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def with_timeout(fn: Callable, timeout: float) -> Callable:
+    """
+    호출 시점까지 남은 예산을 timeout 인자로 넘기는 함수 (fn은 timeout 키워드를 받는 LLM 호출 등)
+    재시도를 포함해 timeout초 안에 끝나고, 마감 후 호출되면 DeadlineExceeded (재시도 대상 아님)
+    """
+    expires_at = time.monotonic() + timeout
+
+    def call(*args, **kwargs):
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("예산 없음")
+        return fn(*args, timeout=remaining, **kwargs)
+    return call
+
+
+def call_with_timeout(fn: Callable, timeout: float, *args, **kwargs):
+    """timeout초 안에 끝나지 않으면 DeadlineExceeded (원래 호출은 백그라운드에서 마저 끝남)"""
+    if timeout <= 0:
+        raise DeadlineExceeded("예산 없음")
+    future = _submit(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except TimeoutError as e:
+        raise DeadlineExceeded(f"{timeout:.1f}초 초과") from e
+
+
+class LatencyTracker:
+    """최근 호출 지연 시간 → 헤지 기준 (백분위)"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+    def hedge_after(self) -> float:
+        """헤지 요청을 보낼 시점 (표본이 부족하면 HEDGE_AFTER초)"""
+        min_samples = int(get_setting("HEDGE_MIN_SAMPLES", "20"))
+        with self._lock:
+            enough = len(self._samples) >= min_samples
+        if enough:
+            return self.percentile(float(get_setting("HEDGE_PERCENTILE", "0.95")))
+        return float(get_setting("HEDGE_AFTER", "8"))
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def latency_tracker(name: str) -> LatencyTracker:
+    with _trackers_lock:
+        if name not in _trackers:
+            _trackers[name] = LatencyTracker()
+        return _trackers[name]
+
+
+def hedged_call(primary: Callable, backup: Optional[Callable], timeout: float,
+                hedge_after: float, tracker: Optional[LatencyTracker] = None) -> Tuple[object, bool]:
+    """
+    primary 실행 → hedge_after초 안에 안 끝나면 backup도 실행, 먼저 성공한 결과 반환
+    → (결과, backup 결과 여부). timeout 안에 둘 다 실패 / 미완료면 예외
+    """
+    if timeout <= 0:
+        raise DeadlineExceeded("예산 없음")
+    started = time.monotonic()
+    primary_future = _submit(primary)
+    if tracker is not None:
+        def record_latency(future):
+            if future.exception() is None:
+                tracker.record(time.monotonic() - started)
+        primary_future.add_done_callback(record_latency)
+
+    futures = {primary_future: False}
+    done, _ = wait([primary_future], timeout=min(hedge_after, timeout) if backup else timeout)
+    if not done and backup is not None and time.monotonic() - started < timeout:
+        futures[_submit(backup)] = True
+
+    error = None
+    pending = set(futures)
+    while pending:
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result(), futures[future]
+            error = future.exception()
+    if error is not None and not pending:
+        raise error
+    raise DeadlineExceeded(f"{timeout:.1f}초 초과")
+
+
+def iterate_with_deadline(iterable: Iterable, stage: str, max_pending: int = 256) -> Iterator:
+    """
+    조각을 백그라운드 스레드에서 받아 전달 (조각 사이 대기가 단계 예산을 넘으면 DeadlineExceeded)
+    예산은 첫 조각 전 기준으로 한 번 정함 (요청 마감 시간이 더 이르면 그쪽)
+    예산 초과 / 소비하는 쪽이 제너레이터를 닫으면 받기 스레드도 다음 조각에서 멈추고 원본을 닫음
+    (원본이 조각 사이에 멈춰 있는 시간은 원본 쪽 timeout이 제한)
+    """
+    expires_at = time.monotonic() + time_budget(stage)
+    chunks = queue.Queue(maxsize=max_pending)
+    stopped = threading.Event()
+
+    def put(entry) -> bool:
+        # 큐가 가득 차도 중단 요청을 확인하며 대기 (받기 스레드가 앞서 나가지 않도록)
+        while not stopped.is_set():
+            try:
+                chunks.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def pump():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((_END, e))
+            return
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+        put((_END, None))
+
+    # 스트림 1개가 끝까지 스레드를 차지하므로 공용 풀 대신 전용 스레드
+    threading.Thread(target=contextvars.copy_context().run, args=(pump,),
+                     name="deadline-stream", daemon=True).start()
+    try:
+        while True:
+            remaining = expires_at - time.monotonic()
+            try:
+                item, error = chunks.get(timeout=max(remaining, 0.0))
+            except queue.Empty:
+                raise DeadlineExceeded(f"{stage} 예산 초과") from None
+            if item is _END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
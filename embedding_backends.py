@@ -0,0 +1,92 @@
+"""
+🧮 임베딩 백엔드 선택
+- openai: text-embedding-3-large (기본값, 3072차원, 네트워크 필요)
+- local : CPU에서 동작하는 다국어 sentence-embedding 모델 (배치 추론)
+
+설정: EMBEDDING_BACKEND / LOCAL_EMBEDDING_MODEL
+      (Streamlit secrets 우선, 환경 변수 fallback)
+"""
+
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from app_logging import get_logger
+from config import get_setting
+from rate_limit import get_limiter
+
+logger = get_logger("embedding_backends")
+
+
+DEFAULT_OPENAI_MODEL = "text-embedding-3-large"
+DEFAULT_LOCAL_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+
+class LocalSentenceEmbeddings(Embeddings):
+    """sentence-transformers 기반 로컬 CPU 임베딩 (LangChain Embeddings 호환)"""
+
+    def __init__(self, model_name: str = DEFAULT_LOCAL_MODEL, batch_size: int = 32,
+                 device: str = "cpu", normalize: bool = True):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "로컬 임베딩 백엔드를 사용하려면 sentence-transformers가 필요합니다. "
+                "pip install sentence-transformers"
+            ) from e
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.normalize = normalize
+        self.model = SentenceTransformer(model_name, device=device)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 배치 임베딩"""
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """쿼리 임베딩"""
+        return self.embed_documents([text])[0]
+
+
+class RateLimitedEmbeddings(Embeddings):
+    """API 임베딩 호출에 모델별 속도 제한 + 재시도 적용"""
+
+    def __init__(self, embeddings: Embeddings, model_name: str):
+        self.embeddings = embeddings
+        self.model = model_name
+        self.limiter = get_limiter(model_name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.limiter.call(self.embeddings.embed_documents, texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.limiter.call(self.embeddings.embed_query, text)
+
+
+def create_embeddings(backend: Optional[str] = None, api_key: Optional[str] = None) -> Embeddings:
+    """설정에 따라 임베딩 백엔드 생성"""
+    backend = (backend or get_setting("EMBEDDING_BACKEND", "openai")).lower()
+
+    if backend == "local":
+        model_name = get_setting("LOCAL_EMBEDDING_MODEL", DEFAULT_LOCAL_MODEL)
+        batch_size = int(get_setting("LOCAL_EMBEDDING_BATCH_SIZE", "32"))
+        logger.info("🧮 로컬 임베딩 백엔드: %s (batch=%d)", model_name, batch_size)
+        return LocalSentenceEmbeddings(model_name=model_name, batch_size=batch_size)
+
+    if backend == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        # 재시도는 rate_limit 계층에서
+        return RateLimitedEmbeddings(
+            OpenAIEmbeddings(model=DEFAULT_OPENAI_MODEL, api_key=api_key, max_retries=0),
+            DEFAULT_OPENAI_MODEL
+        )
+
+    raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {backend} (openai 또는 local)")
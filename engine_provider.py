@@ -0,0 +1,69 @@
+"""
+🧠 추천 엔진 공용 인스턴스
+- 프로세스당 하나의 TourRecommendationEngine (데이터 로드 + 벡터스토어 1회)
+- ENGINE_SERVICE_URL이 있으면 엔진 서비스 클라이언트 사용 (여러 프로세스가 엔진 1개 공유, engine_service.py)
+- 스크립트 스레드 / 백그라운드 스레드 어디서든 안전하게 사용
+"""
+
+import threading
+
+from engine_service import create_remote_engine
+
+DATA_PATHS = ('./data/tour_final.json', './data/cafe_final.json', './data/restaurant_final.json')
+
+_engine = None
+_engine_lock = threading.Lock()
+_local_engine = None
+_local_engine_lock = threading.Lock()
+
+
+def build_local_recommender():
+    """프로세스 내 엔진 생성 (데이터 로드 + 스니펫 + 벡터스토어 + 파일 감시)"""
+    from rag_engine import CourseRecommender
+
+    recommender = CourseRecommender()
+    recommender.load_json_with_dedup(*DATA_PATHS)
+    recommender.load_place_snippets()
+    recommender.setup_vectorstore()
+    # 데이터 파일 변경 시 재시작 없이 증분 반영
+    recommender.start_data_watcher()
+    return recommender
+
+
+def get_local_recommender():
+    """프로세스 내 엔진 (최초 호출 시 생성, 엔진 서비스 fallback으로도 사용)"""
+    global _local_engine
+    if _local_engine is None:
+        with _local_engine_lock:
+            if _local_engine is None:
+                _local_engine = build_local_recommender()
+    return _local_engine
+
+
+def get_recommender():
+    """공용 추천 엔진 (ENGINE_SERVICE_URL이 있으면 서비스 클라이언트, 없으면 프로세스 내 엔진)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_remote_engine(fallback=get_local_recommender) or get_local_recommender()
+    return _engine
+
+
+def set_recommender(recommender) -> None:
+    """공용 엔진 직접 지정 (부하 테스트 / 벤치마크에서 가짜 LLM 엔진 주입)"""
+    global _engine
+    with _engine_lock:
+        _engine = recommender
+
+
+def is_engine_ready() -> bool:
+    """엔진이 이미 생성되었는지 여부"""
+    return _engine is not None
+
+
+def condition_key(companion: str, travel_type, region: str) -> str:
+    """추천 조건 키 (4_rec.py의 last_condition과 동일 형식)"""
+    if isinstance(travel_type, list):
+        travel_type = " ".join(travel_type)
+    return f"{companion}_{travel_type}_{region}"
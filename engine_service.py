@@ -0,0 +1,352 @@
+"""
+🛰️ 로컬 추천 엔진 서비스
+- 엔진 1개(데이터 + 인덱스 + 캐시)를 별도 프로세스가 보유하고, 여러 Streamlit 프로세스가 localhost HTTP로 사용
+- 코스 생성은 NDJSON 스트리밍 (카드 → 설명 순서 그대로 전달, 4_rec의 점진적 표시 유지)
+- 클라이언트: keep-alive 연결 풀, 서비스에 연결할 수 없으면 프로세스 내 엔진으로 fallback
+
+실행: python engine_service.py [--host 127.0.0.1] [--port 8765]
+설정: ENGINE_SERVICE_URL (예: http://127.0.0.1:8765, 비어 있으면 프로세스 내 엔진)
+      ENGINE_SERVICE_POOL_SIZE / ENGINE_SERVICE_TIMEOUT
+"""
+
+import argparse
+import http.client
+import json
+import queue
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from app_logging import get_logger
+from config import get_setting
+from tracing import span
+
+logger = get_logger("engine_service")
+
+DEFAULT_PORT = 8765
+
+
+class EngineServiceError(RuntimeError):
+    """엔진 서비스가 오류를 반환함 (연결 실패와 구분, fallback 대상 아님)"""
+
+
+class EngineServiceUnavailable(ConnectionError):
+    """요청을 보내기 전에 서비스에 연결하지 못함 (fallback 대상)"""
+
+
+# ==================== 서버 ====================
+class EngineRequestHandler(BaseHTTPRequestHandler):
+    """엔진 API (GET /health, /ready, /regions · POST /courses, /search, /candidates)"""
+
+    protocol_version = "HTTP/1.1"
+    # 유휴 keep-alive 연결 정리 (초)
+    timeout = 120
+    engine = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status: int = 200) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            places = sum(len(p) for p in (self.engine.integrated_data or {}).values())
+            self._send_json({'ready': True, 'places': places})
+        elif url.path == "/ready":
+            # 워밍업(warmup.py)이 끝나기 전에는 503 → 롤링 배포 시 차가운 서비스로 트래픽이 가지 않음
+            from warmup import readiness
+
+            report = readiness()
+            self._send_json(report, 200 if report['ready'] else 503)
+        elif url.path == "/regions":
+            from course_prefetch import likely_regions
+
+            n = int(parse_qs(url.query).get('n', ['1'])[0])
+            self._send_json(likely_regions(self.engine, n))
+        else:
+            self._send_json({'error': f"unknown path: {url.path}"}, 404)
+
+    def do_POST(self):
+        try:
+            params = self._read_json()
+        except ValueError as e:
+            self._send_json({'error': f"invalid json: {e}"}, 400)
+            return
+
+        if self.path == "/courses":
+            self._stream_courses(params)
+            return
+        try:
+            if self.path == "/search":
+                result = self.engine.search_places(
+                    params['user_type'], params['trip_purpose'], params['category'],
+                    params.get('region'), params.get('top_k', 10)
+                )
+            elif self.path == "/candidates":
+                # 후보 검색 결과는 서비스 엔진 캐시에 남기고 개수만 반환 (선행 검색용)
+                result = len(self.engine.retrieve_candidates(
+                    params['user_type'], params['trip_purpose'], params['category']
+                ))
+            else:
+                self._send_json({'error': f"unknown path: {self.path}"}, 404)
+                return
+        except Exception as e:
+            self._send_json({'error': f"{e.__class__.__name__}: {e}"}, 500)
+            return
+        self._send_json(result)
+
+    def _stream_courses(self, params: Dict) -> None:
+        """iter_courses 결과를 한 줄에 하나씩 (chunked NDJSON)"""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for course in self.engine.iter_courses(params['user_type'], params['trip_purpose'], params.get('region')):
+                self._write_chunk(json.dumps(course, ensure_ascii=False).encode('utf-8') + b"\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 중간에 연결을 끊음
+            self.close_connection = True
+            return
+        except Exception as e:
+            self._write_chunk(json.dumps({'error': f"{e.__class__.__name__}: {e}"}, ensure_ascii=False).encode('utf-8') + b"\n")
+        self._write_chunk(b"")
+
+
+def serve(engine, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """엔진 서비스 서버 생성 (serve_forever는 호출 측에서)"""
+    handler = type("BoundEngineRequestHandler", (EngineRequestHandler,), {'engine': engine})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# ==================== 클라이언트 ====================
+class RemoteEngine:
+    """
+    엔진 서비스 클라이언트 (TourRecommendationEngine의 코스 / 검색 API와 같은 모양)
+    - 호스트당 keep-alive 연결 풀 (pool_size개까지 보관)
+    - 서비스에 연결할 수 없으면 fallback()이 돌려주는 프로세스 내 엔진 사용
+      (요청을 보낸 뒤의 응답 시간 초과 / 연결 끊김은 서비스가 이미 처리 중일 수 있으므로 그대로 예외)
+    """
+
+    def __init__(self, base_url: str, fallback: Optional[Callable] = None,
+                 pool_size: int = 8, timeout: float = 120.0):
+        url = urlparse(base_url)
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or DEFAULT_PORT
+        self.fallback = fallback
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        # fallback 사용 중 여부 (상태가 바뀔 때만 로그)
+        self._using_fallback = False
+
+    # ---------- 연결 풀 ----------
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None):
+        """
+        요청 전송 → (연결, 응답). 풀에서 꺼낸 연결이 끊겨 있으면 새 연결로 1회 재시도
+        연결 단계에서 실패하면 EngineServiceUnavailable (요청을 보내지 않았으므로 fallback 가능)
+        """
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in range(2):
+            conn = self._acquire()
+            if conn.sock is None:
+                try:
+                    conn.connect()
+                except OSError as e:
+                    conn.close()
+                    raise EngineServiceUnavailable(f"{self.host}:{self.port}: {e}") from e
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                if self._using_fallback:
+                    self._using_fallback = False
+                    logger.info("✅ 엔진 서비스(%s:%d) 연결 복구", self.host, self.port)
+                return conn, response
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if attempt == 1:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+    def _call_json(self, method: str, path: str, payload: Optional[Dict] = None):
+        conn, response = self._request(method, path, payload)
+        try:
+            result = json.loads(response.read())
+        except Exception:
+            conn.close()
+            raise
+        self._release(conn)
+        if response.status != 200:
+            raise EngineServiceError(result.get('error', f"HTTP {response.status}"))
+        return result
+
+    def _local(self):
+        if self.fallback is None:
+            raise ConnectionError(f"엔진 서비스에 연결할 수 없습니다: {self.host}:{self.port}")
+        if not self._using_fallback:
+            self._using_fallback = True
+            logger.warning("⚠️ 엔진 서비스(%s:%d) 연결 실패 → 프로세스 내 엔진 사용", self.host, self.port)
+        return self.fallback()
+
+    # ---------- 엔진 API ----------
+    def health(self) -> Optional[Dict]:
+        """서비스 상태 (연결할 수 없으면 None)"""
+        try:
+            return self._call_json("GET", "/health")
+        except (OSError, http.client.HTTPException, EngineServiceError):
+            return None
+
+    def readiness(self) -> Optional[Dict]:
+        """서비스 워밍업 상태 {ready, steps, ...} (연결할 수 없으면 None, 준비 전에도 내용 반환)"""
+        try:
+            conn, response = self._request("GET", "/ready")
+            try:
+                result = json.loads(response.read())
+            except Exception:
+                conn.close()
+                raise
+            self._release(conn)
+        except (OSError, http.client.HTTPException, ValueError):
+            return None
+        return result
+
+    def iter_courses(self, user_type: str, trip_purpose: List[str],
+                     region: Optional[str] = None) -> Iterator[Dict]:
+        """코스를 준비되는 대로 반환 (TourRecommendationEngine.iter_courses와 동일한 dict)"""
+        payload = {'user_type': user_type, 'trip_purpose': list(trip_purpose), 'region': region}
+        with span("engine_service.courses", host=f"{self.host}:{self.port}"):
+            try:
+                conn, response = self._request("POST", "/courses", payload)
+            except EngineServiceUnavailable:
+                yield from self._local().iter_courses(user_type, trip_purpose, region)
+                return
+
+            finished = False
+            try:
+                if response.status != 200:
+                    raise EngineServiceError(response.read().decode('utf-8', 'replace'))
+                while True:
+                    line = response.readline()
+                    if not line:
+                        break
+                    course = json.loads(line)
+                    if 'error' in course:
+                        raise EngineServiceError(course['error'])
+                    yield course
+                finished = True
+            finally:
+                # 끝까지 읽은 연결만 재사용 (중간에 멈춘 스트림은 닫음)
+                if finished:
+                    self._release(conn)
+                else:
+                    conn.close()
+
+    def create_courses(self, user_type: str, trip_purpose: List[str], region: Optional[str] = None,
+                       on_update: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        completed = {}
+        order = []
+        for course in self.iter_courses(user_type, trip_purpose, region):
+            if on_update:
+                on_update(course)
+            if course['course_id'] not in order:
+                order.append(course['course_id'])
+            if course['explanation_ready']:
+                completed[course['course_id']] = course
+        return [completed[course_id] for course_id in order if course_id in completed]
+
+    def search_places(self, user_type: str, trip_purpose, category: str,
+                      region: Optional[str] = None, top_k: int = 10) -> List[Dict]:
+        payload = {'user_type': user_type, 'trip_purpose': trip_purpose, 'category': category,
+                   'region': region, 'top_k': top_k}
+        try:
+            return self._call_json("POST", "/search", payload)
+        except EngineServiceUnavailable:
+            return self._local().search_places(user_type, trip_purpose, category, region, top_k)
+
+    def retrieve_candidates(self, user_type: str, trip_purpose, category: str) -> int:
+        """서비스 쪽 후보 캐시 채우기 (선행 검색용, 후보 개수 반환)"""
+        payload = {'user_type': user_type, 'trip_purpose': trip_purpose, 'category': category}
+        try:
+            return self._call_json("POST", "/candidates", payload)
+        except EngineServiceUnavailable:
+            return len(self._local().retrieve_candidates(user_type, trip_purpose, category))
+
+    def likely_regions(self, n: int = 1) -> List[str]:
+        try:
+            return self._call_json("GET", f"/regions?n={n}")
+        except EngineServiceUnavailable:
+            from course_prefetch import likely_regions
+            return likely_regions(self._local(), n)
+
+
+def create_remote_engine(fallback: Optional[Callable] = None) -> Optional[RemoteEngine]:
+    """ENGINE_SERVICE_URL이 있으면 클라이언트 생성 (없으면 None)"""
+    base_url = get_setting("ENGINE_SERVICE_URL", "")
+    if not base_url:
+        return None
+    return RemoteEngine(
+        base_url,
+        fallback=fallback,
+        pool_size=int(get_setting("ENGINE_SERVICE_POOL_SIZE", "8")),
+        timeout=float(get_setting("ENGINE_SERVICE_TIMEOUT", "120")),
+    )
+
+
+def main():
+    from engine_provider import build_local_recommender, set_recommender
+    from warmup import start_warmup
+
+    parser = argparse.ArgumentParser(description="로컬 추천 엔진 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--no-warmup", action="store_true", help="시작 시 워밍업 생략 (/ready는 계속 503)")
+    args = parser.parse_args()
+
+    engine = build_local_recommender()
+    # 이 프로세스의 작업 큐 / 워밍업은 서비스 자신(ENGINE_SERVICE_URL)이 아니라 로컬 엔진 사용
+    set_recommender(engine)
+    server = serve(engine, args.host, args.port)
+    if not args.no_warmup:
+        start_warmup(lambda: engine)
+    print(f"🛰️ 엔진 서비스 시작: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+📝 장소별 설명 스니펫 사전 생성 (오프라인 작업)
+- data/*_final.json의 모든 장소에 대해
+  · 짧은 요약 (gpt-4o-mini 1문장, --no-llm이면 content 첫 문장)
+  · 동행 유형별 접근성 하이라이트 (facilities 규칙 기반, 짧은 명사형 문구)
+- 결과: data/place_snippets.json (content 해시가 같으면 재생성 생략)
+
+실행: python enrich_places.py [--no-llm] [--force]
+"""
+
+import argparse
+import json
+import os
+import re
+from typing import Dict, List, Optional
+
+from config import get_setting
+from engine_provider import DATA_PATHS
+from place_snippets import SNIPPETS_PATH, content_hash, load_snippets
+from rate_limit import rate_limited
+from slot_extractor import COMPANION_ALIASES
+
+SUMMARY_MODEL = "gpt-4o-mini"
+SUMMARY_MAX_LENGTH = 80
+
+COMPANION_TYPES = list(COMPANION_ALIASES)
+CATEGORY_KEYS = ['tour', 'cafe', 'restaurant']
+
+# (facilities 문구에 포함된 표현, 하이라이트 문구, 해당 동행 유형)
+HIGHLIGHT_RULES = [
+    ("진입로 접근성이 좋음", "단차 없는 편안한 진입로", ["휠체어 사용자", "영유아", "고령자"]),
+    ("장애인 엘리베이터 이용이 용이함", "엘리베이터로 편한 층간 이동", ["휠체어 사용자", "영유아", "고령자"]),
+    ("장애인 화장실 접근성이 좋음", "이용하기 편한 장애인 화장실", ["휠체어 사용자", "고령자"]),
+    ("장애인 주차장 이용이 양호함", "가까운 장애인 전용 주차", ["휠체어 사용자", "고령자"]),
+    ("휠체어 사용자 테이블 접근이 용이함", "휠체어로 앉기 편한 테이블", ["휠체어 사용자"]),
+    ("휠체어 전용 매표소 있음", "휠체어 전용 매표소 운영", ["휠체어 사용자"]),
+    ("휠체어 사용자 안내시설 이용이 양호함", "휠체어 눈높이 안내시설", ["휠체어 사용자"]),
+    ("기저귀 교환대 있음", "기저귀 교환대 완비", ["영유아"]),
+    ("기저기 교환대 있음", "기저귀 교환대 완비", ["영유아"]),
+    ("수유실 있음", "아기와 쉬기 좋은 수유실", ["영유아"]),
+    ("유아차 대여 서비스 있음", "유아차 대여 서비스 제공", ["영유아"]),
+    ("유아차 보관소 있음", "유아차 보관소 마련", ["영유아"]),
+    ("유아의자 있음", "아이용 유아의자 구비", ["영유아"]),
+    ("가족 화장실 있음", "함께 쓰는 가족 화장실", ["영유아", "고령자"]),
+    ("시각장애인용 접근성", "시각장애인 안내시설 구비", ["고령자"]),
+]
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_SENTENCE_PATTERN = re.compile(r"(.+?[.!?다])(?:\s|$)")
+
+
+def accessibility_highlights(place: Dict) -> Dict[str, List[str]]:
+    """facilities → 동행 유형별 하이라이트 문구"""
+    facilities = place.get('facilities', [])
+    if isinstance(facilities, str):
+        facilities = [facilities]
+    facilities = [_WHITESPACE_PATTERN.sub(" ", str(f)).strip() for f in facilities]
+
+    highlights = {companion: [] for companion in COMPANION_TYPES}
+    for phrase, highlight, companions in HIGHLIGHT_RULES:
+        if any(phrase in facility for facility in facilities):
+            for companion in companions:
+                if highlight not in highlights[companion]:
+                    highlights[companion].append(highlight)
+    return highlights
+
+
+def first_sentence(text: str, max_length: int = SUMMARY_MAX_LENGTH) -> str:
+    """content 첫 문장 (LLM 없이 요약할 때)"""
+    text = _WHITESPACE_PATTERN.sub(" ", text or "").strip()
+    match = _SENTENCE_PATTERN.match(text)
+    sentence = match.group(1) if match else text
+    return sentence if len(sentence) <= max_length else sentence[:max_length - 1] + "…"
+
+
+def summarize_place(llm, place: Dict) -> str:
+    """장소 한 줄 요약 (gpt-4o-mini)"""
+    prompt = f"""
+다음 장소 소개를 {SUMMARY_MAX_LENGTH}자 이내의 한 문장으로 요약하세요.
+접근성/편의시설 설명은 빼고, 무엇을 하는 곳인지와 분위기만 담으세요.
+
+[{place['title']}]
+{place.get('content', '')}
+"""
+    summary = rate_limited(SUMMARY_MODEL, llm.invoke, prompt).content.strip()
+    return summary or first_sentence(place.get('content', ''))
+
+
+def build_snippet(place: Dict, llm=None) -> Dict:
+    """장소 1개의 스니펫"""
+    summary = first_sentence(place.get('content', ''))
+    if llm is not None:
+        try:
+            summary = summarize_place(llm, place)
+        except Exception as e:
+            print(f"  ⚠️ '{place['title']}' 요약 실패 (첫 문장 사용): {e}")
+
+    return {
+        'summary': summary,
+        'highlights': accessibility_highlights(place),
+        'content_hash': content_hash(place),
+    }
+
+
+def enrich_places(data_paths=DATA_PATHS, output_path: str = SNIPPETS_PATH,
+                  llm=None, force: bool = False) -> Dict[str, Dict[str, Dict]]:
+    """모든 장소 스니펫 생성 (content가 바뀐 장소만 다시 생성)"""
+    from rag_engine import TourRecommendationEngine
+
+    integrated = TourRecommendationEngine.read_place_files(*data_paths)
+    previous = {} if force else load_snippets(output_path)
+
+    snippets = {}
+    created = 0
+    for category_key in CATEGORY_KEYS:
+        snippets[category_key] = {}
+        for title, place in integrated[category_key].items():
+            cached = previous.get(category_key, {}).get(title)
+            if cached and cached.get('content_hash') == content_hash(place):
+                snippets[category_key][title] = cached
+                continue
+            snippets[category_key][title] = build_snippet(place, llm)
+            created += 1
+
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snippets, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, output_path)
+
+    total = sum(len(places) for places in snippets.values())
+    print(f"✅ 스니펫 {total}개 중 {created}개 새로 생성 → {output_path}")
+    return snippets
+
+
+def create_summary_llm() -> Optional[object]:
+    """요약용 LLM (API 키가 없으면 None)"""
+    api_key = get_setting("OPENAI_API_KEY")
+    if not api_key:
+        print("⚠️ OPENAI_API_KEY가 설정되지 않아 content 첫 문장으로 요약합니다.")
+        return None
+
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=SUMMARY_MODEL, temperature=0, api_key=api_key)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="장소별 설명 스니펫 사전 생성")
+    parser.add_argument("--no-llm", action="store_true", help="LLM 없이 content 첫 문장으로 요약")
+    parser.add_argument("--force", action="store_true", help="기존 스니펫 무시하고 전부 다시 생성")
+    parser.add_argument("--output", default=SNIPPETS_PATH)
+    args = parser.parse_args()
+
+    enrich_places(
+        output_path=args.output,
+        llm=None if args.no_llm else create_summary_llm(),
+        force=args.force
+    )
@@ -0,0 +1,61 @@
+"""
+💤 지연 임포트
+- 페이지 상단에서는 이름만 만들고, 실제 임포트는 처음 속성에 접근할 때 (렌더링하는 경로에서만 비용 발생)
+- 설치 여부 확인은 임포트 없이 (find_spec)
+
+사용: folium = lazy_module("folium")          # 아직 임포트 안 됨
+      folium.Map(...)                         # 여기서 임포트
+      if is_available("openrouteservice"): ...
+측정: python benchmarks/bench_imports.py (-X importtime 기반 페이지별 임포트 시간)
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """처음 속성에 접근할 때 임포트되는 모듈 대역"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__['_lazy_module'] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_module(name: str) -> ModuleType:
+    """모듈 지연 임포트 (이미 임포트된 모듈이면 그대로 반환)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_available(*names: str) -> bool:
+    """모듈을 임포트하지 않고 설치 여부만 확인"""
+    try:
+        return all(importlib.util.find_spec(name) is not None for name in names)
+    except (ImportError, ValueError):
+        return False
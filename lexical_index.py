@@ -0,0 +1,162 @@
+"""
+🔎 장소 검색용 어휘(BM25) 인덱스
+- 한국어 친화 n-gram 토큰화 (어절 + 음절 n-gram)
+- 제목 / 태그 / content 필드 가중치
+- 메모리 역색인 (로드 시 1회 생성, 쿼리는 1ms 이내)
+- 벡터 검색 결과와의 RRF(Reciprocal Rank Fusion) 결합
+"""
+
+import ast
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# 한글 음절 / 영문 / 숫자 단위로 어절 분리
+_WORD_PATTERN = re.compile(r"[가-힣]+|[A-Za-z]+|\d+")
+_HANGUL_PATTERN = re.compile(r"^[가-힣]+$")
+
+
+def parse_list_field(value) -> List[str]:
+    """"['a', 'b']" 형태의 문자열 필드를 리스트로 변환"""
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    if isinstance(value, str):
+        try:
+            parsed = ast.literal_eval(value)
+            if isinstance(parsed, (list, tuple)):
+                return [str(v) for v in parsed]
+        except (ValueError, SyntaxError):
+            pass
+        return [v.strip() for v in value.strip("[]").split(",") if v.strip()]
+    return []
+
+
+def tokenize(text: str, ngram_range: Tuple[int, int] = (1, 2)) -> List[str]:
+    """한국어 친화 토큰화: 어절 전체 + 한글 음절 n-gram"""
+    if not text:
+        return []
+
+    min_n, max_n = ngram_range
+    tokens = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        tokens.append(word)
+        # 한글 어절은 조사/복합어 대응을 위해 음절 n-gram 추가 (예: 경복궁 → 궁, 복궁)
+        if _HANGUL_PATTERN.match(word) and len(word) > 1:
+            for n in range(min_n, min(max_n, len(word)) + 1):
+                for i in range(len(word) - n + 1):
+                    gram = word[i:i + n]
+                    if gram != word:
+                        tokens.append(gram)
+    return tokens
+
+
+class LexicalIndex:
+    """BM25 역색인 (메모리 전용)"""
+
+    # 필드별 가중치 (토큰 빈도에 곱해짐)
+    FIELD_WEIGHTS = {'title': 3.0, 'tags': 2.0, 'content': 1.0}
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75,
+                 ngram_range: Tuple[int, int] = (1, 2)):
+        self.k1 = k1
+        self.b = b
+        self.ngram_range = ngram_range
+
+        self.documents: List = []
+        self.doc_categories: List[str] = []
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        self.idf: Dict[str, float] = {}
+        self.doc_lengths: List[float] = []
+        self.avg_doc_length = 0.0
+
+    @classmethod
+    def from_documents(cls, documents: Sequence, **kwargs) -> "LexicalIndex":
+        """LangChain Document 리스트로 인덱스 생성 (metadata의 title/tags/content 사용)"""
+        index = cls(**kwargs)
+        index.build(documents)
+        return index
+
+    def _document_terms(self, doc) -> Counter:
+        """문서 하나의 가중치 적용 토큰 빈도"""
+        metadata = doc.metadata
+        fields = {
+            'title': metadata.get('title', ''),
+            'tags': " ".join(parse_list_field(metadata.get('tags', ''))),
+            'content': metadata.get('content', '') or doc.page_content,
+        }
+
+        term_freqs = Counter()
+        for field, text in fields.items():
+            weight = self.FIELD_WEIGHTS[field]
+            for token in tokenize(text, self.ngram_range):
+                term_freqs[token] += weight
+        return term_freqs
+
+    def build(self, documents: Sequence) -> None:
+        """역색인 생성"""
+        postings = defaultdict(list)
+        doc_lengths = []
+
+        for doc_idx, doc in enumerate(documents):
+            term_freqs = self._document_terms(doc)
+            doc_lengths.append(sum(term_freqs.values()))
+            for token, tf in term_freqs.items():
+                postings[token].append((doc_idx, tf))
+
+        n_docs = len(documents)
+        self.documents = list(documents)
+        self.doc_categories = [doc.metadata.get('category', '') for doc in documents]
+        self.postings = dict(postings)
+        self.doc_lengths = doc_lengths
+        self.avg_doc_length = (sum(doc_lengths) / n_docs) if n_docs else 0.0
+        self.idf = {
+            token: math.log(1 + (n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            for token, plist in self.postings.items()
+        }
+
+    def search(self, query: str, top_k: int = 50,
+               category: Optional[str] = None) -> List[Tuple[object, float]]:
+        """BM25 검색 → [(Document, score), ...] (점수 내림차순)"""
+        if not self.documents:
+            return []
+
+        scores = defaultdict(float)
+        k1, b, avgdl = self.k1, self.b, self.avg_doc_length or 1.0
+
+        for token in set(tokenize(query, self.ngram_range)):
+            plist = self.postings.get(token)
+            if not plist:
+                continue
+            idf = self.idf[token]
+            for doc_idx, tf in plist:
+                if category and self.doc_categories[doc_idx] != category:
+                    continue
+                norm = k1 * (1 - b + b * self.doc_lengths[doc_idx] / avgdl)
+                scores[doc_idx] += idf * tf * (k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        return [(self.documents[doc_idx], score) for doc_idx, score in ranked]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence], k: int = 60,
+                           weights: Optional[Sequence[float]] = None,
+                           key=lambda doc: doc.metadata.get('title', '')) -> List:
+    """여러 순위 리스트를 RRF로 결합 (score = Σ w / (k + rank))"""
+    rankings = list(rankings)
+    weights = weights or [1.0] * len(rankings)
+
+    fused_scores = defaultdict(float)
+    first_seen = {}
+
+    for ranking, weight in zip(rankings, weights):
+        for rank, item in enumerate(ranking, 1):
+            item_key = key(item)
+            fused_scores[item_key] += weight / (k + rank)
+            first_seen.setdefault(item_key, item)
+
+    ordered = sorted(fused_scores.items(), key=lambda x: x[1], reverse=True)
+    return [first_seen[item_key] for item_key, _ in ordered]
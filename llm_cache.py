@@ -0,0 +1,127 @@
+"""
+💾 LLM 응답 캐시 (SQLite 영속 저장)
+- 키: 모델명 + 정규화된 프롬프트(또는 의미 키) 해시
+- TTL 만료 + LRU 개수 제한
+- 프로세스 재시작 / 여러 세션 간 공유
+
+설정: LLM_CACHE / LLM_CACHE_PATH / LLM_CACHE_TTL / LLM_CACHE_MAX_ENTRIES
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app_logging import get_logger
+from config import get_flag, get_setting
+
+logger = get_logger("llm_cache")
+
+DEFAULT_CACHE_PATH = ".cache/llm_cache.sqlite3"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+
+_WHITESPACE_PATTERN = re.compile(r"[ \t]+")
+
+
+def normalize_prompt(text: str) -> str:
+    """공백/빈 줄 차이만 있는 프롬프트가 같은 키가 되도록 정규화"""
+    lines = (_WHITESPACE_PATTERN.sub(" ", line).strip() for line in (text or "").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def cache_key(model: str, text: str) -> str:
+    """모델 + 정규화 텍스트 해시"""
+    return hashlib.sha256(f"{model}\x00{normalize_prompt(text)}".encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """LLM 응답 캐시 (SQLite, 스레드 안전)"""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.path = path if path is not None else get_setting("LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttl = float(ttl if ttl is not None else get_setting("LLM_CACHE_TTL", str(DEFAULT_TTL)))
+        self.max_entries = int(max_entries if max_entries is not None
+                               else get_setting("LLM_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:" and os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+
+    def get(self, model: str, text: str) -> Optional[str]:
+        """캐시 조회 (만료 항목은 삭제 후 None)"""
+        key = cache_key(model, text)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl > 0 and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return response
+
+    def put(self, model: str, text: str, response: str) -> None:
+        """캐시 저장 후 오래 안 쓴 항목부터 개수 제한까지 정리"""
+        key = cache_key(model, text)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now)
+            )
+            if self.max_entries > 0:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    " SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f"LLM 캐시 {self.hits}/{total} ({rate:.0%})"
+
+
+def create_llm_cache() -> Optional[LLMResponseCache]:
+    """설정에 따라 캐시 생성 (LLM_CACHE=0이면 None)"""
+    if not get_flag("LLM_CACHE", True):
+        return None
+    try:
+        return LLMResponseCache()
+    except sqlite3.Error as e:
+        logger.warning("⚠️ LLM 캐시 초기화 실패 (캐시 없이 진행): %s", e)
+        return None
@@ -5,6 +5,7 @@
 
 import streamlit as st
 import os
+from course_prefetch import get_course_prefetcher
 from style import (
     apply_common_style,
     render_header,
@@ -134,6 +135,12 @@ with col_center:
             ):
                 # 선택 정보 저장
                 st.session_state["travel_type"] = key
+                # 동행 + 테마가 정해졌으므로 장소 후보 검색을 미리 시작
+                if st.session_state.get("companion"):
+                    try:
+                        get_course_prefetcher().prefetch_candidates(st.session_state["companion"], key)
+                    except Exception as e:
+                        print(f"⚠️ 후보 선행 검색 실패: {e}")
                 # 바로 다음 페이지로 이동
                 st.switch_page("pages/3_region.py")
 
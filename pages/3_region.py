@@ -4,6 +4,8 @@
 """
 
 import streamlit as st
+from course_prefetch import get_course_prefetcher
+from slot_extractor import SEOUL_DISTRICTS
 from style import (
     apply_common_style,
     render_header,
@@ -62,14 +64,8 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ==================== 서울시 자치구 목록 ====================
-# 가나다 순으로 정렬된 25개 자치구
-regions = [
-    "강남구", "강동구", "강북구", "강서구", "관악구",
-    "광진구", "구로구", "금천구", "노원구", "도봉구",
-    "동대문구", "동작구", "마포구", "서대문구", "서초구",
-    "성동구", "성북구", "송파구", "양천구", "영등포구",
-    "용산구", "은평구", "종로구", "중구", "중랑구"
-]
+# 가나다 순으로 정렬된 25개 자치구 (음성 슬롯 추출과 같은 목록 사용)
+regions = SEOUL_DISTRICTS
 
 # ==================== 지역 버튼 렌더링 ====================
 # 5x5 그리드로 배치
@@ -102,6 +98,17 @@ with col_center:
                     ):
                         # 선택한 지역을 세션에 저장
                         st.session_state["region"] = region
+                        # 조건이 모두 정해졌으므로 코스 생성 작업을 미리 등록 (4_rec.py가 같은 job_id로 합류)
+                        if st.session_state.get("companion") and st.session_state.get("travel_type"):
+                            try:
+                                st.session_state["course_job_id"] = get_course_prefetcher().prefetch(
+                                    st.session_state["companion"],
+                                    st.session_state["travel_type"],
+                                    region,
+                                    replaces=st.session_state.get("course_job_id")
+                                )
+                            except Exception as e:
+                                print(f"⚠️ 코스 선행 생성 실패: {e}")
                         # 바로 추천 페이지로 이동
                         st.switch_page("pages/4_rec.py")
 
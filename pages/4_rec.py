@@ -6,6 +6,7 @@ AI가 추천한 3개의 나들이 코스를 비교하여 선택하는 페이지
 import streamlit as st
 import os
 import re
+from config import get_flag, get_setting
 from style import (
     apply_common_style,
     render_header,
@@ -15,10 +16,19 @@ from style import (
 )
 
 # ==================== RAG 엔진 임포트 ====================
+# 엔진(langchain 등)은 작업 큐 워커가 처음 코스를 생성할 때 임포트 → 여기서는 설치 여부만 확인
+from lazy_imports import is_available
 try:
-    from rag_engine import CourseRecommender
-    import openrouteservice as ors
-    RAG_AVAILABLE = True
+    from course_jobs import get_course_jobs
+    from engine_provider import condition_key
+    from rate_limit import all_metrics
+    from routes import course_coordinates, route_distance_m, walking_route
+    from tracing import tracer
+    RAG_AVAILABLE = is_available("openrouteservice") and (
+        bool(get_setting("ENGINE_SERVICE_URL", "")) or is_available("langchain_openai", "langchain_core")
+    )
+    if not RAG_AVAILABLE:
+        print("⚠️ RAG 엔진 임포트 실패: openrouteservice / langchain 패키지가 설치되지 않았습니다.")
 except ImportError as e:
     RAG_AVAILABLE = False
     print(f"⚠️ RAG 엔진 임포트 실패: {e}")
@@ -200,6 +210,40 @@ if st.session_state.get("show_help", False):
             st.rerun()
     st.markdown("---")
 
+# ==================== 성능 디버그 패널 ====================
+def render_trace_panel():
+    """사이드바: 마지막 추천 요청의 단계별 소요 시간 (DEBUG_PANEL=1일 때만)"""
+    if not (RAG_AVAILABLE and get_flag("DEBUG_PANEL", False)):
+        return
+    
+    trace_id = st.session_state.get("last_trace_id")
+    spans = tracer.get_trace(trace_id) if trace_id else tracer.last_trace("create_courses")
+    with st.sidebar.expander("🔧 성능 디버그 (마지막 요청)", expanded=False):
+        limits = all_metrics()
+        if limits:
+            # 외부 API별 호출 / 429 / 재시도 횟수와 대기 시간 (프로세스 누적)
+            st.caption("🚦 외부 API 호출 제한")
+            st.dataframe(limits, hide_index=True, use_container_width=True)
+        
+        if not spans:
+            st.caption("아직 기록된 요청이 없습니다.")
+            return
+        
+        rows = []
+        for item in spans:
+            attributes = item['attributes']
+            rows.append({
+                '단계': "　" * item['depth'] + item['name'],
+                'ms': item['duration_ms'],
+                '입력 토큰': attributes.get('prompt_tokens'),
+                '출력 토큰': attributes.get('completion_tokens'),
+                '캐시': attributes.get('cache_hit'),
+                '비고': attributes.get('category') or attributes.get('course_id') or attributes.get('error') or "",
+            })
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
+render_trace_panel()
+
 # ==================== 선택 조건 확인 ====================
 if (not st.session_state.get("companion") or 
     not st.session_state.get("travel_type") or 
@@ -223,38 +267,17 @@ if RAG_AVAILABLE:
         ORS_API_KEY = os.getenv("OPENROUTESERVICE_API_KEY", "")
     
     def calculate_walking_distance(course):
+        """도보 경로 거리 (routes 공용 캐시 → 같은 좌표 조합은 rerun / 상세 페이지에서 ORS를 다시 호출하지 않음)"""
         if not ORS_API_KEY:
             return 2.0
         try:
-            optimized_order = course.get('optimized_order', ['tour', 'cafe', 'restaurant'])
-            places = [course[category] for category in optimized_order if category in course]
-            if len(places) < 2:
+            coordinates = course_coordinates(course)
+            if len(set(map(tuple, coordinates))) < 2:
                 return 2.0
-            
-            coordinates = []
-            for place in places:
-                lat = lng = None
-                if 'coordinates' in place:
-                    coords = place['coordinates']
-                    lat = coords.get('latitude')
-                    lng = coords.get('longitude')
-                if not lat:
-                    lat = place.get('latitude') or place.get('mapy')
-                if not lng:
-                    lng = place.get('longitude') or place.get('mapx')
-                if lat and lng:
-                    coord = [float(lng), float(lat)]
-                    if coord not in coordinates:
-                        coordinates.append(coord)
-            
-            if len(coordinates) < 2:
-                return 2.0
-            
-            client = ors.Client(key=ORS_API_KEY)
-            route = client.directions(coordinates=coordinates, profile='foot-walking', format='geojson')
-            distance_m = route['features'][0]['properties']['segments'][0]['distance']
-            return round(distance_m / 1000, 1)
-        except:
+            route = walking_route(coordinates, ORS_API_KEY, page="rec")
+            return round(route_distance_m(route) / 1000, 1)
+        except Exception as e:
+            print(f"⚠️ 도보 거리 계산 실패 (기본값 2.0km 사용): {e.__class__.__name__}: {e}")
             return 2.0
     
     def extract_advantages(course):
@@ -333,41 +356,113 @@ if RAG_AVAILABLE:
         
         return facilities
     
-    @st.cache_resource
-    def get_recommender_v2():
-        recommender = CourseRecommender()
-        recommender.load_json_with_dedup('./data/tour_final.json', './data/cafe_final.json', './data/restaurant_final.json')
-        recommender.setup_vectorstore()
-        return recommender
+else:
+    st.warning("⚠️ RAG 엔진을 사용할 수 없어 테스트 데이터를 표시합니다.")
+    def calculate_walking_distance(course): return 2.3
+    def extract_advantages(course): return ["접근성이 우수한 편리한 위치", "다양한 볼거리와 즐길거리", "쾌적하고 안전한 환경"]
+    def collect_facilities(course): return {'휠체어': True, '화장실': True, '주차장': True, '승강기': False}
+
+# ==================== 코스 카드 렌더링 ====================
+def render_course_card(idx, course, show_button=True):
+    """코스 카드 1개 렌더링 (설명 생성 전이면 장점 영역에 대기 표시)"""
+    tour_place = course.get('tour', {})
+    thumbnail = tour_place.get('thumbnail_url') or tour_place.get('firstimage') or 'https://via.placeholder.com/400x280?text=No+Image'
+    distance = calculate_walking_distance(course)
+    facilities = collect_facilities(course)
+    title = course.get('title', f'코스 {idx}')
+    explanation_ready = course.get('explanation_ready', True)
+    
+    st.markdown('<div class="full-card-container">', unsafe_allow_html=True)
+    
+    # 이미지 섹션 (코스 번호 포함)
+    st.markdown(f'''<div class="card-image-section">
+        <div class="course-number-banner banner-color-{idx}">코스 {idx}</div>
+        <div class="distance-info-badge">🗺️ {distance}km</div>
+        <img src="{thumbnail}" alt="코스 {idx}">
+    </div>''', unsafe_allow_html=True)
+    
+    card_html = f'<div class="course-card-body"><div class="card-main-title">{title}</div><div class="benefits-section"><div class="benefits-header">이 코스의 장점</div>'
+    if explanation_ready:
+        for advantage in extract_advantages(course):
+            card_html += f'<div class="benefit-row"><span class="benefit-checkmark check-color-{idx}">✓</span><span>{advantage}</span></div>'
+    else:
+        card_html += '<div class="benefit-row"><span>⏳ 코스 설명을 준비하고 있습니다...</span></div>'
+    
+    card_html += f'''</div><div class="amenities-section"><div class="amenities-header">편의시설</div><div class="amenities-grid">
+    <div class="amenity-item" style="opacity: {1 if facilities.get('휠체어') else 0.3}"><div class="amenity-emoji">♿</div><div class="amenity-text">휠체어</div></div>
+    <div class="amenity-item" style="opacity: {1 if facilities.get('화장실') else 0.3}"><div class="amenity-emoji">🚻</div><div class="amenity-text">화장실</div></div>
+    <div class="amenity-item" style="opacity: {1 if facilities.get('주차장') else 0.3}"><div class="amenity-emoji">🅿️</div><div class="amenity-text">주차장</div></div>
+    <div class="amenity-item" style="opacity: {1 if facilities.get('승강기') else 0.3}"><div class="amenity-emoji">🛗</div><div class="amenity-text">승강기</div></div>
+    </div></div></div>'''
     
-    current_condition = f"{st.session_state['companion']}_{st.session_state['travel_type']}_{st.session_state['region']}"
+    st.markdown(card_html, unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('<div style="height: 16px;"></div>', unsafe_allow_html=True)
+    
+    # 상세보기 버튼
+    if show_button and st.button("상세보기", key=f"btn_{idx}", use_container_width=True, type="secondary"):
+        st.session_state["selected_course"] = course
+        st.session_state["selected_course_idx"] = idx
+        st.switch_page("pages/5_map.py")
+
+if RAG_AVAILABLE:
+    current_condition = condition_key(st.session_state['companion'], st.session_state['travel_type'], st.session_state['region'])
     need_new = (st.session_state.get("last_condition") != current_condition or st.session_state.get("recommended_courses") is None)
     
     if need_new:
-        with st.spinner("🤖 AI가 최적의 코스를 추천하고 있습니다..."):
-            try:
-                recommender = get_recommender_v2()
-                travel_type_str = st.session_state["travel_type"]
-                trip_purpose = [travel_type_str] if isinstance(travel_type_str, str) else travel_type_str
-                courses = recommender.create_courses(
-                    user_type=st.session_state["companion"],
-                    trip_purpose=trip_purpose,
-                    region=st.session_state["region"]
-                )
-                st.session_state["recommended_courses"] = courses
-                st.session_state["last_condition"] = current_condition
+        # 코스 생성은 작업 큐에서 실행하고, 이 페이지는 job_id로 진행 상황만 확인
+        jobs = get_course_jobs()
+        job_id = st.session_state.get("course_job_id")
+        job = jobs.get(job_id) if job_id else None
+        if job is None or job['condition'] != current_condition or job['status'] in ("failed", "cancelled"):
+            if job is not None and job['status'] in ("queued", "running"):
+                # 조건이 바뀌어 더 이상 필요 없는 작업
+                jobs.cancel(job_id)
+            job_id = jobs.submit(
+                st.session_state["companion"],
+                st.session_state["travel_type"],
+                st.session_state["region"]
+            )
+            st.session_state["course_job_id"] = job_id
+        
+        @st.fragment(run_every=float(get_setting("COURSE_JOB_POLL_INTERVAL", "1.0")))
+        def course_job_progress():
+            """작업 상태 확인: 진행 중이면 준비된 카드 표시, 끝나면 전체 페이지 다시 그리기"""
+            job = get_course_jobs().get(st.session_state["course_job_id"])
+            if job is None:
+                st.error("❌ 추천 작업을 찾을 수 없습니다. 다시 선택해주세요.")
+                return
+            
+            if job['status'] == "done":
+                st.session_state["recommended_courses"] = job['courses']
+                st.session_state["last_condition"] = job['condition']
+                st.session_state["last_trace_id"] = job['trace_id']
                 st.rerun()
-            except Exception as e:
-                st.error(f"❌ 추천 중 오류: {e}")
-                st.stop()
+            if job['status'] in ("failed", "cancelled"):
+                st.error(f"❌ 추천 중 오류: {job['error'] or '작업이 취소되었습니다.'}")
+                return
+            
+            # 코스가 준비되는 대로 카드를 먼저 그리고, 설명은 도착하는 대로 채움
+            st.info("🤖 AI가 최적의 코스를 추천하고 있습니다...")
+            cols = st.columns(3, gap="large")
+            for idx, (col, course) in enumerate(zip(cols, job['courses'][:3]), 1):
+                with col:
+                    render_course_card(idx, course, show_button=False)
+        
+        course_job_progress()
+        
+        st.markdown("<div style='height: 60px;'></div>", unsafe_allow_html=True)
+        col1, col2, col3 = st.columns([2, 2, 2])
+        with col2:
+            if st.button("✋ 추천 취소하고 다시 선택하기", use_container_width=True):
+                get_course_jobs().cancel(st.session_state["course_job_id"])
+                st.session_state.pop("course_job_id", None)
+                st.switch_page("pages/3_region.py")
+        st.stop()
     
     courses = st.session_state.get("recommended_courses", [])
 else:
-    st.warning("⚠️ RAG 엔진을 사용할 수 없어 테스트 데이터를 표시합니다.")
     courses = []
-    def calculate_walking_distance(course): return 2.3
-    def extract_advantages(course): return ["접근성이 우수한 편리한 위치", "다양한 볼거리와 즐길거리", "쾌적하고 안전한 환경"]
-    def collect_facilities(course): return {'휠체어': True, '화장실': True, '주차장': True, '승강기': False}
 
 if not courses:
     st.warning("⚠️ 조건에 맞는 코스를 찾을 수 없습니다.")
@@ -377,47 +472,11 @@ if not courses:
             st.switch_page("app.py")
     st.stop()
 
-# ==================== 코스 카드 렌더링 ====================
 cols = st.columns(3, gap="large")
 
 for idx, (col, course) in enumerate(zip(cols, courses[:3]), 1):
     with col:
-        tour_place = course.get('tour', {})
-        thumbnail = tour_place.get('thumbnail_url') or tour_place.get('firstimage') or 'https://via.placeholder.com/400x280?text=No+Image'
-        distance = calculate_walking_distance(course)
-        advantages = extract_advantages(course)
-        facilities = collect_facilities(course)
-        title = course.get('title', f'코스 {idx}')
-        
-        st.markdown('<div class="full-card-container">', unsafe_allow_html=True)
-        
-        # 이미지 섹션 (코스 번호 포함)
-        st.markdown(f'''<div class="card-image-section">
-            <div class="course-number-banner banner-color-{idx}">코스 {idx}</div>
-            <div class="distance-info-badge">🗺️ {distance}km</div>
-            <img src="{thumbnail}" alt="코스 {idx}">
-        </div>''', unsafe_allow_html=True)
-        
-        card_html = f'<div class="course-card-body"><div class="card-main-title">{title}</div><div class="benefits-section"><div class="benefits-header">이 코스의 장점</div>'
-        for advantage in advantages:
-            card_html += f'<div class="benefit-row"><span class="benefit-checkmark check-color-{idx}">✓</span><span>{advantage}</span></div>'
-        
-        card_html += f'''</div><div class="amenities-section"><div class="amenities-header">편의시설</div><div class="amenities-grid">
-        <div class="amenity-item" style="opacity: {1 if facilities.get('휠체어') else 0.3}"><div class="amenity-emoji">♿</div><div class="amenity-text">휠체어</div></div>
-        <div class="amenity-item" style="opacity: {1 if facilities.get('화장실') else 0.3}"><div class="amenity-emoji">🚻</div><div class="amenity-text">화장실</div></div>
-        <div class="amenity-item" style="opacity: {1 if facilities.get('주차장') else 0.3}"><div class="amenity-emoji">🅿️</div><div class="amenity-text">주차장</div></div>
-        <div class="amenity-item" style="opacity: {1 if facilities.get('승강기') else 0.3}"><div class="amenity-emoji">🛗</div><div class="amenity-text">승강기</div></div>
-        </div></div></div>'''
-        
-        st.markdown(card_html, unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-        st.markdown('<div style="height: 16px;"></div>', unsafe_allow_html=True)
-        
-        # 상세보기 버튼
-        if st.button("상세보기", key=f"btn_{idx}", use_container_width=True, type="secondary"):
-            st.session_state["selected_course"] = course
-            st.session_state["selected_course_idx"] = idx
-            st.switch_page("pages/5_map.py")
+        render_course_card(idx, course)
 
 # ==================== 하단 버튼 ====================
 st.markdown("<div style='height: 60px;'></div>", unsafe_allow_html=True)
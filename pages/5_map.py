@@ -4,10 +4,9 @@
 """
 
 import streamlit as st
-import folium
-from streamlit_folium import st_folium
-import openrouteservice as ors
 import os
+from lazy_imports import lazy_module
+from routes import route_distance_m, walking_route
 from style import (
     apply_common_style,
     render_header,
@@ -16,6 +15,10 @@ from style import (
     show_help_modal
 )
 
+# 지도 라이브러리는 사용하는 시점에 임포트 (코스 정보가 먼저 표시됨)
+folium = lazy_module("folium")
+streamlit_folium = lazy_module("streamlit_folium")
+
 # ==================== 접근성 정보 처리 함수 ====================
 def process_accessibility_info(facilities):
     """접근성 정보를 3단계 우선순위로 분류하고 처리"""
@@ -674,18 +677,11 @@ try:
     
     if ORS_API_KEY and len(coordinates_ors) >= 2:
         try:
-            client = ors.Client(key=ORS_API_KEY)
-            
-            # 경로 계산
-            route = client.directions(
-                coordinates=coordinates_ors,
-                profile='foot-walking',
-                format='geojson',
-                validate=False
-            )
+            # 경로 계산 (4_rec 카드에서 계산한 경로는 공용 캐시에서 재사용, 키별 속도 제한 + 429 재시도)
+            route = walking_route(coordinates_ors, ORS_API_KEY, page="map")
             
             # 거리 정보 추출 (미터 단위)
-            total_distance = route['features'][0]['properties']['segments'][0]['distance']
+            total_distance = route_distance_m(route)
             distance_text = f"{total_distance / 1000:.1f}km"
             
             # 경로 지오메트리 저장
@@ -845,7 +841,7 @@ try:
                     ).add_to(m)
         
         # 지도 표시 (returned_objects=[] 로 무한 리렌더링 방지)
-        st_folium(m, width=None, height=500, returned_objects=[])
+        streamlit_folium.st_folium(m, width=None, height=500, returned_objects=[])
     else:
         st.warning("⚠️ 표시할 수 있는 장소 좌표가 부족합니다.")
 
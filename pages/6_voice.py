@@ -4,10 +4,24 @@
 """
 
 import streamlit as st
-from openai import OpenAI
 import json
 from dotenv import load_dotenv
 import os
+from app_logging import get_logger
+from config import get_flag, get_setting
+from rate_limit import rate_limited
+from course_prefetch import get_course_prefetcher
+from slot_extractor import resolve_user_info
+from voice_service import (
+    COMPLETION_MESSAGE,
+    GREETING_MESSAGE,
+    QUESTION_MAP,
+    audio_fingerprint,
+    get_openai_client,
+    get_tts_cache,
+    stream_transcription,
+    transcribe_audio
+)
 from style import (
     apply_common_style, 
     render_header, 
@@ -16,6 +30,8 @@ from style import (
     render_accessibility_toggle
 )
 
+logger = get_logger("pages.voice")
+
 # 페이지 설정
 st.set_page_config(
     page_title="음성으로 선택하기 - 고운길",
@@ -50,7 +66,9 @@ def extract_user_info(text, client):
 }}
     """
 
-    resp = client.chat.completions.create(
+    resp = rate_limited(
+        "gpt-4o-mini",
+        client.chat.completions.create,
         model="gpt-4o-mini",
         messages=[{"role": "user", "content": extraction_prompt}],
         response_format={"type": "json_object"}
@@ -66,7 +84,7 @@ init_session_state()
 # 채팅 히스토리 초기화
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = [
-        {"role": "assistant", "content": "안녕하세요! 예술, 전통, 산책, 체험 중 어떤 테마를 원하시나요?"}
+        {"role": "assistant", "content": GREETING_MESSAGE}
     ]
     st.session_state.user_info = {
         "travel_type": None,
@@ -181,7 +199,9 @@ if not OPENAI_API_KEY:
     st.error("⚠️ OPENAI_API_KEY가 .env 파일에 없습니다.")
     st.stop()
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# 프로세스 공용 클라이언트 / TTS 캐시 (warmup.py가 배포 직후 미리 생성, 고정 문구는 API 호출 없이 바로 재생)
+client = get_openai_client(OPENAI_API_KEY)
+tts_cache = get_tts_cache()
 
 # ============================================================================
 # 메인 타이틀
@@ -202,16 +222,9 @@ if st.session_state.chat_history and not st.session_state.initial_tts_played:
     first_msg = st.session_state.chat_history[0]["content"]
     
     try:
-        tts_audio = client.audio.speech.create(
-            model="gpt-4o-mini-tts",
-            voice="nova",
-            input=first_msg
-        )
-        
-        with open("assistant_tts_initial.mp3", "wb") as f:
-            f.write(tts_audio.read())
-        
-        st.audio("assistant_tts_initial.mp3", autoplay=True)
+        # 캐시된 음성을 메모리에서 바로 재생 (세션 간 파일 공유 없음)
+        tts_audio = tts_cache.synthesize(client, first_msg)
+        st.audio(tts_audio, format="audio/mp3", autoplay=True)
         st.session_state.initial_tts_played = True
     except Exception as e:
         st.warning(f"TTS 오류: {e}")
@@ -241,26 +254,53 @@ audio_bytes = st.audio_input("🎤 마이크를 클릭하여 말씀해주세요"
 # ============================================================================
 # STT 처리
 # ============================================================================
-if audio_bytes:
+# 스트리밍 인식 모드 (텍스트가 조각 단위로 먼저 표시됨)
+STT_STREAMING = get_flag("STT_STREAMING", False)
+
+audio_content = audio_bytes.getvalue() if audio_bytes else None
+audio_id = audio_fingerprint(audio_content) if audio_content else None
+
+
+@st.fragment(run_every=float(get_setting("TTS_POLL_INTERVAL", "0.5")))
+def tts_playback():
+    """
+    백그라운드 TTS 합성 대기 (스크립트 실행을 막지 않고 이 영역만 주기적으로 확인)
+    끝나면 결과를 tts_audio / tts_error에 옮기고 전체 페이지를 한 번 다시 그림 → 재생은 1회, 폴링 종료
+    """
+    tts_future = st.session_state.get("tts_future")
+    if tts_future is None:
+        return
+    if not tts_future.done():
+        st.caption("🔊 응답 음성 준비 중…")
+        return
+    st.session_state.pop("tts_future", None)
     try:
-        with st.spinner("🎧 음성 인식 중…"):
-            # 1) 오디오 읽기
-            audio_content = audio_bytes.read()
-            
-            # 2) 파일 저장
-            with open("temp_audio.webm", "wb") as f:
-                f.write(audio_content)
-            
-            # 3) Whisper STT
-            with open("temp_audio.webm", "rb") as audio_file:
-                resp = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="ko",
-                    response_format="json"
-                )
+        st.session_state["tts_audio"] = tts_future.result()
+    except Exception as e:
+        st.session_state["tts_error"] = str(e)
+    st.rerun()
+
+
+# 같은 녹음은 rerun마다 다시 인식하지 않음 (세션별로 관리)
+if audio_content and st.session_state.get("last_audio_id") != audio_id:
+    try:
+        # 메모리에서 바로 업로드 (임시 파일 없음 → 동시 사용자 간 충돌 없음)
+        audio_name = audio_bytes.name or "recording.wav"
+        audio_type = audio_bytes.type or "audio/wav"
         
-        recognized_text = resp.text
+        if STT_STREAMING:
+            partial_placeholder = st.empty()
+            recognized_text = ""
+            for delta in stream_transcription(client, audio_content, audio_name, audio_type):
+                recognized_text += delta
+                partial_placeholder.info(f"🎧 인식 중: {recognized_text}")
+            partial_placeholder.empty()
+        else:
+            with st.spinner("🎧 음성 인식 중…"):
+                recognized_text = transcribe_audio(client, audio_content, audio_name, audio_type)
+        
+        # 인식에 성공한 녹음만 기록 (실패하면 다음 rerun에서 다시 시도)
+        st.session_state["last_audio_id"] = audio_id
         
         # 사용자 입력 저장
         st.session_state.chat_history.append({
@@ -269,7 +309,11 @@ if audio_bytes:
         })
         
         # -------- 사용자 정보 추출 --------
-        extracted = extract_user_info(recognized_text, client)
+        # 규칙 기반 fast path 우선, 모호할 때만 gpt-4o-mini 호출
+        extracted = resolve_user_info(
+            recognized_text,
+            lambda text: extract_user_info(text, client)
+        )
         
         for k in ["travel_type", "companion", "region"]:
             if extracted.get(k):
@@ -281,18 +325,12 @@ if audio_bytes:
         order = ["travel_type", "companion", "region"]
         missing_fields = [k for k in order if st.session_state.user_info[k] is None]
         
-        question_map = {
-            "travel_type": "예술, 전통, 산책, 체험 중 어떤 테마를 원하시나요?",
-            "companion": "혹시 유모차/휠체어 사용 여부 등 동행인의 이동 특성을 알려주실 수 있을까요?",
-            "region": "서울의 어느 구로 방문하고 싶으신가요?"
-        }
-        
         # 정보 부족 → 다음 질문
         if missing_fields:
-            assistant_text = question_map[missing_fields[0]]
+            assistant_text = QUESTION_MAP[missing_fields[0]]
         # 모든 정보 수집 완료
         else:
-            assistant_text = "네, 알겠습니다. 추천 코스를 안내해드리겠습니다."
+            assistant_text = COMPLETION_MESSAGE
         
         # assistant 메시지 누적
         st.session_state.chat_history.append({
@@ -300,20 +338,20 @@ if audio_bytes:
             "content": assistant_text
         })
         
-        # 자동 TTS 출력
-        try:
-            tts_audio = client.audio.speech.create(
-                model="gpt-4o-mini-tts",
-                voice="nova",
-                input=assistant_text
-            )
-            
-            with open("assistant_tts.mp3", "wb") as f:
-                f.write(tts_audio.read())
-            
-            st.audio("assistant_tts.mp3", autoplay=True)
-        except Exception as e:
-            st.warning(f"TTS 오류: {e}")
+        # 자동 TTS: 응답 텍스트가 정해지는 즉시 백그라운드 합성 시작 (나머지 화면은 먼저 렌더링)
+        st.session_state["tts_future"] = tts_cache.submit(client, assistant_text)
+        
+        # 세 가지 정보가 모두 모이면 추천 코스 생성 작업을 미리 등록 (4_rec.py가 같은 job_id로 합류)
+        if not missing_fields:
+            try:
+                st.session_state["course_job_id"] = get_course_prefetcher().prefetch(
+                    st.session_state.user_info["companion"],
+                    st.session_state.user_info["travel_type"],
+                    st.session_state.user_info["region"],
+                    replaces=st.session_state.get("course_job_id")
+                )
+            except Exception as e:
+                logger.warning("⚠️ 코스 선행 생성 실패: %s", e)
         
         # UI 표시
         st.success("✅ 음성 인식 완료!")
@@ -322,6 +360,14 @@ if audio_bytes:
     except Exception as e:
         st.error(f"❌ STT 처리 중 오류 발생: {e}")
 
+# 응답 음성: 합성 중이면 대기 영역, 끝났으면 한 번만 재생 (다음 실행부터는 표시하지 않음)
+if st.session_state.get("tts_future") is not None:
+    tts_playback()
+elif "tts_audio" in st.session_state:
+    st.audio(st.session_state.pop("tts_audio"), format="audio/mp3", autoplay=True)
+elif "tts_error" in st.session_state:
+    st.warning(f"TTS 오류: {st.session_state.pop('tts_error')}")
+
 # ============================================================================
 # 채팅 히스토리 표시
 # ============================================================================
@@ -425,7 +471,7 @@ else:
     with col1:
         if st.button("🔄 음성 입력 초기화", use_container_width=True):
             st.session_state.chat_history = [
-                {"role": "assistant", "content": "안녕하세요! 예술, 전통, 산책, 체험 중 어떤 테마를 원하시나요?"}
+                {"role": "assistant", "content": GREETING_MESSAGE}
             ]
             st.session_state.user_info = {
                 "travel_type": None,
@@ -448,4 +494,4 @@ st.markdown("""
         <p>🛣️ 고운길 - 모두를 위한 나들이 추천 서비스</p>
         <p>음성 인식 기능으로 더욱 편리하게 이용하세요</p>
     </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
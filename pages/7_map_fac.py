@@ -1,6 +1,5 @@
 import streamlit as st
 import json
-import pandas as pd
 import base64
 
 # 페이지 설정
@@ -0,0 +1,26 @@
+"""
+📝 장소 스니펫 파일 공용 함수
+- enrich_places.py(생성)와 rag_engine.py(사용)가 같은 해시 / 로드 함수를 쓰도록 분리
+- 해시는 원본 장소 데이터(data/*_final.json 항목, facilities는 목록) 기준
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict
+
+SNIPPETS_PATH = './data/place_snippets.json'
+
+
+def content_hash(place: Dict) -> str:
+    """스니펫 재생성 여부 판단용 해시 (원본 장소의 content + facilities)"""
+    payload = json.dumps([place.get('content', ''), place.get('facilities', [])], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def load_snippets(path: str = SNIPPETS_PATH) -> Dict[str, Dict[str, Dict]]:
+    """저장된 스니펫 로드 (없으면 빈 dict)"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
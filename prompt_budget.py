@@ -0,0 +1,155 @@
+"""
+📏 프롬프트 토큰 예산 관리
+- 토큰 수 측정 (tiktoken, 사용 불가 시 글자 수 기반 근사)
+- 호출 종류별 예산 (PROMPT_BUDGET_<NAME> 설정으로 조정)
+- 결정적 축약: 문장 단위 자르기, 목록 뒤쪽부터 제외
+- 호출별 prompt / completion 토큰 사용량 기록
+"""
+
+import re
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence
+
+from app_logging import get_logger
+from config import get_setting
+
+logger = get_logger("prompt_budget")
+
+# 호출 종류별 기본 프롬프트 예산 (토큰)
+DEFAULT_BUDGETS = {
+    'rerank': 3000,
+    'courses': 2500,
+    'explanation': 1800,
+}
+
+_SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?다])\s")
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """모델별 tiktoken 인코딩 (tiktoken이 없거나 인코딩 파일을 받을 수 없으면 None)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("⚠️ tiktoken 인코딩 로드 실패 (글자 수 근사 사용): %s", e.__class__.__name__)
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """토큰 수 (tiktoken을 쓸 수 없으면 한국어 기준 글자 수 근사)"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // 2 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def get_budget(name: str) -> int:
+    """호출 종류별 예산 (PROMPT_BUDGET_RERANK 등으로 재정의)"""
+    return int(get_setting(f"PROMPT_BUDGET_{name.upper()}", str(DEFAULT_BUDGETS.get(name, 2000))))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+    """max_tokens 이내로 자르기 (가능하면 문장 경계, 항상 같은 입력 → 같은 결과)"""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+
+    kept = []
+    for sentence in _SENTENCE_END_PATTERN.split(text):
+        candidate = " ".join(kept + [sentence])
+        if count_tokens(candidate, model) > max_tokens:
+            break
+        kept.append(sentence)
+    if kept:
+        return " ".join(kept)
+
+    # 첫 문장부터 예산 초과 → 토큰 단위로 자름
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 2]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+
+def fit_items(items: Sequence, budget: int, render: Callable[[object], str],
+              model: str = "gpt-4o", min_items: int = 0) -> List:
+    """앞에서부터 예산 안에 들어가는 항목만 선택 (순위 순서 유지, 최소 min_items개)"""
+    selected = []
+    used = 0
+    for item in items:
+        tokens = count_tokens(render(item), model)
+        if used + tokens > budget and len(selected) >= min_items:
+            break
+        selected.append(item)
+        used += tokens
+    return selected
+
+
+class TokenUsageRecorder:
+    """호출별 토큰 사용량 / 지연 시간 기록 (스레드 안전)"""
+
+    def __init__(self, max_records: int = 500):
+        self.max_records = max_records
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, model: str, prompt_tokens: int, completion_tokens: int,
+               latency: float, cached: bool = False) -> Dict:
+        entry = {
+            'name': name,
+            'model': model,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'latency': round(latency, 3),
+            'cached': cached,
+            'timestamp': time.time(),
+        }
+        with self._lock:
+            self.records.append(entry)
+            if len(self.records) > self.max_records:
+                del self.records[:len(self.records) - self.max_records]
+        return entry
+
+    def record_response(self, name: str, model: str, prompt: str, response,
+                        started_at: float) -> Dict:
+        """LangChain 응답의 usage_metadata 기록 (없으면 직접 측정)"""
+        usage = getattr(response, "usage_metadata", None) or {}
+        prompt_tokens = usage.get('input_tokens') or count_tokens(prompt, model)
+        completion_tokens = usage.get('output_tokens') or count_tokens(getattr(response, "content", ""), model)
+        return self.record(name, model, prompt_tokens, completion_tokens, time.perf_counter() - started_at)
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        """호출 종류별 합계 {name: {calls, prompt_tokens, completion_tokens, latency}}"""
+        totals = defaultdict(lambda: {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'latency': 0.0})
+        with self._lock:
+            for entry in self.records:
+                if entry['cached']:
+                    continue
+                total = totals[entry['name']]
+                total['calls'] += 1
+                total['prompt_tokens'] += entry['prompt_tokens']
+                total['completion_tokens'] += entry['completion_tokens']
+                total['latency'] += entry['latency']
+        return dict(totals)
+
+    def summary(self) -> str:
+        parts = [
+            f"{name} {t['calls']}회 (입력 {t['prompt_tokens']} / 출력 {t['completion_tokens']} 토큰)"
+            for name, t in sorted(self.totals().items())
+        ]
+        return ", ".join(parts) or "기록 없음"
+
+
+usage = TokenUsageRecorder()
@@ -7,61 +7,259 @@
 - Streamlit 완벽 호환
 """
 
+import contextvars
+import hashlib
 import json
+import logging
 import os
 import math
 import re
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import partial
 from itertools import permutations
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from dotenv import load_dotenv
 
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_chroma import Chroma
+from langchain_openai import ChatOpenAI
 from langchain_core.documents import Document
 
+from app_logging import get_logger
+from config import get_flag, get_setting
+from deadline import (DeadlineExceeded, call_with_timeout, deadline_scope, hedged_call,
+                      iterate_with_deadline, latency_tracker, time_budget, with_timeout)
+from embedding_backends import create_embeddings
+from lexical_index import LexicalIndex, parse_list_field, reciprocal_rank_fusion
+from llm_cache import create_llm_cache
+from place_snippets import SNIPPETS_PATH, content_hash, load_snippets
+from prompt_budget import count_tokens, fit_items, get_budget, truncate_tokens, usage as token_usage
+from rate_limit import get_limiter
+from tracing import current_span, span, tracer
+from vector_index import NumpyVectorStore, document_id
+
 # 환경 변수 로드
 load_dotenv()
 
+logger = get_logger("rag_engine")
+
+
+# 테마별 어휘 검색 확장 키워드 (정확한 키워드 의도 반영)
+THEME_KEYWORDS = {
+    '예술': ['예술', '미술관', '박물관', '전시', '갤러리', '공연'],
+    '전통': ['전통', '한옥', '궁', '고궁', '한복', '전통차', '시장'],
+    '자연': ['자연', '공원', '정원', '산책', '숲', '산책로'],
+    '체험': ['체험', '공방', '만들기', '놀이', '테마파크'],
+}
+
+
+# LLM 코스 출력의 코스 헤더 (예: "## 코스 1:")
+COURSE_HEADER_PATTERN = re.compile(r'##\s*코스\s*(\d+):')
+
+
+def _drop_chroma_collection(client, name: str) -> None:
+    """더 이상 참조되지 않는 Chroma 컬렉션 삭제 (weakref.finalize 콜백)"""
+    try:
+        client.delete_collection(name)
+    except Exception as e:
+        logger.debug("Chroma 컬렉션 삭제 실패 (%s): %s", name, e)
+
+
+class EngineState(NamedTuple):
+    """검색 상태 스냅샷 (핫 리로드 시 통째로 교체)"""
+    integrated_data: Optional[Dict] = None
+    vectorstore: object = None
+    lexical_index: Optional[LexicalIndex] = None
+
 
 class TourRecommendationEngine:
     """관광 코스 추천 엔진"""
     
-    def __init__(self):
-        """초기화"""
-        # API 키 확인 (Streamlit secrets 우선, 환경 변수 fallback)
-        try:
-            import streamlit as st
-            api_key = st.secrets.get("OPENAI_API_KEY")
-        except:
-            api_key = None
-        
-        if not api_key:
-            api_key = os.getenv("OPENAI_API_KEY")
-        
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY가 설정되지 않았습니다. "
-                ".env 파일 또는 .streamlit/secrets.toml에 API 키를 추가하세요."
-            )
+    def __init__(self, embedding_backend: Optional[str] = None, llm=None, rerank_llm=None, embeddings=None,
+                 hedge_llm=None):
+        """
+        초기화 (embedding_backend: 'openai' | 'local', 미지정 시 EMBEDDING_BACKEND 설정)
+        llm / rerank_llm / embeddings: 직접 주입 시 해당 OpenAI 클라이언트를 만들지 않음 (벤치마크/테스트용)
+        hedge_llm: 헤지 요청용 빠른 모델 (미지정 시 HEDGE_MODEL 설정, 비어 있으면 헤지 없음)
+        """
+        api_key = None
+        if llm is None or rerank_llm is None or embeddings is None:
+            # API 키 확인 (Streamlit secrets 우선, 환경 변수 fallback)
+            try:
+                import streamlit as st
+                api_key = st.secrets.get("OPENAI_API_KEY")
+            except:
+                api_key = None
+            
+            if not api_key:
+                api_key = os.getenv("OPENAI_API_KEY")
+            
+            if not api_key:
+                raise ValueError(
+                    "OPENAI_API_KEY가 설정되지 않았습니다. "
+                    ".env 파일 또는 .streamlit/secrets.toml에 API 키를 추가하세요."
+                )
         
         # LLM 설정
-        self.llm = ChatOpenAI(model="gpt-5.1", temperature=0.7, api_key=api_key)
-        self.rerank_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key)
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-large", api_key=api_key)
+        # 재시도는 rate_limit 계층에서 (클라이언트 자체 재시도와 겹치지 않도록 0)
+        # 요청별 마감 시간은 deadline 모듈에서, 클라이언트 timeout은 연결이 멈춘 경우의 상한
+        llm_timeout = float(get_setting("LLM_TIMEOUT", "60"))
+        self.llm = llm or ChatOpenAI(model="gpt-5.1", temperature=0.7, api_key=api_key, max_retries=0,
+                                     timeout=llm_timeout)
+        self.rerank_llm = rerank_llm or ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key, max_retries=0,
+                                                   timeout=llm_timeout)
+        hedge_model = get_setting("HEDGE_MODEL", "")
+        if hedge_llm is None and hedge_model and api_key:
+            hedge_llm = ChatOpenAI(model=hedge_model, temperature=0.7, api_key=api_key, max_retries=0,
+                                   timeout=llm_timeout)
+        self.hedge_llm = hedge_llm
+        self.embeddings = embeddings or create_embeddings(embedding_backend, api_key=api_key)
+        
+        # LLM 응답 캐시 (같은 조건/후보면 gpt-5.1 호출 생략)
+        self.llm_cache = create_llm_cache()
         
         # 상수
         self.WALK_SPEED_NORMAL = 4.0
         self.WALK_SPEED_SLOW = 2.5
-        
-        # 데이터 저장
-        self.integrated_data = None
-        self.vectorstore = None
-        
-        print("✅ RAG Engine 초기화 완료!")
+        self.RRF_K = 60
+        self.CANDIDATE_CACHE_SIZE = 128
+        
+        # 벡터 인덱스 백엔드 ('chroma' | 'numpy') 및 numpy 인덱스 압축 설정
+        self.vector_backend = get_setting("VECTOR_BACKEND", "chroma").lower()
+        self.index_dim = int(get_setting("VECTOR_INDEX_DIM", "0")) or None
+        self.index_quantize = get_setting("VECTOR_INDEX_QUANTIZE", "") or None
+        # 압축 인덱스의 상위 후보를 원본 벡터로 다시 계산 (VECTOR_INDEX_PATH가 있으면 원본 벡터는 memmap)
+        self.index_rescore = bool(self.index_dim or self.index_quantize) and get_flag("VECTOR_INDEX_RESCORE", True)
+        self.index_path = get_setting("VECTOR_INDEX_PATH", "")
+        
+        # 하이브리드 검색 (BM25 + 벡터 RRF) 사용 여부
+        self.use_hybrid_search = get_flag("HYBRID_SEARCH", True)
+        
+        # 코스 생성 응답 스트리밍 (완성된 코스 블록부터 경로 최적화/설명 생성 시작)
+        self.stream_courses = get_flag("LLM_STREAMING", True)
+        
+        # 장소별 사전 생성 스니펫 (enrich_places.py) 및 설명 생성 방식 ('llm' | 'snippets')
+        self.snippets_path = get_setting("PLACE_SNIPPETS_PATH", SNIPPETS_PATH)
+        self.explanation_mode = get_setting("EXPLANATION_MODE", "llm").lower()
+        self.place_snippets = {}
+        
+        # 데이터 저장 (integrated_data / vectorstore / lexical_index는 _state 스냅샷으로 관리)
+        self._state = EngineState()
+        self._pinned = threading.local()
+        
+        # 지역과 무관한 검색 후보 캐시 (선행 검색 결과 재사용)
+        self._candidate_cache = OrderedDict()
+        self._candidate_lock = threading.Lock()
+        
+        # 핫 리로드
+        self._data_paths = None
+        self._data_mtimes = None
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._watcher_stop = threading.Event()
+        
+        logger.info("✅ RAG Engine 초기화 완료!")
+    
+    
+    # ==================== 상태 스냅샷 ====================
+    def _current_state(self) -> EngineState:
+        """현재 스레드가 고정한 스냅샷 (없으면 최신 상태)"""
+        return getattr(self._pinned, 'state', None) or self._state
+    
+    @property
+    def integrated_data(self) -> Optional[Dict]:
+        return self._current_state().integrated_data
+    
+    @integrated_data.setter
+    def integrated_data(self, value):
+        self._state = self._state._replace(integrated_data=value)
+    
+    @property
+    def vectorstore(self):
+        return self._current_state().vectorstore
+    
+    @vectorstore.setter
+    def vectorstore(self, value):
+        self._state = self._state._replace(vectorstore=value)
+    
+    @property
+    def lexical_index(self) -> Optional[LexicalIndex]:
+        return self._current_state().lexical_index
+    
+    @lexical_index.setter
+    def lexical_index(self, value):
+        self._state = self._state._replace(lexical_index=value)
+    
+    @contextmanager
+    def pinned_state(self):
+        """요청 처리 동안 상태 스냅샷 고정 (도중에 리로드되어도 일관된 데이터 사용)"""
+        previous = getattr(self._pinned, 'state', None)
+        self._pinned.state = previous or self._state
+        try:
+            yield self._pinned.state
+        finally:
+            self._pinned.state = previous
     
     
     def load_json_with_dedup(self, tour_path: str, cafe_path: str, restaurant_path: str) -> Dict:
         """JSON 로드 + 중복 제거"""
+        logger.info("📖 데이터 로드 중...")
+        integrated = self.read_place_files(tour_path, cafe_path, restaurant_path)
+        total = sum(len(places) for places in integrated.values())
+        logger.info("✅ 총 %d개 장소 로드 완료!", total)
+        
+        self._data_paths = (tour_path, cafe_path, restaurant_path)
+        self._data_mtimes = self._file_mtimes()
+        self.integrated_data = integrated
+        return integrated
+    
+    
+    def load_place_snippets(self, path: Optional[str] = None) -> int:
+        """사전 생성 스니펫 로드 → 장소 수 (파일이 없으면 0, 원문 content로 설명 생성)"""
+        try:
+            self.place_snippets = load_snippets(path or self.snippets_path)
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ 스니펫 로드 실패: %s", e)
+            self.place_snippets = {}
+        
+        count = sum(len(places) for places in self.place_snippets.values())
+        if count:
+            logger.info("📝 장소 스니펫 %d개 로드", count)
+            self._check_snippet_coverage()
+        return count
+    
+    
+    def _check_snippet_coverage(self) -> Optional[int]:
+        """현재 데이터에서 스니펫이 실제로 쓰이는 장소 수 (데이터 로드 전이면 None, 하나도 없으면 경고)"""
+        if not self.integrated_data:
+            return None
+        places = [(category_key, title) for category_key in self.place_snippets
+                  for title in (self.integrated_data.get(category_key) or {})]
+        matched = sum(1 for category_key, title in places if self._place_snippet(category_key, title))
+        if places and not matched:
+            logger.warning("⚠️ 스니펫이 현재 데이터와 하나도 일치하지 않습니다 (python enrich_places.py로 다시 생성)")
+        else:
+            logger.info("📝 스니펫 사용 가능 장소 %d/%d개", matched, len(places))
+        return matched
+    
+    
+    def _place_snippet(self, category_key: str, title: str) -> Optional[Dict]:
+        """장소 스니펫 (원본 장소 데이터가 바뀌어 content 해시가 다르면 None)"""
+        snippet = self.place_snippets.get(category_key, {}).get(title)
+        # 검색 메타데이터(facilities가 문자열)가 아닌 원본 장소로 해시 → enrich_places.py와 같은 기준
+        place = (self.integrated_data or {}).get(category_key, {}).get(title)
+        if snippet and place and snippet.get('content_hash') == content_hash(place):
+            return snippet
+        return None
+    
+    
+    @staticmethod
+    def read_place_files(tour_path: str, cafe_path: str, restaurant_path: str) -> Dict:
+        """장소 JSON 파일 3개 읽기 + 제목 기준 중복 제거"""
         def load_and_dedup(path, category_name):
             with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -79,39 +277,27 @@ class TourRecommendationEngine:
                 else:
                     duplicates += 1
             
-            print(f"  {category_name}: {len(data)}개 → {len(unique_data)}개 (중복 {duplicates}개 제거)")
+            logger.info("  %s: %d개 → %d개 (중복 %d개 제거)", category_name, len(data), len(unique_data), duplicates)
             return unique_data
         
-        print("\n📖 데이터 로드 중...")
         tour_data = load_and_dedup(tour_path, "관광지")
         cafe_data = load_and_dedup(cafe_path, "카페")
         restaurant_data = load_and_dedup(restaurant_path, "음식점")
         
-        integrated = {
+        return {
             'tour': {item['title']: item for item in tour_data},
             'cafe': {item['title']: item for item in cafe_data},
             'restaurant': {item['title']: item for item in restaurant_data}
         }
-        
-        print(f"\n✅ 총 {len(tour_data) + len(cafe_data) + len(restaurant_data)}개 장소 로드 완료!\n")
-        self.integrated_data = integrated
-        return integrated
     
     
-    def setup_vectorstore(self) -> Chroma:
-        """벡터스토어 생성 (메모리에만 저장)"""
-        if not self.integrated_data:
-            raise ValueError("먼저 load_json_with_dedup()를 실행하세요!")
-        
-        print("\n" + "="*60)
-        print("📚 벡터스토어 설정")
-        print("="*60)
-        
-        print("📝 문서 생성 중...")
+    def build_documents(self, integrated_data: Optional[Dict] = None) -> List[Document]:
+        """integrated_data → 검색용 Document 목록"""
+        integrated_data = integrated_data or self.integrated_data
         documents = []
         
         for category_key, category_name in [('tour', '관광지'), ('cafe', '카페'), ('restaurant', '음식점')]:
-            for title, data in self.integrated_data[category_key].items():
+            for title, data in integrated_data[category_key].items():
                 content = data.get('content', '')
                 if content:
                     # facilities를 문자열로 변환
@@ -119,6 +305,9 @@ class TourRecommendationEngine:
                     if isinstance(facilities, list):
                         facilities = ', '.join(facilities)
                     
+                    # tags를 문자열로 변환
+                    tags = ', '.join(parse_list_field(data.get('tags', '')))
+                    
                     # 좌표 안전하게 추출
                     lat = self._extract_coordinate(data, 'latitude')
                     lng = self._extract_coordinate(data, 'longitude')
@@ -131,32 +320,241 @@ class TourRecommendationEngine:
                             'address': data.get('address', ''),
                             'content': content,
                             'facilities': facilities,
+                            'tags': tags,
                             'latitude': lat,
                             'longitude': lng
                         }
                     )
                     documents.append(doc)
         
-        print(f"📝 총 {len(documents)}개 문서 생성")
+        return documents
+    
+    
+    def setup_vectorstore(self):
+        """벡터스토어 생성 (VECTOR_BACKEND: chroma=메모리 Chroma, numpy=내장 정확 인덱스)"""
+        if not self.integrated_data:
+            raise ValueError("먼저 load_json_with_dedup()를 실행하세요!")
+        
+        logger.info("📚 벡터스토어 설정")
+        documents = self.build_documents()
+        logger.info("📝 총 %d개 문서 생성", len(documents))
         
         # 벡터스토어 생성 (메모리만 사용)
-        print("🔄 벡터 임베딩 중... (시간이 걸릴 수 있습니다)")
+        logger.info("🔄 벡터 임베딩 중... (시간이 걸릴 수 있습니다)")
         
-        # Chroma 클라이언트 설정 (메모리 전용)
+        if self.vector_backend == "numpy":
+            self.vectorstore = self._setup_numpy_store(documents)
+        else:
+            self.vectorstore = self._setup_chroma_store(documents)
+        
+        # 어휘 인덱스 생성 (BM25, 로드 시 1회)
+        self.lexical_index = LexicalIndex.from_documents(documents)
+        logger.info("✅ 어휘 인덱스 생성 완료! (토큰 %d개)", len(self.lexical_index.postings))
+        logger.info("✅ 벡터스토어 생성 완료!")
+        return self.vectorstore
+    
+    
+    def _setup_chroma_store(self, documents: List[Document]):
+        """Chroma 벡터스토어 (메모리 전용)"""
+        vectorstore = self._new_chroma_collection()
+        if documents:
+            vectorstore.add_documents(documents, ids=[document_id(doc) for doc in documents])
+        return vectorstore
+    
+    
+    def _new_chroma_collection(self):
+        """
+        빈 Chroma 컬렉션 (이름은 매번 새로 → 재로드 시 기존 스냅샷의 컬렉션과 분리)
+        컬렉션을 참조하는 스냅샷이 모두 사라지면 컬렉션도 삭제
+        """
+        # Chroma는 무거운 의존성이므로 사용할 때만 임포트
         import chromadb
+        from langchain_chroma import Chroma
         
         # EphemeralClient 사용 (메모리 전용, 테이블 오류 방지)
         chroma_client = chromadb.EphemeralClient()
-
-        self.vectorstore = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
+        collection_name = f"goun_gil_collection_{uuid.uuid4().hex[:12]}"
+        
+        vectorstore = Chroma(
             client=chroma_client,
-            collection_name="goun_gil_collection"
+            collection_name=collection_name,
+            embedding_function=self.embeddings
         )
+        weakref.finalize(vectorstore, _drop_chroma_collection, chroma_client, collection_name)
+        return vectorstore
+    
+    
+    def _rebuild_chroma_store(self, vectorstore, documents: Dict[str, Document], reembed: List[str]):
+        """
+        새 컬렉션에 documents를 담아 반환 (기존 컬렉션은 변경하지 않음)
+        reembed에 없는 문서는 기존 컬렉션의 임베딩을 복사 → 변경된 문서만 임베딩 호출
+        """
+        new_store = self._new_chroma_collection()
+        reembed = set(reembed)
+        kept_ids = [doc_id for doc_id in documents if doc_id not in reembed]
+        if kept_ids:
+            existing = vectorstore._collection.get(ids=kept_ids, include=["embeddings"])
+            embeddings = dict(zip(existing["ids"], existing["embeddings"]))
+            # 기존 컬렉션에 없던 문서는 새로 임베딩
+            reembed.update(doc_id for doc_id in kept_ids if doc_id not in embeddings)
+            kept_ids = [doc_id for doc_id in kept_ids if doc_id in embeddings]
+            if kept_ids:
+                new_store._collection.add(
+                    ids=kept_ids,
+                    embeddings=[embeddings[doc_id] for doc_id in kept_ids],
+                    documents=[documents[doc_id].page_content for doc_id in kept_ids],
+                    metadatas=[documents[doc_id].metadata for doc_id in kept_ids]
+                )
+        upserts = [doc_id for doc_id in documents if doc_id in reembed]
+        if upserts:
+            new_store.add_documents([documents[doc_id] for doc_id in upserts], ids=upserts)
+        return new_store
+    
+    
+    def _index_fingerprint(self, documents: List[Document]) -> str:
+        """NumPy 인덱스 지문 (문서 + 임베딩 모델 + 압축 / 재점수화 설정)"""
+        model_name = getattr(self.embeddings, 'model', None) or getattr(self.embeddings, 'model_name', '')
+        return NumpyVectorStore.documents_fingerprint(
+            documents, f"{model_name}:{self.index_dim}:{self.index_quantize}:{self.index_rescore}"
+        )
+    
+    
+    def _setup_numpy_store(self, documents: List[Document]) -> NumpyVectorStore:
+        """내장 NumPy 인덱스 (VECTOR_INDEX_PATH가 있으면 저장된 인덱스 재사용)"""
+        fingerprint = self._index_fingerprint(documents)
         
-        print("✅ 벡터스토어 생성 완료!")
-        return self.vectorstore
+        if self.index_path and os.path.exists(os.path.join(self.index_path, 'index.json')):
+            try:
+                store = NumpyVectorStore.load(self.index_path, self.embeddings)
+            except (OSError, ValueError) as e:
+                logger.warning("⚠️ 저장된 인덱스를 읽을 수 없어 다시 생성합니다: %s", e)
+            else:
+                if store.fingerprint == fingerprint:
+                    logger.info("📂 저장된 인덱스 로드: %s", self.index_path)
+                    return store
+                logger.info("🔄 데이터가 변경되어 인덱스를 다시 생성합니다.")
+        
+        store = NumpyVectorStore.from_documents(
+            documents, self.embeddings,
+            dim=self.index_dim, quantize=self.index_quantize, fingerprint=fingerprint,
+            rescore=self.index_rescore
+        )
+        logger.info("📦 NumPy 인덱스: %d개 × %d차원 (%s%s, %.0fKB)", len(store), store.matrix.dim,
+                    store.matrix.quantize or 'float32', " + 재점수화" if self.index_rescore else "",
+                    store.matrix.nbytes / 1024)
+        
+        if self.index_path:
+            store.save(self.index_path)
+            logger.info("💾 인덱스 저장: %s", self.index_path)
+            if self.index_rescore:
+                # 다시 로드해 원본 벡터를 memmap으로 (메모리에는 압축 벡터만 상주)
+                store = NumpyVectorStore.load(self.index_path, self.embeddings)
+        return store
+    
+    
+    # ==================== 증분 수집 / 핫 리로드 ====================
+    def _file_mtimes(self) -> Optional[Tuple]:
+        """데이터 파일 수정 시각"""
+        if not self._data_paths:
+            return None
+        return tuple(os.path.getmtime(path) if os.path.exists(path) else None
+                     for path in self._data_paths)
+    
+    
+    @staticmethod
+    def _document_hash(doc: Document) -> str:
+        """문서 내용 해시 (content + 메타데이터)"""
+        payload = doc.page_content + json.dumps(doc.metadata, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    
+    def reload_data_if_changed(self) -> Optional[Dict]:
+        """
+        데이터 파일이 바뀌었으면 변경된 문서만 벡터 인덱스에 반영하고
+        integrated_data / 인덱스를 원자적으로 교체 (진행 중인 요청은 기존 스냅샷 사용)
+        """
+        if not self._data_paths or not self.vectorstore:
+            return None
+        
+        with self._reload_lock:
+            mtimes = self._file_mtimes()
+            if mtimes == self._data_mtimes:
+                return None
+            
+            try:
+                new_data = self.read_place_files(*self._data_paths)
+            except (OSError, ValueError) as e:
+                # 파일 저장 도중이면 다음 폴링에서 재시도
+                logger.warning("⚠️ 데이터 재로드 실패 (다음 확인 때 재시도): %s", e)
+                return None
+            
+            state = self._state
+            old_docs = {document_id(doc): doc for doc in self.build_documents(state.integrated_data)}
+            new_docs = {document_id(doc): doc for doc in self.build_documents(new_data)}
+            
+            added = [doc_id for doc_id in new_docs if doc_id not in old_docs]
+            removed = [doc_id for doc_id in old_docs if doc_id not in new_docs]
+            updated = [
+                doc_id for doc_id in new_docs
+                if doc_id in old_docs and self._document_hash(new_docs[doc_id]) != self._document_hash(old_docs[doc_id])
+            ]
+            upserts = [new_docs[doc_id] for doc_id in added + updated]
+            
+            # 두 백엔드 모두 새 인덱스를 만들어 교체 (기존 인덱스는 고정된 스냅샷의 검색이 계속 사용)
+            vectorstore = state.vectorstore
+            if isinstance(vectorstore, NumpyVectorStore):
+                vectorstore = vectorstore.with_changes(upserts, removed,
+                                                       fingerprint=self._index_fingerprint(list(new_docs.values())))
+                if self.index_path:
+                    # 재시작 시 다시 임베딩하지 않도록 갱신된 인덱스 저장
+                    try:
+                        vectorstore.save(self.index_path)
+                    except OSError as e:
+                        logger.warning("⚠️ 갱신된 인덱스 저장 실패: %s", e)
+            else:
+                # Chroma: 새 컬렉션에 변경 없는 문서의 임베딩 복사 + 변경된 문서만 임베딩
+                vectorstore = self._rebuild_chroma_store(vectorstore, new_docs, added + updated)
+            
+            lexical_index = LexicalIndex.from_documents(list(new_docs.values()))
+            
+            # 원자적 교체 (단일 참조 할당)
+            self._state = EngineState(new_data, vectorstore, lexical_index)
+            with self._candidate_lock:
+                self._candidate_cache.clear()
+            self._data_mtimes = mtimes
+            
+            summary = {'added': added, 'updated': updated, 'removed': removed}
+            logger.info("🔄 데이터 재로드: 추가 %d / 수정 %d / 삭제 %d", len(added), len(updated), len(removed))
+            return summary
+    
+    
+    def start_data_watcher(self, interval: Optional[float] = None) -> bool:
+        """데이터 파일 폴링 스레드 시작 (DATA_RELOAD_INTERVAL초, 0이면 비활성)"""
+        if interval is None:
+            interval = float(get_setting("DATA_RELOAD_INTERVAL", "10"))
+        if interval <= 0 or self._watcher is not None:
+            return False
+        
+        def watch():
+            while not self._watcher_stop.wait(interval):
+                try:
+                    self.reload_data_if_changed()
+                except Exception as e:
+                    logger.exception("⚠️ 데이터 재로드 오류: %s", e)
+        
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(target=watch, name="place-data-watcher", daemon=True)
+        self._watcher.start()
+        logger.info("👀 데이터 파일 감시 시작 (%.0f초 간격)", interval)
+        return True
+    
+    
+    def stop_data_watcher(self):
+        """데이터 파일 폴링 스레드 종료"""
+        if self._watcher is not None:
+            self._watcher_stop.set()
+            self._watcher.join(timeout=1)
+            self._watcher = None
     
     
     @staticmethod
@@ -218,8 +616,14 @@ class TourRecommendationEngine:
         if len(documents) <= top_k:
             return documents
         
+        # 프롬프트 예산 안에 들어가는 상위 후보만 나열 (순위 순서 유지, 최소 top_k개)
+        model = self._model_name(self.rerank_llm)
+        def format_doc(doc):
+            return f"{doc.metadata.get('title', 'Unknown')}: {doc.metadata.get('content', '')[:100]}"
+        
+        documents = fit_items(documents, get_budget('rerank') - 150, format_doc, model=model, min_items=top_k)
         doc_list = "\n".join([
-            f"{i+1}. {doc.metadata.get('title', 'Unknown')}: {doc.metadata.get('content', '')[:100]}"
+            f"{i+1}. {format_doc(doc)}"
             for i, doc in enumerate(documents)
         ])
         
@@ -234,24 +638,135 @@ class TourRecommendationEngine:
 """
         
         try:
-            response = self.rerank_llm.invoke(prompt)
+            with span("llm.rerank", model=model, candidates=len(documents)) as current:
+                started_at = time.perf_counter()
+                budget = time_budget('rerank')
+                # 예산을 넘겨 버려진 호출도 클라이언트 timeout으로 끝나도록
+                response = call_with_timeout(get_limiter(model).call, budget,
+                                             with_timeout(self.rerank_llm.invoke, budget), prompt)
+                entry = token_usage.record_response('rerank', model, prompt, response, started_at)
+                self._annotate_span(current, entry)
             indices = [int(x.strip())-1 for x in response.content.strip().split(',')]
             reranked = [documents[i] for i in indices if 0 <= i < len(documents)]
             return reranked[:top_k]
         except Exception as e:
-            print(f"⚠️ Reranker 오류: {e}")
+            logger.warning("⚠️ Reranker 오류: %s", e)
             return documents[:top_k]
     
     
-    def search_places(self, user_type: str, trip_purpose: str, category: str, 
-                     region: Optional[str] = None, top_k: int = 10) -> List[Dict]:
-        """장소 검색 + 중복 제거 + 다양성 보장 + 지역 필터링"""
+    @staticmethod
+    def _model_name(llm) -> str:
+        return getattr(llm, "model_name", "") or str(getattr(llm, "model", ""))
+    
+    
+    @staticmethod
+    def _annotate_span(current, usage_entry: Dict) -> None:
+        """LLM 호출 span에 토큰 수 / 캐시 적중 기록"""
+        if current is not None:
+            current.set_attributes(
+                prompt_tokens=usage_entry['prompt_tokens'],
+                completion_tokens=usage_entry['completion_tokens'],
+                cache_hit=usage_entry['cached']
+            )
+    
+    
+    def _log_cache_hit(self) -> None:
+        # 요약 문자열은 로그가 실제로 남을 때만 만듦
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("💾 LLM 캐시 적중 (%s)", self.llm_cache.summary())
+    
+    
+    @staticmethod
+    def _log_usage(call_name: str, entry: Dict) -> None:
+        logger.info("🧾 %s: 입력 %d / 출력 %d 토큰, %.1f초", call_name,
+                    entry['prompt_tokens'], entry['completion_tokens'], entry['latency'],
+                    extra={'call': call_name, 'prompt_tokens': entry['prompt_tokens'],
+                           'completion_tokens': entry['completion_tokens'], 'latency': entry['latency']})
+    
+    
+    def _invoke_llm(self, prompt: str, cache_text: Optional[str] = None, call_name: str = "llm") -> str:
+        """
+        코스 생성용 LLM 호출 (응답 캐시 적용 + 토큰 사용량 기록)
+        cache_text: 캐시 키로 쓸 의미 키 (미지정 시 프롬프트 전체)
+        """
+        model = self._model_name(self.llm)
+        key_text = cache_text if cache_text is not None else prompt
+        
+        with span(f"llm.{call_name}", model=model) as current:
+            if self.llm_cache is not None:
+                cached = self.llm_cache.get(model, key_text)
+                if cached is not None:
+                    entry = token_usage.record(call_name, model, 0, 0, 0.0, cached=True)
+                    self._annotate_span(current, entry)
+                    self._log_cache_hit()
+                    return cached
+            
+            started_at = time.perf_counter()
+            response, answered_by = self._call_llm(prompt, call_name, current)
+            entry = token_usage.record_response(call_name, answered_by, prompt, response, started_at)
+            self._annotate_span(current, entry)
+        self._log_usage(call_name, entry)
+        content = response.content
+        
+        # 헤지 모델 응답은 캐시하지 않음 (다음 요청은 기본 모델 응답을 받도록)
+        if self.llm_cache is not None and answered_by == model:
+            try:
+                self.llm_cache.put(model, key_text, content)
+            except Exception as e:
+                logger.warning("⚠️ LLM 캐시 저장 실패: %s", e)
+        return content
+    
+    
+    def _call_llm(self, prompt: str, call_name: str, current=None) -> Tuple[object, str]:
+        """
+        단계 예산 안에서 LLM 호출 → (응답, 응답한 모델)
+        기본 모델이 최근 지연 백분위를 넘기면 헤지 모델로도 요청 (먼저 끝난 응답 사용)
+        예산을 넘기면 DeadlineExceeded
+        """
+        model = self._model_name(self.llm)
+        budget = time_budget(call_name)
+        # 기본 / 헤지 요청 모두 남은 예산을 클라이언트 timeout으로 (먼저 끝난 쪽을 쓰고 남은 요청은 예산 안에서 종료)
+        primary = partial(get_limiter(model).call, with_timeout(self.llm.invoke, budget), prompt)
+        backup = None
+        hedge_model = None
+        if self.hedge_llm is not None:
+            hedge_model = self._model_name(self.hedge_llm)
+            backup = partial(get_limiter(hedge_model).call, with_timeout(self.hedge_llm.invoke, budget), prompt)
+        
+        tracker = latency_tracker(f"{model}:{call_name}")
+        hedge_after = tracker.hedge_after()
+        try:
+            response, hedged = hedged_call(primary, backup, budget, hedge_after, tracker)
+        except DeadlineExceeded:
+            if current is not None:
+                current.set_attributes(deadline_exceeded=True, budget_s=round(budget, 1))
+            raise
+        if hedged:
+            logger.info("🪝 %s: %s 응답 %.1f초 초과 → %s 응답 사용", call_name, model, hedge_after, hedge_model)
+            if current is not None:
+                current.set_attributes(hedged=True, hedge_model=hedge_model)
+        return response, hedge_model if hedged else model
+    
+    
+    def retrieve_candidates(self, user_type: str, trip_purpose, category: str) -> List[Document]:
+        """지역과 무관한 후보 검색 (MMR + 하이브리드), 상태 스냅샷별 캐시 → 선행 검색에 사용"""
         if not self.vectorstore:
             raise ValueError("먼저 setup_vectorstore()를 실행하세요!")
         
         if isinstance(trip_purpose, list):
             trip_purpose = " ".join(trip_purpose)
         
+        state = self._current_state()
+        cache_key = (id(state), user_type, trip_purpose, category)
+        with self._candidate_lock:
+            cached = self._candidate_cache.get(cache_key)
+            if cached is not None:
+                self._candidate_cache.move_to_end(cache_key)
+                logger.debug("  %s: 후보 캐시 사용 (%d개)", category, len(cached))
+                self._mark_cache_hit(True)
+                return list(cached)
+        self._mark_cache_hit(False)
+        
         query = f"{user_type}에게 적합한 {trip_purpose} 분위기의 {category}. 접근성이 좋고 시설이 잘 갖춰진 곳."
         
         # 지역 필터 추가
@@ -262,12 +777,47 @@ class TourRecommendationEngine:
             "filter": {"category": category}
         }
         
-        retriever = self.vectorstore.as_retriever(
+        retriever = state.vectorstore.as_retriever(
             search_type="mmr",
             search_kwargs=search_kwargs
         )
         
-        candidates = retriever.invoke(query)
+        with span("mmr", category=category, backend=self.vector_backend):
+            candidates = retriever.invoke(query)
+        
+        # 하이브리드 검색: BM25 결과와 MMR 결과를 RRF로 결합
+        if self.use_hybrid_search and state.lexical_index:
+            with span("hybrid_rrf", category=category):
+                candidates = self.hybrid_candidates(trip_purpose, category, candidates,
+                                                    k=search_kwargs["k"], state=state)
+        
+        with self._candidate_lock:
+            self._candidate_cache[cache_key] = list(candidates)
+            while len(self._candidate_cache) > self.CANDIDATE_CACHE_SIZE:
+                self._candidate_cache.popitem(last=False)
+        return candidates
+    
+    
+    @staticmethod
+    def _mark_cache_hit(hit: bool) -> None:
+        """현재 span에 캐시 적중 여부 기록"""
+        current = current_span()
+        if current is not None:
+            current.set_attribute('cache_hit', hit)
+    
+    
+    def search_places(self, user_type: str, trip_purpose: str, category: str, 
+                     region: Optional[str] = None, top_k: int = 10) -> List[Dict]:
+        """장소 검색 + 중복 제거 + 다양성 보장 + 지역 필터링"""
+        if not self.vectorstore:
+            raise ValueError("먼저 setup_vectorstore()를 실행하세요!")
+        
+        if isinstance(trip_purpose, list):
+            trip_purpose = " ".join(trip_purpose)
+        
+        query = f"{user_type}에게 적합한 {trip_purpose} 분위기의 {category}. 접근성이 좋고 시설이 잘 갖춰진 곳."
+        with span("retrieve_candidates", category=category):
+            candidates = self.retrieve_candidates(user_type, trip_purpose, category)
         
         # 지역 필터링 (region이 지정된 경우)
         if region:
@@ -277,13 +827,13 @@ class TourRecommendationEngine:
             ]
             if filtered_candidates:
                 candidates = filtered_candidates
-                print(f"  {category}: {region} 필터 적용 → {len(candidates)}개")
+                logger.debug("  %s: %s 필터 적용 → %d개", category, region, len(candidates))
         
-        print(f"  {category}: MMR로 {len(candidates)}개 검색")
+        logger.debug("  %s: MMR로 %d개 검색", category, len(candidates))
         
         # Reranker로 정렬
         reranked = self.openai_rerank(query, candidates, top_k=top_k * 2)
-        print(f"  {category}: Reranker로 {len(reranked)}개 정렬")
+        logger.debug("  %s: Reranker로 %d개 정렬", category, len(reranked))
         
         # 중복 제거
         seen_titles = set()
@@ -297,137 +847,254 @@ class TourRecommendationEngine:
                 if len(unique_results) >= top_k:
                     break
         
-        print(f"  {category}: 중복 제거 후 {len(unique_results)}개 최종 선택\n")
+        logger.debug("  %s: 중복 제거 후 %d개 최종 선택", category, len(unique_results))
         return unique_results
     
     
+    def lexical_query(self, trip_purpose: str) -> str:
+        """어휘 검색 쿼리 (테마 + 확장 키워드)"""
+        terms = []
+        for theme in trip_purpose.split():
+            terms.append(theme)
+            terms.extend(THEME_KEYWORDS.get(theme, []))
+        return " ".join(terms)
+    
+    
+    def hybrid_candidates(self, trip_purpose: str, category: str,
+                          vector_candidates: List, k: int = 50,
+                          state: Optional[EngineState] = None) -> List:
+        """BM25 + 벡터(MMR) 후보를 RRF로 결합 (state: 벡터 검색에 쓴 스냅샷, 없으면 현재 스냅샷)"""
+        state = state or self._current_state()
+        lexical_hits = state.lexical_index.search(self.lexical_query(trip_purpose),
+                                                 top_k=k, category=category)
+        lexical_candidates = [doc for doc, _ in lexical_hits]
+        
+        fused = reciprocal_rank_fusion([vector_candidates, lexical_candidates], k=self.RRF_K)
+        logger.debug("  %s: 하이브리드 결합 (벡터 %d + BM25 %d) → %d개",
+                     category, len(vector_candidates), len(lexical_candidates), len(fused[:k]))
+        return fused[:k]
+    
+    
     def create_courses(self, user_type: str, trip_purpose: List[str], 
-                      region: Optional[str] = None) -> List[Dict]:
-        """LLM으로 코스 생성 (Streamlit 호환 버전)"""
-        print(f"\n{'='*60}")
-        print(f"🎯 {user_type} - {' '.join(trip_purpose)} 분위기")
-        if region:
-            print(f"📍 지역: {region}")
-        print(f"{'='*60}\n")
-        
-        print("🔍 장소 검색 중...")
-        tour_list = self.search_places(user_type, trip_purpose, "관광지", region, 10)
-        cafe_list = self.search_places(user_type, trip_purpose, "카페", region, 10)
-        restaurant_list = self.search_places(user_type, trip_purpose, "음식점", region, 10)
-        
-        print(f"✅ 총 {len(tour_list) + len(cafe_list) + len(restaurant_list)}개 장소 검색 완료\n")
-        
+                      region: Optional[str] = None,
+                      on_update: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        LLM으로 코스 생성 (Streamlit 호환 버전)
+        on_update: 코스가 준비될 때마다 호출되는 콜백 (iter_courses와 동일한 dict 전달)
+        """
+        completed = {}
+        order = []
+        
+        for course in self.iter_courses(user_type, trip_purpose, region):
+            if on_update:
+                on_update(course)
+            if course['course_id'] not in order:
+                order.append(course['course_id'])
+            if course['explanation_ready']:
+                completed[course['course_id']] = course
+        
+        courses_with_explanation = [completed[course_id] for course_id in order if course_id in completed]
+        logger.info("✅ 총 %d개 코스 생성 완료!", len(courses_with_explanation))
+        return courses_with_explanation
+    
+    
+    def iter_courses(self, user_type: str, trip_purpose: List[str], 
+                     region: Optional[str] = None) -> Iterator[Dict]:
+        """
+        코스를 준비되는 대로 반환하는 제너레이터
+        - 경로 최적화가 끝난 코스를 먼저 반환 (explanation=None, explanation_ready=False)
+        - 설명 생성이 끝나면 같은 course_id로 다시 반환 (explanation_ready=True)
+        - 요청 전체 마감 시간(REQUEST_DEADLINE) 안에서 단계별 예산 적용, 초과 시 휴리스틱 코스 / 스니펫 설명
+        """
+        # yield 사이에는 호출한 쪽 코드가 실행되므로 span / 마감 시간 contextvar는 이 요청 전용 context에만 설정
+        # (재개할 때마다 그 context로 들어갔다가 yield하면 호출한 쪽 context로 복귀, 중간에 닫혀도 span 종료)
+        context = contextvars.copy_context()
+        courses = self._iter_courses(user_type, trip_purpose, region)
+        try:
+            while True:
+                try:
+                    course = context.run(next, courses)
+                except StopIteration:
+                    return
+                yield course
+        finally:
+            context.run(courses.close)
+    
+    
+    def _iter_courses(self, user_type: str, trip_purpose: List[str],
+                      region: Optional[str] = None) -> Iterator[Dict]:
+        """iter_courses 본체 (전용 context 안에서 실행)"""
+        # 요청 처리 중에는 데이터/인덱스 스냅샷 고정 (핫 리로드와 무관하게 일관성 유지)
+        with self.pinned_state(), deadline_scope(), span("create_courses", user_type=user_type,
+                                                         theme=" ".join(trip_purpose), region=region or "") as root:
+            logger.info("🎯 %s - %s 분위기 (지역: %s)", user_type, " ".join(trip_purpose), region or "전체")
+            with span("search_places", category="관광지"):
+                tour_list = self.search_places(user_type, trip_purpose, "관광지", region, 10)
+            with span("search_places", category="카페"):
+                cafe_list = self.search_places(user_type, trip_purpose, "카페", region, 10)
+            with span("search_places", category="음식점"):
+                restaurant_list = self.search_places(user_type, trip_purpose, "음식점", region, 10)
+            
+            logger.debug("✅ 총 %d개 장소 검색 완료", len(tour_list) + len(cafe_list) + len(restaurant_list))
+            
+            # LLM으로 코스 생성 (스트리밍 시 코스 블록이 완성되는 대로 파싱)
+            prompt, cache_text, data_dict = self._build_course_prompt(user_type, trip_purpose,
+                                                                      tour_list, cafe_list, restaurant_list)
+            if self.stream_courses:
+                courses = self._stream_parsed_courses(prompt, cache_text, data_dict)
+            else:
+                try:
+                    llm_output = self._invoke_llm(prompt, cache_text=cache_text, call_name='courses')
+                    courses = self.parse_llm_result(llm_output, data_dict)
+                except DeadlineExceeded:
+                    logger.warning("⏳ 코스 생성 예산 초과 → 후보 순위 기반 코스로 대체")
+                    courses = self.heuristic_courses(data_dict)
+            
+            # 코스별: TSP 최적화 → 카드 반환 → 설명 생성 시작 (다음 코스 생성과 병렬)
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="course-explain") as executor:
+                futures = {}
+                built = 0
+                
+                for course in courses:
+                    try:
+                        with span("tsp", course_id=course['course_id']):
+                            optimized = self._optimize_course(course, data_dict)
+                        streamlit_course = self._build_streamlit_course(optimized, data_dict)
+                    except Exception as e:
+                        logger.exception("⚠️ 코스 처리 중 오류: %s", e)
+                        continue
+                    if not streamlit_course:
+                        continue
+                    
+                    # 설명 생성을 먼저 시작하고 카드 반환 (span 부모 전달을 위해 context 복사)
+                    built += 1
+                    future = executor.submit(contextvars.copy_context().run,
+                                             self.generate_course_explanation, optimized, data_dict, user_type)
+                    futures[future] = streamlit_course
+                    yield dict(streamlit_course)
+                    
+                    # 그 사이 끝난 설명은 바로 반환
+                    for done in [f for f in futures if f.done()]:
+                        explained_course = self._explained_course(futures.pop(done), done)
+                        if explained_course:
+                            yield explained_course
+                
+                if root is not None:
+                    root.set_attribute('courses', built)
+                if built == 0:
+                    logger.warning("⚠️ 파싱 실패!")
+                    return
+                
+                # 남은 설명은 끝나는 순서대로 반환
+                for future in as_completed(list(futures)):
+                    explained_course = self._explained_course(futures.pop(future), future)
+                    if explained_course:
+                        yield explained_course
+    
+    
+    @staticmethod
+    def _explained_course(streamlit_course: Dict, future) -> Optional[Dict]:
+        """설명 생성 Future 결과를 카드에 반영 (실패 시 None)"""
+        try:
+            explained = future.result()
+        except Exception as e:
+            logger.exception("⚠️ 코스 처리 중 오류: %s", e)
+            return None
+        
+        logger.debug("✔ 코스 %s 완료", streamlit_course['course_id'])
+        return dict(
+            streamlit_course,
+            title=explained['title'],
+            explanation=explained['explanation'],
+            explanation_ready=True
+        )
+    
+    
+    def _build_streamlit_course(self, course: Dict, data_dict: Dict) -> Optional[Dict]:
+        """최적화된 코스 → Streamlit 호환 형식 (설명 제외, 장소 누락 시 None)"""
         # 원본 데이터에서 전체 정보 가져오기
         def get_full_data(place_name, category_key):
             """장소 이름으로 전체 데이터 가져오기"""
             full_data = self.integrated_data[category_key].get(place_name)
             if not full_data:
-                print(f"⚠️ 경고: {category_key}에서 '{place_name}'을 찾을 수 없습니다.")
+                logger.warning("⚠️ 경고: %s에서 '%s'을 찾을 수 없습니다.", category_key, place_name)
                 return None
             return full_data
         
-        # LLM으로 코스 생성
-        llm_output, data_dict = self._create_courses_llm(user_type, trip_purpose, 
-                                                         tour_list, cafe_list, restaurant_list)
-        
-        # 파싱
-        courses = self.parse_llm_result(llm_output, data_dict)
-        
-        if len(courses) == 0:
-            print("⚠️ 파싱 실패!")
-            return []
-        
-        # TSP 최적화
-        optimized_courses = self.optimize_all_courses(courses, data_dict)
+        # ⭐ 카테고리별로 장소 찾기 + optimized_order 생성
+        tour_place = None
+        cafe_place = None
+        restaurant_place = None
+        optimized_order = []  # 최적화된 순서 저장
         
-        # RAG 설명 생성
-        print("\n" + "="*60)
-        print("📝 RAG 설명 생성")
-        print("="*60)
-        
-        courses_with_explanation = []
-        
-        for course in optimized_courses:
-            try:
-                explained = self.generate_course_explanation(course, data_dict, user_type)
-                
-                # ⭐ 카테고리별로 장소 찾기 + optimized_order 생성
-                tour_place = None
-                cafe_place = None
-                restaurant_place = None
-                optimized_order = []  # 최적화된 순서 저장
-                
-                # places의 구조 확인
-                for place in course['places']:
-                    # place가 딕셔너리인지 확인
-                    if isinstance(place, dict):
-                        place_name = place['name']
-                        category = place['category']
-                    else:
-                        # place가 문자열이면 data_dict에서 찾기
-                        print(f"⚠️ place가 문자열입니다: {place}")
-                        place_name = place
-                        # data_dict에서 카테고리 찾기
-                        if place_name in data_dict['tour']:
-                            category = 'tour'
-                        elif place_name in data_dict['cafe']:
-                            category = 'cafe'
-                        elif place_name in data_dict['restaurant']:
-                            category = 'restaurant'
-                        else:
-                            print(f"⚠️ '{place_name}'의 카테고리를 찾을 수 없습니다.")
-                            continue
-                    
-                    # optimized_order에 순서대로 추가
-                    optimized_order.append(category)
-                    
-                    # 카테고리에 따라 데이터 가져오기
-                    if category == 'tour':
-                        tour_place = get_full_data(place_name, 'tour')
-                    elif category == 'cafe':
-                        cafe_place = get_full_data(place_name, 'cafe')
-                    elif category == 'restaurant':
-                        restaurant_place = get_full_data(place_name, 'restaurant')
-                
-                # 3개 장소가 모두 있는지 확인
-                if not tour_place or not cafe_place or not restaurant_place:
-                    print(f"⚠️ 코스 {course['course_id']}: 장소 정보 누락")
-                    print(f"  - 관광지: {'✓' if tour_place else '✗'}")
-                    print(f"  - 카페: {'✓' if cafe_place else '✗'}")
-                    print(f"  - 음식점: {'✓' if restaurant_place else '✗'}")
+        # places의 구조 확인
+        for place in course['places']:
+            # place가 딕셔너리인지 확인
+            if isinstance(place, dict):
+                place_name = place['name']
+                category = place['category']
+            else:
+                # place가 문자열이면 data_dict에서 찾기
+                logger.warning("⚠️ place가 문자열입니다: %s", place)
+                place_name = place
+                # data_dict에서 카테고리 찾기
+                if place_name in data_dict['tour']:
+                    category = 'tour'
+                elif place_name in data_dict['cafe']:
+                    category = 'cafe'
+                elif place_name in data_dict['restaurant']:
+                    category = 'restaurant'
+                else:
+                    logger.warning("⚠️ '%s'의 카테고리를 찾을 수 없습니다.", place_name)
                     continue
-                
-                # Streamlit 호환 형식으로 변환
-                streamlit_course = {
-                    'course_id': course['course_id'],
-                    'title': explained['title'],
-                    'explanation': explained['explanation'],
-                    'tour': tour_place,
-                    'cafe': cafe_place,
-                    'restaurant': restaurant_place,
-                    'optimized_order': optimized_order  # ⭐ TSP 순서 추가
-                }
-                
-                courses_with_explanation.append(streamlit_course)
-                print(f"✔ 코스 {course['course_id']} 완료")
-                
-            except Exception as e:
-                print(f"⚠️ 코스 처리 중 오류: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-        
-        print(f"\n✅ 총 {len(courses_with_explanation)}개 코스 생성 완료!\n")
-        return courses_with_explanation
+            
+            # optimized_order에 순서대로 추가
+            optimized_order.append(category)
+            
+            # 카테고리에 따라 데이터 가져오기
+            if category == 'tour':
+                tour_place = get_full_data(place_name, 'tour')
+            elif category == 'cafe':
+                cafe_place = get_full_data(place_name, 'cafe')
+            elif category == 'restaurant':
+                restaurant_place = get_full_data(place_name, 'restaurant')
+        
+        # 3개 장소가 모두 있는지 확인
+        if not tour_place or not cafe_place or not restaurant_place:
+            logger.warning("⚠️ 코스 %s: 장소 정보 누락 (관광지 %s / 카페 %s / 음식점 %s)", course['course_id'],
+                           '✓' if tour_place else '✗', '✓' if cafe_place else '✗', '✓' if restaurant_place else '✗')
+            return None
+        
+        # Streamlit 호환 형식으로 변환 (설명은 생성 후 채움)
+        return {
+            'course_id': course['course_id'],
+            'title': course['title'],
+            'explanation': None,
+            'explanation_ready': False,
+            'tour': tour_place,
+            'cafe': cafe_place,
+            'restaurant': restaurant_place,
+            'optimized_order': optimized_order  # ⭐ TSP 순서 추가
+        }
     
     
     def _create_courses_llm(self, user_type: str, trip_purpose: List[str], 
                            tour_list, cafe_list, restaurant_list) -> Tuple[str, Dict]:
         """LLM으로 코스 생성 (내부 메서드)"""
+        prompt, cache_text, data_dict = self._build_course_prompt(user_type, trip_purpose,
+                                                                  tour_list, cafe_list, restaurant_list)
+        content = self._invoke_llm(prompt, cache_text=cache_text, call_name='courses')
+        return content, data_dict
+    
+    
+    def _build_course_prompt(self, user_type: str, trip_purpose: List[str],
+                             tour_list, cafe_list, restaurant_list) -> Tuple[str, str, Dict]:
+        """코스 생성 프롬프트 → (prompt, 캐시 의미 키, data_dict)"""
         def format_places(places):
             return "\n".join([f"- {p['title']}" for p in places])
         
-        prompt = f"""
+        def build_prompt(tour_list, cafe_list, restaurant_list):
+            return f"""
 당신은 종로구 여행 전문가예요. {user_type}를 위한 3개 코스를 추천해주세요.
 
 사용자: {user_type}
@@ -471,8 +1138,38 @@ class TourRecommendationEngine:
 - 다른 설명 추가하지 말고 위 형식만 출력
 """
         
-        print("🤖 LLM 코스 생성 중...\n")
-        response = self.llm.invoke(prompt)
+        # 예산 초과 시 가장 긴 후보 목록의 하위 순위부터 제외 (카테고리당 최소 3개)
+        budget = get_budget('courses')
+        model = self._model_name(self.llm)
+        candidates = [list(tour_list), list(cafe_list), list(restaurant_list)]
+        prompt = build_prompt(*candidates)
+        while count_tokens(prompt, model) > budget:
+            longest = max(candidates, key=len)
+            if len(longest) <= 3:
+                break
+            longest.pop()
+            prompt = build_prompt(*candidates)
+        if len(candidates[0]) + len(candidates[1]) + len(candidates[2]) < len(tour_list) + len(cafe_list) + len(restaurant_list):
+            logger.info("📏 코스 프롬프트 예산 %d 토큰: 후보 %s개로 축약", budget, [len(c) for c in candidates])
+        tour_list, cafe_list, restaurant_list = candidates
+        
+        # 의미 키: 프롬프트는 사용자 유형, 테마, 후보 목록으로 결정되므로 후보 순서 차이는 무시
+        # 프롬프트 템플릿 / 후보 장소 내용이 바뀌면 키도 바뀌도록 각각의 해시 포함
+        template_hash = hashlib.sha256(build_prompt([], [], []).encode('utf-8')).hexdigest()[:16]
+        places = sorted(tour_list + cafe_list + restaurant_list, key=lambda p: (p.get('category', ''), p['title']))
+        places_payload = json.dumps(places, sort_keys=True, ensure_ascii=False, default=str)
+        cache_text = "\n".join([
+            "courses",
+            f"template:{template_hash}",
+            f"places:{hashlib.sha256(places_payload.encode('utf-8')).hexdigest()[:16]}",
+            user_type,
+            " ".join(sorted(trip_purpose)),
+            "|".join(sorted(p['title'] for p in tour_list)),
+            "|".join(sorted(p['title'] for p in cafe_list)),
+            "|".join(sorted(p['title'] for p in restaurant_list)),
+        ])
+        
+        logger.debug("🤖 LLM 코스 생성 중...")
         
         data_dict = {
             'tour': {item['title']: item for item in tour_list},
@@ -480,78 +1177,233 @@ class TourRecommendationEngine:
             'restaurant': {item['title']: item for item in restaurant_list}
         }
         
-        return response.content, data_dict
+        return prompt, cache_text, data_dict
+    
+    
+    def _stream_llm(self, prompt: str, cache_text: Optional[str] = None,
+                    call_name: str = "llm") -> Iterator[str]:
+        """LLM 스트리밍 호출 (캐시 적중 시 전체 응답 1회 반환, 완료 후 캐시 저장 + 사용량 기록)"""
+        model = self._model_name(self.llm)
+        key_text = cache_text if cache_text is not None else prompt
+        
+        # yield 사이에 다른 단계가 실행되므로 현재 span으로 설정하지 않음 (finally에서 종료, 중간에 닫히면 취소로 기록)
+        current = tracer.start_span(f"llm.{call_name}", model=model, streaming=True)
+        error = None
+        try:
+            if self.llm_cache is not None:
+                cached = self.llm_cache.get(model, key_text)
+                if cached is not None:
+                    entry = token_usage.record(call_name, model, 0, 0, 0.0, cached=True)
+                    self._annotate_span(current, entry)
+                    tracer.end_span(current)
+                    current = None
+                    self._log_cache_hit()
+                    yield cached
+                    return
+            
+            limiter = get_limiter(model)
+            # 조각 사이 대기 상한 (소비하는 쪽이 예산 초과로 멈춰도 응답 대기가 예산 안에서 끝나도록)
+            stream = with_timeout(self.llm.stream, time_budget(call_name))
+            started_at = time.perf_counter()
+            aggregate = None
+            parts = []
+            attempt = 0
+            while True:
+                try:
+                    with limiter.slot():
+                        for chunk in stream(prompt):
+                            aggregate = chunk if aggregate is None else aggregate + chunk
+                            if chunk.content:
+                                if not parts and current is not None:
+                                    current.set_attribute('first_token_ms', round((time.perf_counter() - started_at) * 1000, 1))
+                                parts.append(chunk.content)
+                                yield chunk.content
+                    break
+                except Exception as e:
+                    # 첫 조각을 받기 전 오류만 재시도 (이미 전달한 조각은 되돌릴 수 없음)
+                    delay = None if parts else limiter.backoff_delay(e, attempt)
+                    if delay is None:
+                        limiter.record_failure()
+                        raise
+                    logger.warning("🚦 %s: %s → %.1f초 후 재시도", model, e.__class__.__name__, delay)
+                    time.sleep(delay)
+                    attempt += 1
+            
+            content = "".join(parts)
+            if aggregate is not None:
+                entry = token_usage.record_response(call_name, model, prompt, aggregate, started_at)
+                self._annotate_span(current, entry)
+                self._log_usage(call_name, entry)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            tracer.end_span(current, error)
+        
+        if self.llm_cache is not None and content:
+            try:
+                self.llm_cache.put(model, key_text, content)
+            except Exception as e:
+                logger.warning("⚠️ LLM 캐시 저장 실패: %s", e)
+    
+    
+    @staticmethod
+    def split_course_stream(chunks: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        """
+        스트리밍 텍스트에서 완성된 코스 블록을 차례로 반환 → (course_id, 블록 내용)
+        다음 '## 코스 N:' 헤더가 도착하면 이전 블록이 완성된 것으로 보고, 마지막 블록은 스트림 종료 시 반환
+        """
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            headers = list(COURSE_HEADER_PATTERN.finditer(buffer))
+            while len(headers) >= 2:
+                yield int(headers[0].group(1)), buffer[headers[0].end():headers[1].start()]
+                buffer = buffer[headers[1].start():]
+                headers = list(COURSE_HEADER_PATTERN.finditer(buffer))
+        
+        header = COURSE_HEADER_PATTERN.search(buffer)
+        if header:
+            yield int(header.group(1)), buffer[header.end():]
+    
+    
+    def _stream_parsed_courses(self, prompt: str, cache_text: str, data_dict: Dict) -> Iterator[Dict]:
+        """
+        스트리밍 응답에서 코스 블록이 완성되는 대로 파싱해 반환
+        코스 생성 예산을 넘기면 남은 코스는 휴리스틱으로 채움 (스트림 받기도 중단, 완성되지 않은 응답은 캐시하지 않음)
+        """
+        used_places = set()
+        produced = 0
+        chunks = iterate_with_deadline(self._stream_llm(prompt, cache_text=cache_text, call_name='courses'), 'courses')
+        try:
+            for course_id, block in self.split_course_stream(chunks):
+                course = self._parse_course_block(course_id, block, data_dict, used_places)
+                if course:
+                    produced += 1
+                    yield course
+        except DeadlineExceeded:
+            logger.warning("⏳ 코스 생성 예산 초과 (%d개 완성) → 남은 코스는 후보 순위 기반으로 구성", produced)
+            yield from self.heuristic_courses(data_dict, 3 - produced, used_places, start_id=produced + 1)
+        finally:
+            # 중간에 닫혀도 받기 스레드가 바로 멈추도록
+            chunks.close()
+    
+    
+    def heuristic_courses(self, data_dict: Dict, count: int = 3, used_places: Optional[set] = None,
+                          start_id: int = 1) -> List[Dict]:
+        """
+        LLM 없이 코스 구성 (예산 초과 시 대체용)
+        검색 순위가 높은 관광지부터, 아직 쓰지 않은 카페 / 음식점 중 가장 가까운 곳을 묶음
+        """
+        used_places = used_places if used_places is not None else set()
+        
+        def coords(place):
+            return self._extract_coordinate(place, 'latitude'), self._extract_coordinate(place, 'longitude')
+        
+        def nearest(category_key, origin):
+            available = [name for name in data_dict[category_key] if f"{category_key}:{name}" not in used_places]
+            if not available:
+                return None
+            lat, lon = coords(origin)
+            return min(available, key=lambda name: self.haversine_distance(lat, lon, *coords(data_dict[category_key][name])))
+        
+        courses = []
+        for tour_name, tour in data_dict['tour'].items():
+            if len(courses) >= count:
+                break
+            if f"tour:{tour_name}" in used_places:
+                continue
+            cafe_name = nearest('cafe', tour)
+            restaurant_name = nearest('restaurant', tour)
+            if cafe_name is None or restaurant_name is None:
+                break
+            used_places.update({f"tour:{tour_name}", f"cafe:{cafe_name}", f"restaurant:{restaurant_name}"})
+            courses.append({
+                'course_id': start_id + len(courses),
+                'title': f"{tour_name} 주변 코스",
+                'places': [
+                    {'category': 'tour', 'name': tour_name},
+                    {'category': 'cafe', 'name': cafe_name},
+                    {'category': 'restaurant', 'name': restaurant_name},
+                ]
+            })
+        return courses
     
     
     def parse_llm_result(self, llm_output: str, data_dict: Dict) -> List[Dict]:
         """LLM 출력 파싱 + 중복 체크"""
-        print("\n" + "="*60)
-        print("📋 LLM 출력 파싱")
-        print("="*60)
+        logger.debug("📋 LLM 출력 파싱")
         
         courses = []
-        course_blocks = re.split(r'##\s*코스\s*(\d+):', llm_output)
+        course_blocks = COURSE_HEADER_PATTERN.split(llm_output)
         
         # 중복 체크용
         used_places = set()
         
         for i in range(1, len(course_blocks), 2):
-            course_id = int(course_blocks[i])
-            content = course_blocks[i + 1]
+            course = self._parse_course_block(int(course_blocks[i]), course_blocks[i + 1], data_dict, used_places)
+            if course:
+                courses.append(course)
+        
+        return courses
+    
+    
+    def _parse_course_block(self, course_id: int, content: str, data_dict: Dict,
+                            used_places: set) -> Optional[Dict]:
+        """코스 블록 1개 파싱 (used_places로 코스 간 중복 체크, 장소가 3개 미만이면 None)"""
+        # 제목 추출
+        title_match = re.search(r'\[(.+?)\]', content)
+        title = title_match.group(1) if title_match else f"코스 {course_id}"
+        
+        # 장소 추출
+        places = []
+        place_pattern = r'\[(관광지|카페|음식점|식당)\]\s*(.+?)(?:\n|$)'
+        place_matches = re.findall(place_pattern, content)
+        
+        for category, name in place_matches:
+            name = name.strip()
             
-            # 제목 추출
-            title_match = re.search(r'\[(.+?)\]', content)
-            title = title_match.group(1) if title_match else f"코스 {course_id}"
+            if '관광' in category:
+                category_key = 'tour'
+            elif '카페' in category:
+                category_key = 'cafe'
+            elif '음식' in category or '식당' in category:
+                category_key = 'restaurant'
+            else:
+                continue
             
-            # 장소 추출
-            places = []
-            place_pattern = r'\[(관광지|카페|음식점|식당)\]\s*(.+?)(?:\n|$)'
-            place_matches = re.findall(place_pattern, content)
+            # 중복 체크
+            place_id = f"{category_key}:{name}"
             
-            for category, name in place_matches:
-                name = name.strip()
+            if place_id in used_places:
+                logger.debug("⚠️ 중복 발견: %s", name)
                 
-                if '관광' in category:
-                    category_key = 'tour'
-                elif '카페' in category:
-                    category_key = 'cafe'
-                elif '음식' in category or '식당' in category:
-                    category_key = 'restaurant'
-                else:
-                    continue
-                
-                # 중복 체크
-                place_id = f"{category_key}:{name}"
+                # 교체 시도
+                available_places = [
+                    p for p in data_dict[category_key].keys()
+                    if f"{category_key}:{p}" not in used_places
+                ]
                 
-                if place_id in used_places:
-                    print(f"⚠️ 중복 발견: {name}")
-                    
-                    # 교체 시도
-                    available_places = [
-                        p for p in data_dict[category_key].keys()
-                        if f"{category_key}:{p}" not in used_places
-                    ]
-                    
-                    if available_places:
-                        name = available_places[0]
-                        place_id = f"{category_key}:{name}"
-                        print(f"   ✅ 교체: {name}")
-                
-                used_places.add(place_id)
-                places.append({'category': category_key, 'name': name})
+                if available_places:
+                    name = available_places[0]
+                    place_id = f"{category_key}:{name}"
+                    logger.debug("   ✅ 교체: %s", name)
             
-            if len(places) >= 3:
-                courses.append({
-                    'course_id': course_id,
-                    'title': title,
-                    'places': places[:3]
-                })
-                
-                print(f"\n✅ 코스 {course_id}: {title}")
-                for p in places[:3]:
-                    print(f"  [{p['category']}] {p['name']}")
+            used_places.add(place_id)
+            places.append({'category': category_key, 'name': name})
         
-        return courses
+        if len(places) < 3:
+            return None
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("✅ 코스 %s: %s (%s)", course_id, title,
+                         ", ".join(f"[{p['category']}] {p['name']}" for p in places[:3]))
+        
+        return {
+            'course_id': course_id,
+            'title': title,
+            'places': places[:3]
+        }
     
     
     def optimize_route(self, places: List[Dict], data_dict: Dict) -> List[Dict]:
@@ -584,29 +1436,28 @@ class TourRecommendationEngine:
     
     def optimize_all_courses(self, courses: List[Dict], data_dict: Dict) -> List[Dict]:
         """모든 코스 최적화"""
-        print("\n" + "="*60)
-        print("🚀 경로 최적화 (TSP)")
-        print("="*60)
+        logger.debug("🚀 경로 최적화 (TSP)")
         
-        optimized_courses = []
+        return [self._optimize_course(course, data_dict) for course in courses]
+    
+    
+    def _optimize_course(self, course: Dict, data_dict: Dict) -> Dict:
+        """코스 1개 TSP 최적화"""
+        # optimize_route는 places 리스트를 재정렬해서 반환
+        best_order = self.optimize_route(course['places'], data_dict)
         
-        for course in courses:
-            # optimize_route는 places 리스트를 재정렬해서 반환
-            best_order = self.optimize_route(course['places'], data_dict)
-            
-            # ⭐ best_order가 딕셔너리 형태를 유지하도록 보장
-            optimized_courses.append({
-                'course_id': course['course_id'],
-                'title': course['title'],
-                'places': best_order  # 이미 [{'category': '...', 'name': '...'}, ...] 형태
-            })
-            
-            # 순서 출력
+        # 순서 출력
+        if logger.isEnabledFor(logging.DEBUG):
             category_names = {'tour': '관광지', 'cafe': '카페', 'restaurant': '음식점'}
             order_str = " → ".join([category_names.get(p['category'], '?') for p in best_order])
-            print(f"✔ 코스 {course['course_id']}: {order_str}")
+            logger.debug("✔ 코스 %s: %s", course['course_id'], order_str)
         
-        return optimized_courses
+        # ⭐ best_order가 딕셔너리 형태를 유지하도록 보장
+        return {
+            'course_id': course['course_id'],
+            'title': course['title'],
+            'places': best_order  # 이미 [{'category': '...', 'name': '...'}, ...] 형태
+        }
     
     
     def generate_course_explanation(self, course: Dict, data_dict: Dict, user_type: str) -> Dict:
@@ -619,13 +1470,29 @@ class TourRecommendationEngine:
             if place_data:
                 places_info.append({
                     'name': place_data['title'],
-                    'content': place_data.get('content', '')
+                    'content': place_data.get('content', ''),
+                    'snippet': self._place_snippet(place['category'], place_data['title'])
                 })
         
-        places_summary = "\n\n".join([
-            f"[{p['name']}]\n{p['content']}"
-            for p in places_info
-        ])
+        # 모든 장소에 스니펫이 있으면 원문 대신 짧은 요약 사용
+        # (접근성 하이라이트는 snippets 모드에서만 사용: 프롬프트가 편의시설 언급을 금지하므로 넣지 않음)
+        use_snippets = bool(places_info) and all(p['snippet'] for p in places_info)
+        if use_snippets and self.explanation_mode == "snippets":
+            return self.compose_explanation_from_snippets(course, places_info, user_type)
+        
+        if use_snippets:
+            places_summary = "\n\n".join([
+                f"[{p['name']}]\n{p['snippet']['summary']}"
+                for p in places_info
+            ])
+        else:
+            # 원문 content는 장소별 균등 예산으로 문장 단위 축약 (형식 규칙 ~600 토큰 제외)
+            model = self._model_name(self.llm)
+            per_place = max(100, (get_budget('explanation') - 600) // max(len(places_info), 1))
+            places_summary = "\n\n".join([
+                f"[{p['name']}]\n{truncate_tokens(p['content'], per_place, model)}"
+                for p in places_info
+            ])
         
         prompt = f"""
 당신은 종로구 여행 전문가입니다. {user_type}를 위한 하루 코스를 소개해주세요.
@@ -661,15 +1528,15 @@ class TourRecommendationEngine:
 2. 휠체어 접근이 용이합니다 (편의시설 언급)
 """
         
-        response = self.llm.invoke(prompt)
-        content = response.content
+        try:
+            content = self._invoke_llm(prompt, call_name='explanation')
+        except DeadlineExceeded:
+            # 예산 초과: 사전 생성 스니펫 하이라이트(없으면 기본 문구)로 구성
+            logger.warning("⏳ 코스 %s 설명 예산 초과 → 스니펫 기반 설명으로 대체", course['course_id'])
+            return self.compose_explanation_from_snippets(course, places_info, user_type)
         
-        # 🔍 디버깅: GPT 응답 출력
-        print("\n" + "="*80)
-        print(f"🔍 [디버깅] 코스 {course['course_id']} GPT 원본 응답:")
-        print("="*80)
-        print(content)
-        print("="*80 + "\n")
+        # 🔍 디버깅: GPT 원본 응답 (LOG_DEBUG=1일 때만)
+        logger.debug("🔍 [디버깅] 코스 %s GPT 원본 응답:\n%s", course['course_id'], content)
         
         # 제목 추출
         title_match = re.search(r'###\s*코스\s*제목.*?\n\s*(.+?)(?=\n|$)', content, re.DOTALL)
@@ -687,23 +1554,21 @@ class TourRecommendationEngine:
         else:
             generated_title = course.get('title', f"코스 {course['course_id']}")
         
-        print(f"📌 추출된 제목: {generated_title}\n")
+        logger.debug("📌 추출된 제목: %s", generated_title)
         
         # 장점 추출 - 개선된 정규식
         advantages_match = re.search(r'\*\*이\s*코스의\s*장점\*\*\s*\n(.+?)(?=\n\n|###|$)', content, re.DOTALL)
         if advantages_match:
             advantages_text = advantages_match.group(1).strip()
-            print(f"✅ 장점 추출 성공 (정규식 매칭)")
-            print(f"📝 추출된 텍스트:\n{advantages_text}\n")
+            logger.debug("✅ 장점 추출 성공 (정규식 매칭)")
         else:
             # fallback
             advantages_text = "1. 접근성이 우수한 편리한 위치.\n2. 다양한 볼거리와 즐길거리.\n3. 쾌적하고 안전한 환경."
-            print(f"⚠️ 장점 추출 실패 - fallback 사용")
+            logger.warning("⚠️ 코스 %s 장점 추출 실패 - fallback 사용", course['course_id'])
         
         explanation = "**이 코스의 장점**\n" + advantages_text
         
-        print(f"📌 최종 장점:\n{explanation}\n")
-        print("="*80 + "\n")
+        logger.debug("📌 최종 장점:\n%s", explanation)
         
         return {
             'course_id': course['course_id'],
@@ -711,6 +1576,33 @@ class TourRecommendationEngine:
             'places': course['places'],
             'explanation': explanation
         }
+    
+    
+    def compose_explanation_from_snippets(self, course: Dict, places_info: List[Dict], user_type: str) -> Dict:
+        """LLM 없이 스니펫의 접근성 하이라이트로 장점 3개 구성 (스니펫이 없는 장소는 건너뜀)"""
+        advantages = []
+        for p in places_info:
+            for highlight in (p['snippet'] or {}).get('highlights', {}).get(user_type, []):
+                if highlight not in advantages:
+                    advantages.append(highlight)
+        
+        # 하이라이트가 부족하면 기본 문구로 채움
+        for default in ["가까운 거리의 편리한 동선", "다양한 볼거리와 즐길거리", "쾌적하고 안전한 환경"]:
+            if len(advantages) >= 3:
+                break
+            if default not in advantages:
+                advantages.append(default)
+        
+        explanation = "**이 코스의 장점**\n" + "\n".join(
+            f"{i}. {advantage}" for i, advantage in enumerate(advantages[:3], 1)
+        )
+        
+        return {
+            'course_id': course['course_id'],
+            'title': course.get('title', f"코스 {course['course_id']}"),
+            'places': course['places'],
+            'explanation': explanation
+        }
 
 
 # Streamlit 호환성을 위한 별칭
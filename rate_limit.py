@@ -0,0 +1,296 @@
+"""
+🚦 외부 API 호출 속도 제한 (OpenAI 모델별 / ORS 키별, 프로세스 공용)
+- 토큰 버킷: 초당 요청 수(rps) + 순간 허용량(burst)
+- 적응형 동시 실행 수 (AIMD): 성공하면 조금씩 늘리고, 429 / 지연 목표 초과 시 절반으로 줄임
+- 재시도: 429 / 5xx / 타임아웃 / 연결 오류에 full-jitter 지수 백오프 (Retry-After 우선)
+- 지표: 호출 / 429 / 재시도 / 실패 횟수, 대기 시간(토큰 버킷 + 동시 실행 슬롯) p50 / p95
+
+설정: RATE_LIMIT (0이면 제한 없이 재시도만, 가짜 API 벤치마크용)
+      RATE_LIMIT_<NAME>_RPS / _BURST / _CONCURRENCY / _MAX_CONCURRENCY / _LATENCY_TARGET
+      RATE_LIMIT_MAX_RETRIES (NAME 예: GPT_4O_MINI, GPT_5_1, WHISPER_1, ORS)
+"""
+
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app_logging import get_logger
+from config import get_flag, get_setting
+
+logger = get_logger("rate_limit")
+
+# 이름(모델명 / 'ors') 접두어별 기본값: rps, burst, 초기 동시 실행 수, 최대 동시 실행 수, 지연 목표(초)
+DEFAULT_LIMITS = {
+    'gpt-4o-mini': (8.0, 16, 8, 32, 10.0),
+    'gpt-5.1': (3.0, 6, 4, 16, 60.0),
+    'whisper-1': (2.0, 4, 4, 8, 30.0),
+    'tts': (3.0, 6, 4, 8, 20.0),
+    'text-embedding': (5.0, 10, 4, 8, 30.0),
+    # ORS 무료 키: 분당 40회
+    'ors': (0.6, 5, 2, 4, 10.0),
+}
+FALLBACK_LIMIT = (5.0, 10, 4, 16, 30.0)
+
+# 모델명에 tts가 들어가면 TTS 제한 사용 (gpt-4o-mini-tts 등)
+_ALIASES = (('tts', 'tts'), ('transcribe', 'whisper-1'))
+
+_TRANSIENT_ERRORS = ("Timeout", "APIConnectionError", "ConnectionError", "RemoteDisconnected")
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷 (최대 burst개)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개 사용 (없으면 채워질 때까지 대기) → 대기 시간(초), rate가 0 이하면 제한 없음"""
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class AdaptiveConcurrency:
+    """AIMD 동시 실행 제한 (성공 시 +1/limit, 과부하 신호 시 ×0.5)"""
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 32):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """슬롯 1개 확보 (가득 차면 대기) → 대기 시간(초)"""
+        started = time.monotonic()
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        return time.monotonic() - started
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify()
+
+    def on_overload(self) -> None:
+        with self._cond:
+            self.limit = max(self.minimum, self.limit * 0.5)
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """OpenAI(status_code) / openrouteservice(status) 예외의 HTTP 상태 코드"""
+    for attr in ("status_code", "status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    name = error.__class__.__name__
+    return status_code(error) == 429 or "RateLimit" in name or "OverQueryLimit" in name
+
+
+def is_retryable(error: BaseException) -> bool:
+    """다시 시도할 만한 오류 (429, 5xx, 타임아웃, 연결 오류)"""
+    if is_rate_limited(error):
+        return True
+    code = status_code(error)
+    if code is not None:
+        return code >= 500
+    return any(marker in error.__class__.__name__ for marker in _TRANSIENT_ERRORS)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """응답의 Retry-After 헤더(초)"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """이름(모델 / ORS 키) 1개에 대한 속도 제한 + 재시도 + 지표"""
+
+    def __init__(self, name: str, rps: float, burst: int, concurrency: int, max_concurrency: int,
+                 latency_target: float, max_retries: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 20.0, window: int = 500):
+        self.name = name
+        self.bucket = TokenBucket(rps, burst)
+        self.concurrency = AdaptiveConcurrency(concurrency, 1, max_concurrency)
+        self.latency_target = latency_target
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+        self._queue_delays = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """토큰 + 동시 실행 슬롯 확보 후 실행 (결과에 따라 동시 실행 수 조정)"""
+        queued = self.bucket.acquire() + self.concurrency.acquire()
+        with self._lock:
+            self.calls += 1
+            self._queue_delays.append(queued)
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            if is_rate_limited(e):
+                with self._lock:
+                    self.throttled += 1
+                self.concurrency.on_overload()
+            raise
+        else:
+            if time.monotonic() - started > self.latency_target:
+                self.concurrency.on_overload()
+            else:
+                self.concurrency.on_success()
+        finally:
+            self.concurrency.release()
+
+    def backoff_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """attempt번째 실패 후 대기 시간 (재시도하지 않을 오류거나 횟수 초과면 None)"""
+        if attempt >= self.max_retries or not is_retryable(error):
+            return None
+        delay = retry_after(error)
+        if delay is None:
+            # full jitter: 0 ~ base × 2^attempt
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        with self._lock:
+            self.retries += 1
+        return min(delay, self.max_delay)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """속도 제한 + 재시도 적용 호출"""
+        attempt = 0
+        while True:
+            try:
+                with self.slot():
+                    return fn(*args, **kwargs)
+            except Exception as e:
+                delay = self.backoff_delay(e, attempt)
+                if delay is None:
+                    self.record_failure()
+                    raise
+                logger.warning("🚦 %s: %s → %.1f초 후 재시도 (%d/%d)",
+                               self.name, e.__class__.__name__, delay, attempt + 1, self.max_retries)
+                time.sleep(delay)
+                attempt += 1
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            delays = sorted(self._queue_delays)
+            calls, throttled, retries, failures = self.calls, self.throttled, self.retries, self.failures
+
+        def percentile(p):
+            return round(delays[min(len(delays) - 1, int(len(delays) * p))] * 1000, 1) if delays else 0.0
+
+        return {
+            'name': self.name,
+            'calls': calls,
+            'throttled': throttled,
+            'retries': retries,
+            'failures': failures,
+            'queue_p50_ms': percentile(0.5),
+            'queue_p95_ms': percentile(0.95),
+            'concurrency_limit': round(self.concurrency.limit, 1),
+            'in_flight': self.concurrency.in_flight,
+        }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _defaults(name: str):
+    for marker, key in _ALIASES:
+        if marker in name:
+            return DEFAULT_LIMITS[key]
+    for prefix, limits in DEFAULT_LIMITS.items():
+        if name.startswith(prefix):
+            return limits
+    return FALLBACK_LIMIT
+
+
+def _setting_name(name: str) -> str:
+    """'gpt-4o-mini' → 'GPT_4O_MINI', 'ors:1a2b' → 'ORS'"""
+    return re.sub(r"[^A-Z0-9]+", "_", name.split(":")[0].upper()).strip("_")
+
+
+def get_limiter(name: str) -> RateLimiter:
+    """이름별 공용 제한기 (처음 사용할 때 설정값으로 생성)"""
+    limiter = _limiters.get(name)
+    if limiter is not None:
+        return limiter
+    with _limiters_lock:
+        if name not in _limiters:
+            rps, burst, concurrency, max_concurrency, latency_target = _defaults(name)
+            if not get_flag("RATE_LIMIT", True):
+                rps, concurrency, max_concurrency = 0.0, 1024, 1024
+            prefix = f"RATE_LIMIT_{_setting_name(name)}"
+            _limiters[name] = RateLimiter(
+                name,
+                rps=float(get_setting(f"{prefix}_RPS", str(rps))),
+                burst=int(get_setting(f"{prefix}_BURST", str(burst))),
+                concurrency=int(get_setting(f"{prefix}_CONCURRENCY", str(concurrency))),
+                max_concurrency=int(get_setting(f"{prefix}_MAX_CONCURRENCY", str(max_concurrency))),
+                latency_target=float(get_setting(f"{prefix}_LATENCY_TARGET", str(latency_target))),
+                max_retries=int(get_setting("RATE_LIMIT_MAX_RETRIES", "3")),
+            )
+        return _limiters[name]
+
+
+def ors_limiter(api_key: str) -> RateLimiter:
+    """ORS 키별 제한기 (키 원문 대신 해시로 구분)"""
+    return get_limiter(f"ors:{hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:8]}")
+
+
+def rate_limited(name: str, fn: Callable, *args, **kwargs):
+    """get_limiter(name).call(fn, ...) 줄임"""
+    return get_limiter(name).call(fn, *args, **kwargs)
+
+
+def all_metrics() -> List[Dict]:
+    """제한기별 지표 (디버그 패널 / 벤치마크용)"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return [limiter.metrics() for limiter in limiters]
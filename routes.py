@@ -0,0 +1,98 @@
+"""
+🚶 도보 경로 (ORS directions) 프로세스 공용 캐시
+- 4_rec(코스 카드 거리)와 5_map(지도 경로)이 같은 캐시 사용 → 카드에서 계산한 경로를 상세 페이지에서 재사용
+- 같은 좌표 조합은 TTL 동안 ORS를 다시 호출하지 않음 (warmup.py가 추천 결과의 경로를 미리 채움)
+- 429 재시도는 ORS 클라이언트 대신 rate_limit 계층에서 (키별 토큰 버킷 + 백오프)
+
+설정: OPENROUTESERVICE_API_KEY / ROUTE_CACHE_TTL / ROUTE_CACHE_SIZE
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from config import get_setting
+from lazy_imports import lazy_module
+from rate_limit import ors_limiter
+from tracing import span
+
+ors = lazy_module("openrouteservice")
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def ors_api_key() -> str:
+    return get_setting("OPENROUTESERVICE_API_KEY", "") or ""
+
+
+def place_coordinates(place: Dict) -> Optional[List[float]]:
+    """장소 좌표 → [lng, lat] (coordinates 객체 → 최상위 → mapx/mapy 순, 없으면 None)"""
+    lat = lng = None
+    if 'coordinates' in place:
+        coords = place['coordinates']
+        lat = coords.get('latitude')
+        lng = coords.get('longitude')
+    if not lat:
+        lat = place.get('latitude') or place.get('mapy')
+    if not lng:
+        lng = place.get('longitude') or place.get('mapx')
+    if lat and lng:
+        return [float(lng), float(lat)]
+    return None
+
+
+def course_coordinates(course: Dict) -> List[List[float]]:
+    """코스 방문 순서(optimized_order)대로 [lng, lat] 목록"""
+    coordinates = []
+    for category in course.get('optimized_order', ['tour', 'cafe', 'restaurant']):
+        if category in course:
+            coord = place_coordinates(course[category])
+            if coord:
+                coordinates.append(coord)
+    return coordinates
+
+
+def _route_key(coordinates: Sequence[Sequence[float]]) -> tuple:
+    # 같은 지점이 연속으로 나오면 ORS가 구간 0개를 돌려주므로 중복 제거 후 키로 사용
+    return tuple(dict.fromkeys((round(float(lng), 6), round(float(lat), 6)) for lng, lat in coordinates))
+
+
+def walking_route(coordinates: Sequence[Sequence[float]], api_key: Optional[str] = None,
+                  page: str = "") -> Dict:
+    """도보 경로 GeoJSON (캐시 적중 시 ORS 호출 없음, 실패 시 예외)"""
+    api_key = api_key if api_key is not None else ors_api_key()
+    key = _route_key(coordinates)
+    if len(key) < 2:
+        raise ValueError("경로를 계산하려면 서로 다른 좌표가 2개 이상 필요합니다.")
+    ttl = float(get_setting("ROUTE_CACHE_TTL", "3600"))
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and time.time() - entry[0] <= ttl:
+            _cache.move_to_end(key)
+            return entry[1]
+
+    client = ors.Client(key=api_key, retry_over_query_limit=False)
+    with span("ors.directions", page=page, points=len(key)):
+        route = ors_limiter(api_key).call(
+            client.directions,
+            coordinates=[list(coord) for coord in key], profile='foot-walking', format='geojson', validate=False
+        )
+
+    with _cache_lock:
+        _cache[key] = (time.time(), route)
+        _cache.move_to_end(key)
+        while len(_cache) > int(get_setting("ROUTE_CACHE_SIZE", "512")):
+            _cache.popitem(last=False)
+    return route
+
+
+def route_distance_m(route: Dict) -> float:
+    return route['features'][0]['properties']['segments'][0]['distance']
+
+
+def route_cache_size() -> int:
+    with _cache_lock:
+        return len(_cache)
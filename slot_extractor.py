@@ -0,0 +1,174 @@
+"""
+🧩 음성 입력 슬롯 추출 (규칙 기반 fast path)
+- 테마 / 동행 / 지역 3개 슬롯을 키워드·별칭 사전 + 퍼지 매칭으로 추출
+- 모호하거나 아무 슬롯도 찾지 못한 경우에만 LLM으로 fallback
+- fast path 적중률 집계
+"""
+
+import difflib
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app_logging import get_logger
+
+logger = get_logger("slot_extractor")
+
+SLOT_KEYS = ["travel_type", "companion", "region"]
+
+# 서울시 25개 자치구 (가나다 순)
+SEOUL_DISTRICTS = [
+    "강남구", "강동구", "강북구", "강서구", "관악구",
+    "광진구", "구로구", "금천구", "노원구", "도봉구",
+    "동대문구", "동작구", "마포구", "서대문구", "서초구",
+    "성동구", "성북구", "송파구", "양천구", "영등포구",
+    "용산구", "은평구", "종로구", "중구", "중랑구"
+]
+
+# 테마 별칭 (값: 2_travel.py의 선택지)
+THEME_ALIASES = {
+    "예술": ["예술", "전시", "미술", "미술관", "박물관", "갤러리", "공연", "아트"],
+    "전통": ["전통", "유적", "고궁", "한옥", "역사", "문화재", "한복", "궁궐"],
+    "자연": ["자연", "공원", "산책", "정원", "숲", "둘레길", "꽃구경"],
+    "체험": ["체험", "놀이", "공방", "만들기", "테마파크", "액티비티"],
+}
+
+# 동행 별칭 (값: 1_companion.py의 선택지)
+COMPANION_ALIASES = {
+    "휠체어 사용자": ["휠체어", "전동휠체어", "장애인", "지체장애"],
+    "영유아": ["유모차", "영유아", "유아", "아기", "애기", "아이랑", "아이와", "아이들", "어린이", "갓난"],
+    "고령자": ["고령", "노인", "어르신", "부모님", "할머니", "할아버지", "노약자", "시니어"],
+}
+
+# 자치구 약칭 (예: "종로" → 종로구). 한 글자 약칭은 오탐이 많아 제외
+DISTRICT_ALIASES = {
+    district: [district] + ([district[:-1]] if len(district) > 2 else [])
+    for district in SEOUL_DISTRICTS
+}
+
+# 어절 시작에서만 매칭 (예: "종로구로" 안의 "구로" 오탐 방지)
+DISTRICT_PATTERNS = {
+    district: re.compile(r"(?<![가-힣])(?:" + "|".join(map(re.escape, aliases)) + ")")
+    for district, aliases in DISTRICT_ALIASES.items()
+}
+
+FUZZY_CUTOFF = 0.6
+
+
+def _match_aliases(text: str, alias_map: Dict[str, List[str]]) -> List[str]:
+    """텍스트에 포함된 별칭의 정규화 값 목록 (등장 순서, 중복 제거)"""
+    found = []
+    for canonical, aliases in alias_map.items():
+        positions = [text.find(alias) for alias in aliases if alias in text]
+        if positions:
+            found.append((min(positions), canonical))
+    return [canonical for _, canonical in sorted(found)]
+
+
+def _match_districts(text: str) -> List[str]:
+    """자치구 정확/약칭 매칭 + 오타 퍼지 매칭 ("종루구" → 종로구)"""
+    found = []
+    for district, pattern in DISTRICT_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            found.append((match.start(), district))
+    if found:
+        return [district for _, district in sorted(found)]
+
+    fuzzy = []
+    for word in re.findall(r"[가-힣]+", text):
+        if word.endswith("구") and len(word) >= 3:
+            close = difflib.get_close_matches(word, SEOUL_DISTRICTS, n=1, cutoff=FUZZY_CUTOFF)
+            if close and close[0] not in fuzzy:
+                fuzzy.append(close[0])
+    return fuzzy
+
+
+def extract_district(address: str) -> str:
+    """주소에서 자치구명 추출 (예: '서울 종로구 사직로...' → '종로구')"""
+    match = re.search(r'(\S+구)(?:\s|$)', address or '')
+    return match.group(1) if match else ''
+
+
+def extract_slots(text: str) -> Tuple[Dict[str, Optional[str]], List[str]]:
+    """
+    규칙 기반 슬롯 추출 → (slots, ambiguous_keys)
+    후보가 여러 개인 슬롯은 값을 비우고 ambiguous_keys에 담음
+    """
+    text = (text or "").strip()
+    candidates = {
+        "travel_type": _match_aliases(text, THEME_ALIASES),
+        "companion": _match_aliases(text, COMPANION_ALIASES),
+        "region": _match_districts(text),
+    }
+
+    slots = {}
+    ambiguous = []
+    for key in SLOT_KEYS:
+        values = candidates[key]
+        if len(values) == 1:
+            slots[key] = values[0]
+        else:
+            slots[key] = None
+            if len(values) > 1:
+                ambiguous.append(key)
+    return slots, ambiguous
+
+
+def normalize_slot(key: str, value: Optional[str]) -> Optional[str]:
+    """LLM이 돌려준 자유 형식 값을 선택지 값으로 정규화 (실패 시 원래 값)"""
+    if not value or value == "null":
+        return None
+    slots, _ = extract_slots(str(value))
+    return slots.get(key) or value
+
+
+class SlotExtractionStats:
+    """fast path 적중률 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.fast_hits = 0
+        self.llm_fallbacks = 0
+
+    def record(self, used_llm: bool) -> None:
+        with self._lock:
+            self.total += 1
+            if used_llm:
+                self.llm_fallbacks += 1
+            else:
+                self.fast_hits += 1
+
+    @property
+    def hit_rate(self) -> float:
+        return self.fast_hits / self.total if self.total else 0.0
+
+    def summary(self) -> str:
+        return f"fast path {self.fast_hits}/{self.total} ({self.hit_rate:.0%}), LLM fallback {self.llm_fallbacks}"
+
+    # 로그 인자로 넘기면 DEBUG가 꺼져 있을 때는 문자열을 만들지 않음
+    __str__ = summary
+
+
+stats = SlotExtractionStats()
+
+
+def resolve_user_info(text: str, llm_extract: Callable[[str], Dict]) -> Dict[str, Optional[str]]:
+    """
+    규칙 기반으로 먼저 추출하고, 슬롯이 모호하거나 하나도 찾지 못했을 때만 LLM 호출
+    llm_extract: text → {"travel_type": ..., "companion": ..., "region": ...}
+    """
+    slots, ambiguous = extract_slots(text)
+    used_llm = bool(ambiguous) or not any(slots.values())
+
+    if used_llm:
+        llm_slots = llm_extract(text) or {}
+        for key in (ambiguous or SLOT_KEYS):
+            value = normalize_slot(key, llm_slots.get(key))
+            if value:
+                slots[key] = value
+
+    stats.record(used_llm)
+    logger.debug("🧩 슬롯 추출 (%s): %s | %s", 'LLM' if used_llm else '규칙', slots, stats)
+    return slots
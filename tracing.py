@@ -0,0 +1,261 @@
+"""
+⏱️ 단계별 실행 추적 (span)
+- with span("search_places", category="카페") as s: ... 형태의 컨텍스트 매니저 API
+- 부모/자식 관계는 contextvars로 전달 (스레드 풀 작업은 copy_context().run으로 전달)
+- 내보내기: JSON Lines 파일 (의존성 없음) / OpenTelemetry (설치 시 선택)
+- 최근 trace를 메모리에 보관 → 4_rec 사이드바 디버그 패널
+
+설정: TRACING / TRACE_EXPORT_PATH / TRACE_QUEUE_SIZE / TRACE_OTEL
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from app_logging import get_logger
+from config import get_flag, get_setting
+
+logger = get_logger("tracing")
+
+MAX_TRACES = 50
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """실행 구간 1개 (이름, 소요 시간, 속성)"""
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.depth = parent.depth + 1 if parent else 0
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration = None
+        self._otel_span = None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(key, value)
+
+    def set_attributes(self, **attributes) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.duration = time.perf_counter() - self._start
+        if isinstance(error, GeneratorExit):
+            # 소비하는 쪽이 제너레이터를 중간에 닫음 (오류가 아닌 취소)
+            self.set_attribute('cancelled', True)
+        elif error is not None:
+            self.status = "error"
+            self.attributes['error'] = f"{error.__class__.__name__}: {error}"
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'depth': self.depth,
+            'start_time': self.start_time,
+            'duration_ms': round(self.duration * 1000, 1) if self.duration is not None else None,
+            'status': self.status,
+            'attributes': dict(self.attributes),
+        }
+
+
+class JsonLinesExporter:
+    """
+    끝난 span을 JSON Lines 파일에 한 줄씩 기록
+    요청 경로에서는 큐에 넣기만 하고, 파일 쓰기는 별도 스레드가 열어 둔 파일에 버퍼링해서 담당
+    (큐가 가득 차면 요청 경로를 막지 않고 버림 - app_logging과 같은 방식)
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, queue_size: int = 10000):
+        self.path = path
+        self.dropped = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._write_loop, name="trace-export", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def on_start(self, span: Span, parent: Optional[Span]) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span.to_dict())
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                while True:
+                    item = self._queue.get()
+                    if item is self._STOP:
+                        return
+                    f.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+                    # 밀린 span이 없을 때만 flush (한꺼번에 끝난 span은 한 번에 기록)
+                    if self._queue.empty():
+                        f.flush()
+        except OSError as e:
+            logger.warning("⚠️ trace 파일 기록 실패 (%s): %s", self.path, e)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """남은 span 기록 후 쓰기 스레드 종료"""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+class OpenTelemetryExporter:
+    """span을 OpenTelemetry span으로 그대로 옮김 (opentelemetry-api 필요, SDK 설정은 배포 환경에서)"""
+
+    def __init__(self, tracer_name: str = "goungil.rag_engine"):
+        from opentelemetry import trace
+        self._trace = trace
+        self._tracer = trace.get_tracer(tracer_name)
+
+    def on_start(self, span: Span, parent: Optional[Span]) -> None:
+        context = None
+        if parent is not None and parent._otel_span is not None:
+            context = self._trace.set_span_in_context(parent._otel_span)
+        span._otel_span = self._tracer.start_span(
+            span.name,
+            context=context,
+            start_time=int(span.start_time * 1e9),
+            attributes={k: v for k, v in span.attributes.items() if isinstance(v, (str, bool, int, float))}
+        )
+
+    def on_end(self, span: Span) -> None:
+        otel_span = span._otel_span
+        if otel_span is None:
+            return
+        if span.status == "error":
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.attributes.get('error')))
+        otel_span.end(end_time=int((span.start_time + span.duration) * 1e9))
+
+
+class Tracer:
+    """span 수집 + 내보내기 + 최근 trace 보관"""
+
+    def __init__(self, enabled: bool = True, exporters: Optional[List] = None, max_traces: int = MAX_TRACES):
+        self.enabled = enabled
+        self.exporters = list(exporters or [])
+        self.max_traces = max_traces
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """실행 구간 기록 (비활성화 시 None)"""
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        current = Span(name, parent, attributes)
+        self._export('on_start', current, parent)
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.finish(e)
+            raise
+        else:
+            current.finish()
+        finally:
+            _current_span.reset(token)
+            self._record(current)
+            self._export('on_end', current)
+
+    def start_span(self, name: str, **attributes) -> Optional[Span]:
+        """현재 span으로 설정하지 않는 span 시작 (제너레이터처럼 yield를 건너는 구간용, end_span으로 종료)"""
+        if not self.enabled:
+            return None
+        parent = _current_span.get()
+        current = Span(name, parent, attributes)
+        self._export('on_start', current, parent)
+        return current
+
+    def end_span(self, current: Optional[Span], error: Optional[BaseException] = None) -> None:
+        if current is None:
+            return
+        current.finish(error)
+        self._record(current)
+        self._export('on_end', current)
+
+    def _export(self, hook: str, *args) -> None:
+        for exporter in self.exporters:
+            try:
+                getattr(exporter, hook)(*args)
+            except Exception as e:
+                logger.warning("⚠️ trace 내보내기 실패 (%s): %s", exporter.__class__.__name__, e)
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            spans = self._traces.setdefault(span.trace_id, [])
+            spans.append(span)
+            self._traces.move_to_end(span.trace_id)
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+    def get_trace(self, trace_id: str) -> List[Dict]:
+        """trace의 span 목록 (시작 순서)"""
+        with self._lock:
+            spans = list(self._traces.get(trace_id, []))
+        return [s.to_dict() for s in sorted(spans, key=lambda s: s.start_time)]
+
+    def last_trace(self, root_name: Optional[str] = None) -> List[Dict]:
+        """가장 최근에 끝난 trace (root_name 지정 시 해당 root span의 trace)"""
+        with self._lock:
+            candidates = [
+                trace_id for trace_id, spans in self._traces.items()
+                if any(s.parent_id is None and (root_name is None or s.name == root_name) for s in spans)
+            ]
+        return self.get_trace(candidates[-1]) if candidates else []
+
+
+def current_span() -> Optional[Span]:
+    """현재 실행 중인 span (없으면 None)"""
+    return _current_span.get()
+
+
+def _create_tracer() -> Tracer:
+    exporters = []
+    export_path = get_setting("TRACE_EXPORT_PATH", "")
+    if export_path:
+        exporters.append(JsonLinesExporter(export_path, int(get_setting("TRACE_QUEUE_SIZE", "10000"))))
+    if get_flag("TRACE_OTEL", False):
+        try:
+            exporters.append(OpenTelemetryExporter())
+        except ImportError:
+            logger.warning("⚠️ TRACE_OTEL을 사용하려면 opentelemetry-api가 필요합니다.")
+    return Tracer(enabled=get_flag("TRACING", True), exporters=exporters)
+
+
+tracer = _create_tracer()
+span = tracer.span
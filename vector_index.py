@@ -0,0 +1,363 @@
+"""
+📦 압축 벡터 저장소
+- Matryoshka 차원 축소 (예: 3072 → 256/512차원, 재정규화)
+- int8 양자화 (벡터별 스케일)
+- 연속 NumPy 배열 + 정확한 brute-force 코사인 검색
+- 선택적 재점수화(rescoring): 상위 후보만 원본 벡터로 다시 계산
+- NumpyVectorStore: Chroma 없이 동작하는 정확 벡터 인덱스
+  (카테고리/자치구 메타데이터 컬럼, 벡터화 MMR, .npy 저장/로드)
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 자치구 추출은 numpy 없이 쓸 수 있도록 slot_extractor에 둠 (course_prefetch 등 페이지 경로)
+from slot_extractor import extract_district
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화"""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class CompactVectorMatrix:
+    """차원 축소 / 양자화된 임베딩 행렬"""
+
+    SUPPORTED_QUANTIZATION = (None, "int8")
+
+    def __init__(self, vectors, dim: Optional[int] = None, quantize: Optional[str] = None,
+                 rescore_vectors: Optional[np.ndarray] = None):
+        """
+        vectors: (N, D) 원본 임베딩
+        dim: Matryoshka 차원 (None이면 원본 차원 유지)
+        quantize: None(float32) 또는 'int8'
+        rescore_vectors: 재점수화용 원본 벡터 (np.memmap 가능, None이면 재점수화 없음)
+        """
+        if quantize not in self.SUPPORTED_QUANTIZATION:
+            raise ValueError(f"지원하지 않는 양자화 방식입니다: {quantize}")
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2:
+            raise ValueError("vectors는 (N, D) 형태여야 합니다.")
+
+        self.full_dim = vectors.shape[1]
+        self.dim = min(dim or self.full_dim, self.full_dim)
+        self.quantize = quantize
+        self.rescore_vectors = rescore_vectors
+
+        truncated = normalize_rows(vectors[:, :self.dim])
+
+        if quantize == "int8":
+            scales = np.abs(truncated).max(axis=1) / 127.0
+            scales = np.maximum(scales, 1e-12).astype(np.float32)
+            self.data = np.ascontiguousarray(np.round(truncated / scales[:, None]).astype(np.int8))
+            self.scales = scales
+        else:
+            self.data = np.ascontiguousarray(truncated, dtype=np.float32)
+            self.scales = None
+
+    @classmethod
+    def from_parts(cls, data: np.ndarray, scales: Optional[np.ndarray], full_dim: int,
+                   quantize: Optional[str] = None,
+                   rescore_vectors: Optional[np.ndarray] = None) -> "CompactVectorMatrix":
+        """이미 압축된 배열로 행렬 구성 (로드 / 증분 갱신용)"""
+        matrix = cls.__new__(cls)
+        matrix.full_dim = full_dim
+        matrix.dim = data.shape[1]
+        matrix.quantize = quantize
+        matrix.rescore_vectors = rescore_vectors
+        matrix.data = np.ascontiguousarray(data)
+        matrix.scales = scales
+        return matrix
+
+    def take(self, indices) -> "CompactVectorMatrix":
+        """일부 행만 선택한 새 행렬"""
+        scales = self.scales[indices] if self.scales is not None else None
+        rescore_vectors = None
+        if self.rescore_vectors is not None:
+            rescore_vectors = np.asarray(self.rescore_vectors[indices], dtype=np.float32)
+        return self.from_parts(self.data[indices], scales, self.full_dim, self.quantize, rescore_vectors)
+
+    def concat(self, other: "CompactVectorMatrix") -> "CompactVectorMatrix":
+        """같은 설정의 두 행렬을 이어붙인 새 행렬 (재점수화 벡터는 양쪽에 모두 있을 때만 유지)"""
+        scales = None
+        if self.scales is not None:
+            scales = np.concatenate([self.scales, other.scales])
+        rescore_vectors = None
+        if self.rescore_vectors is not None and other.rescore_vectors is not None:
+            rescore_vectors = np.concatenate([np.asarray(self.rescore_vectors, dtype=np.float32),
+                                              np.asarray(other.rescore_vectors, dtype=np.float32)])
+        return self.from_parts(np.concatenate([self.data, other.data]), scales,
+                               self.full_dim, self.quantize, rescore_vectors)
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """상주 메모리 크기 (재점수화 벡터 제외)"""
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def encode_query(self, query_vector) -> np.ndarray:
+        """쿼리 벡터를 저장 차원으로 축소 + 정규화"""
+        query = np.asarray(query_vector, dtype=np.float32)[:self.dim]
+        return normalize_rows(query)
+
+    def vectors(self, indices=None) -> np.ndarray:
+        """저장된 벡터 복원 (float32, 정규화 근사값)"""
+        data = self.data if indices is None else self.data[indices]
+        if self.scales is None:
+            return data
+        scales = self.scales if indices is None else self.scales[indices]
+        return data.astype(np.float32) * scales[:, None]
+
+    def candidate_vectors(self, indices) -> np.ndarray:
+        """후보 벡터 (재점수화 벡터가 있으면 정규화한 원본, 없으면 복원한 압축 벡터)"""
+        if self.rescore_vectors is None:
+            return self.vectors(indices)
+        return normalize_rows(np.asarray(self.rescore_vectors[indices], dtype=np.float32))
+
+    def scores(self, query_vector) -> np.ndarray:
+        """전체 문서에 대한 코사인 유사도 (근사)"""
+        query = self.encode_query(query_vector)
+        if self.scales is None:
+            return self.data @ query
+        return (self.data @ query) * self.scales
+
+    def search(self, query_vector, k: int = 10, mask: Optional[np.ndarray] = None,
+               rescore: bool = True, rescore_factor: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        정확한 brute-force 코사인 검색 → (indices, scores)
+        mask: 검색 대상 불리언 마스크 (카테고리 필터 등)
+        rescore: rescore_vectors가 있으면 상위 k * rescore_factor개를 원본 벡터로 재계산
+        """
+        scores = self.scores(query_vector)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        n_valid = int(np.isfinite(scores).sum())
+        use_rescore = rescore and self.rescore_vectors is not None
+        n_candidates = min(k * rescore_factor if use_rescore else k, n_valid)
+        if n_candidates <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+
+        if use_rescore:
+            full_query = normalize_rows(np.asarray(query_vector, dtype=np.float32))
+            full = normalize_rows(np.asarray(self.rescore_vectors[candidates], dtype=np.float32))
+            candidate_scores = full @ full_query
+        else:
+            candidate_scores = scores[candidates]
+
+        order = np.argsort(-candidate_scores)[:k]
+        return candidates[order], candidate_scores[order]
+
+
+def document_id(doc) -> str:
+    """문서 식별자 (카테고리:제목)"""
+    return f"{doc.metadata.get('category', '')}:{doc.metadata.get('title', '')}"
+
+
+def mmr_select(query_scores: np.ndarray, candidate_vectors: np.ndarray,
+               k: int, lambda_mult: float = 0.5) -> List[int]:
+    """벡터화된 MMR: 후보 간 유사도 행렬을 한 번만 계산하고 최대 유사도를 갱신"""
+    n = len(query_scores)
+    if n == 0 or k <= 0:
+        return []
+
+    pairwise = candidate_vectors @ candidate_vectors.T
+    max_sim = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    selected = []
+
+    for _ in range(min(k, n)):
+        redundancy = np.where(np.isfinite(max_sim), max_sim, 0.0)
+        mmr_scores = lambda_mult * query_scores - (1 - lambda_mult) * redundancy
+        mmr_scores = np.where(available, mmr_scores, -np.inf)
+        best = int(np.argmax(mmr_scores))
+        selected.append(best)
+        available[best] = False
+        max_sim = np.maximum(max_sim, pairwise[:, best])
+
+    return selected
+
+
+class NumpyVectorStore:
+    """Chroma 대체용 경량 정확 벡터 인덱스 (메타데이터 컬럼 + MMR + .npy 저장)"""
+
+    def __init__(self, embedding, documents: Sequence, matrix: CompactVectorMatrix,
+                 fingerprint: str = ''):
+        self.embedding = embedding
+        self.documents = list(documents)
+        self.matrix = matrix
+        self.fingerprint = fingerprint
+        self.ids = [document_id(d) for d in self.documents]
+
+        # 메타데이터 컬럼 (필터용)
+        self.columns = {
+            'category': np.array([d.metadata.get('category', '') for d in self.documents]),
+            'district': np.array([extract_district(d.metadata.get('address', '')) for d in self.documents]),
+        }
+
+    @staticmethod
+    def documents_fingerprint(documents: Sequence, model_name: str = '') -> str:
+        """문서 + 임베딩 모델 기준 지문 (저장된 인덱스 재사용 여부 판단, 문서 순서와 무관)"""
+        digest = hashlib.sha256(model_name.encode('utf-8'))
+        for doc in sorted(documents, key=lambda d: (document_id(d), d.page_content)):
+            digest.update(doc.metadata.get('title', '').encode('utf-8'))
+            digest.update(doc.page_content.encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def from_documents(cls, documents: Sequence, embedding, dim: Optional[int] = None,
+                       quantize: Optional[str] = None, fingerprint: str = '',
+                       rescore: bool = False) -> "NumpyVectorStore":
+        """
+        문서 임베딩 → 인덱스 생성
+        rescore: 원본 벡터를 함께 보관해 상위 후보를 다시 계산 (차원 축소 / 양자화 정확도 보정)
+        """
+        vectors = np.asarray(embedding.embed_documents([doc.page_content for doc in documents]), dtype=np.float32)
+        matrix = CompactVectorMatrix(vectors, dim=dim, quantize=quantize,
+                                     rescore_vectors=vectors if rescore else None)
+        return cls(embedding, documents, matrix, fingerprint=fingerprint)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def with_changes(self, upserts: Sequence = (), delete_ids: Sequence[str] = (),
+                     fingerprint: str = '') -> "NumpyVectorStore":
+        """
+        변경분만 반영한 새 인덱스 반환 (기존 인덱스는 그대로 → 진행 중인 검색에 영향 없음)
+        upserts: 추가/수정할 문서 (변경된 문서만 임베딩)
+        delete_ids: 삭제할 문서 id
+        fingerprint: 바뀐 문서 집합의 지문 (documents_fingerprint, 저장 후 다시 로드할 때 검증용)
+        """
+        upserts = list(upserts)
+        replaced = set(delete_ids) | {document_id(d) for d in upserts}
+        keep = [i for i, doc_id in enumerate(self.ids) if doc_id not in replaced]
+
+        matrix = self.matrix.take(keep)
+        documents = [self.documents[i] for i in keep]
+        if upserts:
+            vectors = np.asarray(self.embedding.embed_documents([doc.page_content for doc in upserts]),
+                                 dtype=np.float32)
+            added = CompactVectorMatrix(vectors, dim=self.matrix.dim, quantize=self.matrix.quantize,
+                                        rescore_vectors=vectors if self.matrix.rescore_vectors is not None else None)
+            matrix = matrix.concat(added)
+            documents.extend(upserts)
+
+        return NumpyVectorStore(self.embedding, documents, matrix, fingerprint=fingerprint)
+
+    def _mask(self, filter: Optional[Dict]) -> Optional[np.ndarray]:
+        """{'category': '카페', 'district': '종로구'} 형태의 동등 필터 → 불리언 마스크"""
+        if not filter:
+            return None
+        mask = np.ones(len(self.documents), dtype=bool)
+        for key, value in filter.items():
+            if key in self.columns:
+                mask &= self.columns[key] == value
+            else:
+                mask &= np.array([d.metadata.get(key) == value for d in self.documents])
+        return mask
+
+    def similarity_search(self, query: str, k: int = 4, filter: Optional[Dict] = None) -> List:
+        """코사인 유사도 상위 k개 문서"""
+        indices, _ = self.matrix.search(self.embedding.embed_query(query), k=k, mask=self._mask(filter))
+        return [self.documents[i] for i in indices]
+
+    def max_marginal_relevance_search(self, query: str, k: int = 4, fetch_k: int = 20,
+                                      lambda_mult: float = 0.5, filter: Optional[Dict] = None) -> List:
+        """MMR 검색 (상위 fetch_k개 후보 중 다양성 고려 k개 선택, 재점수화 벡터가 있으면 원본 벡터 기준)"""
+        query_vector = self.embedding.embed_query(query)
+        indices, scores = self.matrix.search(query_vector, k=fetch_k, mask=self._mask(filter))
+        selected = mmr_select(scores, self.matrix.candidate_vectors(indices), k, lambda_mult)
+        return [self.documents[indices[i]] for i in selected]
+
+    def as_retriever(self, search_type: str = "similarity", search_kwargs: Optional[Dict] = None):
+        """Chroma.as_retriever와 동일한 사용법의 retriever"""
+        return _NumpyRetriever(self, search_type, search_kwargs or {})
+
+    def save(self, directory: str) -> None:
+        """인덱스를 .npy + 메타데이터 JSON으로 저장"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'vectors.npy'), self.matrix.data)
+        scales_path = os.path.join(directory, 'scales.npy')
+        if self.matrix.scales is not None:
+            np.save(scales_path, self.matrix.scales)
+        elif os.path.exists(scales_path):
+            # 이전 int8 인덱스의 scales가 남아 있으면 float32 인덱스에 잘못 적용되므로 삭제
+            os.remove(scales_path)
+        full_path = os.path.join(directory, 'full_vectors.npy')
+        if self.matrix.rescore_vectors is not None:
+            # 재점수화 벡터는 로드 시 memmap으로 열림 → 기존 매핑이 깨지지 않도록 새 파일로 교체
+            with open(f"{full_path}.tmp", 'wb') as f:
+                np.save(f, np.asarray(self.matrix.rescore_vectors, dtype=np.float32))
+            os.replace(f"{full_path}.tmp", full_path)
+        elif os.path.exists(full_path):
+            os.remove(full_path)
+
+        meta = {
+            'fingerprint': self.fingerprint,
+            'full_dim': self.matrix.full_dim,
+            'dim': self.matrix.dim,
+            'quantize': self.matrix.quantize,
+            'rescore': self.matrix.rescore_vectors is not None,
+            'documents': [{'page_content': d.page_content, 'metadata': d.metadata} for d in self.documents],
+        }
+        with open(os.path.join(directory, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str, embedding) -> "NumpyVectorStore":
+        """저장된 인덱스 로드 (임베딩 재계산 없음, 재점수화 벡터는 memmap)"""
+        from langchain_core.documents import Document
+
+        with open(os.path.join(directory, 'index.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        # scales는 메타데이터상 양자화된 인덱스일 때만 사용 (남아 있는 파일 여부로 판단하지 않음)
+        scales = None
+        if meta['quantize'] is not None:
+            scales_path = os.path.join(directory, 'scales.npy')
+            if not os.path.exists(scales_path):
+                raise ValueError(f"양자화 인덱스({meta['quantize']})의 scales.npy가 없습니다: {directory}")
+            scales = np.load(scales_path)
+        # 원본 벡터는 상주시키지 않고 memmap (재점수화할 후보 행만 읽음)
+        rescore_vectors = None
+        if meta.get('rescore'):
+            rescore_vectors = np.load(os.path.join(directory, 'full_vectors.npy'), mmap_mode='r')
+        matrix = CompactVectorMatrix.from_parts(
+            np.load(os.path.join(directory, 'vectors.npy')), scales,
+            meta['full_dim'], meta['quantize'], rescore_vectors
+        )
+
+        documents = [Document(page_content=d['page_content'], metadata=d['metadata'])
+                     for d in meta['documents']]
+        return cls(embedding, documents, matrix, fingerprint=meta.get('fingerprint', ''))
+
+
+class _NumpyRetriever:
+    """NumpyVectorStore용 retriever (invoke 인터페이스)"""
+
+    def __init__(self, store: NumpyVectorStore, search_type: str, search_kwargs: Dict):
+        self.store = store
+        self.search_type = search_type
+        self.search_kwargs = search_kwargs
+
+    def invoke(self, query: str) -> List:
+        kwargs = dict(self.search_kwargs)
+        if self.search_type == "mmr":
+            return self.store.max_marginal_relevance_search(
+                query,
+                k=kwargs.get("k", 4),
+                fetch_k=kwargs.get("fetch_k", 20),
+                lambda_mult=kwargs.get("lambda_mult", 0.5),
+                filter=kwargs.get("filter")
+            )
+        return self.store.similarity_search(query, k=kwargs.get("k", 4), filter=kwargs.get("filter"))
@@ -0,0 +1,226 @@
+"""
+🎤 음성 서비스 유틸리티
+- 메모리 내 STT (임시 파일 없이 BytesIO 업로드, 세션 간 파일 충돌 없음)
+- 스트리밍 STT (인식된 텍스트를 조각 단위로 전달)
+- TTS 캐시 (model, voice, text 기준 content-addressed, 메모리 + 디스크)
+- 스트리밍 TTS + 백그라운드 합성 (응답 텍스트가 정해지는 즉시 시작)
+"""
+
+import hashlib
+import io
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from config import get_setting
+from rate_limit import get_limiter, rate_limited
+
+STT_MODEL = "whisper-1"
+STREAMING_STT_MODEL = "gpt-4o-mini-transcribe"
+TTS_MODEL = "gpt-4o-mini-tts"
+TTS_VOICE = "nova"
+
+# ==================== 고정 안내 문구 ====================
+GREETING_MESSAGE = "안녕하세요! 예술, 전통, 산책, 체험 중 어떤 테마를 원하시나요?"
+QUESTION_MAP = {
+    "travel_type": "예술, 전통, 산책, 체험 중 어떤 테마를 원하시나요?",
+    "companion": "혹시 유모차/휠체어 사용 여부 등 동행인의 이동 특성을 알려주실 수 있을까요?",
+    "region": "서울의 어느 구로 방문하고 싶으신가요?"
+}
+COMPLETION_MESSAGE = "네, 알겠습니다. 추천 코스를 안내해드리겠습니다."
+
+TTS_CHUNK_SIZE = 4096
+
+# 백그라운드 TTS 합성용 공용 스레드 풀
+_tts_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="voice-tts")
+
+# 미리 합성해 둘 문구 (중복 제거)
+STATIC_PROMPTS = list(dict.fromkeys([GREETING_MESSAGE, *QUESTION_MAP.values(), COMPLETION_MESSAGE]))
+
+
+def audio_fingerprint(audio_bytes: bytes) -> str:
+    """녹음 식별용 해시 (같은 녹음을 rerun마다 다시 인식하지 않도록)"""
+    return hashlib.sha256(audio_bytes).hexdigest()
+
+
+def _audio_file(audio_bytes: bytes, filename: str, content_type: str):
+    """OpenAI 업로드용 (파일명, 파일 객체, content type) 튜플"""
+    return (filename, io.BytesIO(audio_bytes), content_type)
+
+
+def transcribe_audio(client, audio_bytes: bytes, filename: str = "recording.wav",
+                     content_type: str = "audio/wav", language: str = "ko") -> str:
+    """메모리의 오디오를 한 번에 인식"""
+    resp = rate_limited(
+        STT_MODEL,
+        client.audio.transcriptions.create,
+        model=STT_MODEL,
+        file=_audio_file(audio_bytes, filename, content_type),
+        language=language,
+        response_format="json"
+    )
+    return resp.text
+
+
+def stream_transcription(client, audio_bytes: bytes, filename: str = "recording.wav",
+                         content_type: str = "audio/wav", language: str = "ko",
+                         model: Optional[str] = None) -> Iterator[str]:
+    """스트리밍 인식: 텍스트 조각(delta)을 도착하는 대로 반환"""
+    model = model or STREAMING_STT_MODEL
+    # 스트림 시작 요청만 제한 / 재시도 (조각 수신은 제한 밖)
+    stream = rate_limited(
+        model,
+        client.audio.transcriptions.create,
+        model=model,
+        file=_audio_file(audio_bytes, filename, content_type),
+        language=language,
+        response_format="text",
+        stream=True
+    )
+    for event in stream:
+        if getattr(event, "type", "") == "transcript.text.delta":
+            yield event.delta
+
+
+class TTSCache:
+    """TTS 결과 캐시 (메모리 LRU + 디스크, 키: model/voice/text 해시)"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_items: int = 64):
+        self.cache_dir = cache_dir if cache_dir is not None else get_setting("TTS_CACHE_DIR", ".cache/tts")
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(model: str, voice: str, text: str) -> str:
+        """content-addressed 키"""
+        return hashlib.sha256(f"{model}\x00{voice}\x00{text.strip()}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Optional[str]:
+        return os.path.join(self.cache_dir, f"{key}.mp3") if self.cache_dir else None
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        with self._lock:
+            self._memory[key] = audio
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, text: str, model: str = TTS_MODEL, voice: str = TTS_VOICE) -> Optional[bytes]:
+        """캐시 조회 (메모리 → 디스크)"""
+        key = self.cache_key(model, voice, text)
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                return audio
+
+        path = self._path(key)
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                audio = f.read()
+            self._remember(key, audio)
+            return audio
+        return None
+
+    def put(self, text: str, audio: bytes, model: str = TTS_MODEL, voice: str = TTS_VOICE) -> None:
+        """캐시 저장 (디스크는 임시 파일 → rename으로 원자적 기록)"""
+        key = self.cache_key(model, voice, text)
+        self._remember(key, audio)
+
+        path = self._path(key)
+        if path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+
+    def synthesize_stream(self, client, text: str, model: str = TTS_MODEL,
+                          voice: str = TTS_VOICE) -> Iterator[bytes]:
+        """스트리밍 합성: 오디오 청크를 받는 대로 반환하고, 끝나면 캐시에 저장"""
+        audio = self.get(text, model, voice)
+        if audio is not None:
+            self.hits += 1
+            yield audio
+            return
+
+        self.misses += 1
+        chunks = []
+        with get_limiter(model).slot(), client.audio.speech.with_streaming_response.create(
+            model=model, voice=voice, input=text, response_format="mp3"
+        ) as response:
+            for chunk in response.iter_bytes(TTS_CHUNK_SIZE):
+                chunks.append(chunk)
+                yield chunk
+        self.put(text, b"".join(chunks), model, voice)
+
+    def synthesize(self, client, text: str, model: str = TTS_MODEL, voice: str = TTS_VOICE) -> bytes:
+        """캐시에 있으면 바로 반환, 없으면 TTS API 호출 후 저장"""
+        return b"".join(self.synthesize_stream(client, text, model, voice))
+
+    def submit(self, client, text: str, model: str = TTS_MODEL, voice: str = TTS_VOICE) -> Future:
+        """백그라운드 합성 시작 → Future[bytes]"""
+        return _tts_executor.submit(self.synthesize, client, text, model, voice)
+
+    def prewarm(self, client, texts: Iterable[str] = STATIC_PROMPTS,
+                model: str = TTS_MODEL, voice: str = TTS_VOICE) -> int:
+        """고정 문구 미리 합성 → 새로 합성한 개수"""
+        created = 0
+        for text in texts:
+            if self.get(text, model, voice) is None:
+                self.synthesize(client, text, model, voice)
+                created += 1
+        return created
+
+
+_client = None
+_tts_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_openai_client(api_key: Optional[str] = None):
+    """프로세스 공용 OpenAI 클라이언트 (openai 패키지는 처음 필요할 때 임포트, 키가 없으면 None)"""
+    global _client
+    if _client is None:
+        api_key = api_key or get_setting("OPENAI_API_KEY")
+        if not api_key:
+            return None
+        with _shared_lock:
+            if _client is None:
+                from openai import OpenAI
+
+                # 재시도는 rate_limit 계층에서
+                _client = OpenAI(api_key=api_key, max_retries=0)
+    return _client
+
+
+def get_tts_cache() -> TTSCache:
+    """프로세스 공용 TTS 캐시"""
+    global _tts_cache
+    if _tts_cache is None:
+        with _shared_lock:
+            if _tts_cache is None:
+                _tts_cache = TTSCache()
+    return _tts_cache
+
+
+if __name__ == "__main__":
+    # 고정 안내 문구 TTS 미리 합성: python voice_service.py prewarm
+    if len(sys.argv) < 2 or sys.argv[1] != "prewarm":
+        print("사용법: python voice_service.py prewarm")
+        sys.exit(1)
+
+    client = get_openai_client()
+    if client is None:
+        print("⚠️ OPENAI_API_KEY가 설정되지 않았습니다.")
+        sys.exit(1)
+
+    cache = get_tts_cache()
+    created = cache.prewarm(client)
+    print(f"✅ TTS 캐시 준비 완료: {len(STATIC_PROMPTS)}개 문구 중 {created}개 새로 합성 ({cache.cache_dir})")
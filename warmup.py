@@ -0,0 +1,327 @@
+"""
+🔥 배포 직후 워밍업 + 준비 상태(readiness)
+- 엔진 생성 (데이터 로드 + 임베딩 + 벡터스토어)
+- 동행 × 테마별 후보 검색 (쿼리 임베딩 + 후보 캐시)
+- 자주 요청된 조건의 추천 코스 생성 (LLM 캐시, gpt-5.1 호출 → WARMUP_COURSES=N일 때만)
+- 생성된 코스의 도보 경로 (routes 공용 캐시)
+- OpenAI 클라이언트 + 고정 안내 문구 TTS (voice_service 공용 캐시, 유료 호출 → WARMUP_TTS=1일 때만)
+- 필수 단계(WARMUP_REQUIRED)가 모두 끝나야 ready → 롤링 배포 시 차가운 워커에 트래픽이 가지 않도록
+
+실행: python warmup.py          (이 프로세스에서 워밍업 후 결과 출력, 준비 실패 시 종료 코드 1)
+      엔진 서비스: python engine_service.py → 시작 시 워밍업, GET /ready (준비 전 503)
+      Streamlit: WARMUP=1이면 app.py가 첫 실행 시 백그라운드 워밍업, READINESS_PORT가 있으면 GET /ready 제공
+설정: WARMUP / WARMUP_REQUIRED / WARMUP_COURSES / WARMUP_TTS / WARMUP_CONDITIONS / WARMUP_TIMEOUT
+      READINESS_PORT / READINESS_HOST (기본 127.0.0.1)
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from app_logging import get_logger
+from config import get_flag, get_setting
+from engine_provider import get_recommender
+from tracing import span
+
+logger = get_logger("warmup")
+
+# 1_companion.py / 2_travel.py 선택지
+COMPANIONS = ["휠체어 사용자", "영유아", "고령자"]
+THEMES = ["예술", "전통", "자연", "체험"]
+CATEGORIES = ["관광지", "카페", "음식점"]
+
+STEPS = ["engine", "candidates", "courses", "routes", "tts"]
+PENDING, RUNNING, DONE, FAILED, SKIPPED = "pending", "running", "done", "failed", "skipped"
+
+
+class WarmupState:
+    """워밍업 단계별 진행 상태 (스레드 안전)"""
+
+    def __init__(self):
+        self.steps = {name: {'status': PENDING} for name in STEPS}
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def update(self, name: str, status: str, **details) -> None:
+        with self._lock:
+            self.steps[name] = {'status': status, **details}
+
+    def required(self) -> List[str]:
+        return [name.strip() for name in get_setting("WARMUP_REQUIRED", "engine,candidates").split(",") if name.strip()]
+
+    def is_ready(self) -> bool:
+        """필수 단계가 모두 성공 / 생략되고 워밍업이 끝났는지"""
+        with self._lock:
+            if self.finished_at is None:
+                return False
+            return all(self.steps.get(name, {}).get('status') in (DONE, SKIPPED) for name in self.required())
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            steps = {name: dict(step) for name, step in self.steps.items()}
+            started_at, finished_at = self.started_at, self.finished_at
+        elapsed = None
+        if started_at is not None:
+            elapsed = round((finished_at or time.time()) - started_at, 2)
+        return {'ready': self.is_ready(), 'elapsed_s': elapsed, 'steps': steps}
+
+
+_state = WarmupState()
+_thread = None
+_thread_lock = threading.Lock()
+_server = None
+_server_lock = threading.Lock()
+
+
+def _run_step(name: str, fn: Callable[[], Dict]) -> Optional[Dict]:
+    """단계 1개 실행 (fn이 None을 반환하면 생략으로 기록)"""
+    _state.update(name, RUNNING)
+    started = time.perf_counter()
+    try:
+        with span(f"warmup.{name}"):
+            details = fn()
+    except Exception as e:
+        _state.update(name, FAILED, error=f"{e.__class__.__name__}: {e}",
+                      seconds=round(time.perf_counter() - started, 2))
+        logger.warning("⚠️ 워밍업 %s 실패: %s", name, e)
+        return None
+    if details is None:
+        _state.update(name, SKIPPED)
+        return None
+    _state.update(name, DONE, seconds=round(time.perf_counter() - started, 2), **details)
+    logger.info("🔥 워밍업 %s 완료: %s", name, details)
+    return details
+
+
+def warmup_conditions(engine, n: int) -> List[Dict]:
+    """
+    미리 생성할 조건 n개
+    WARMUP_CONDITIONS("동행/테마/지역;...") → 요청이 많았던 조건 → 동행 × 테마 × 장소가 많은 지역 순
+    """
+    from course_jobs import get_course_jobs
+    from course_prefetch import likely_regions
+
+    conditions = []
+    configured = get_setting("WARMUP_CONDITIONS", "")
+    for item in configured.split(";"):
+        parts = [part.strip() for part in item.split("/")]
+        if len(parts) == 3 and all(parts):
+            conditions.append({'companion': parts[0], 'travel_type': parts[1], 'region': parts[2]})
+
+    store = get_course_jobs().store
+    if store is not None and len(conditions) < n:
+        conditions.extend(store.popular_conditions(n))
+
+    if len(conditions) < n:
+        regions = likely_regions(engine, 1)
+        if regions:
+            conditions.extend({'companion': companion, 'travel_type': theme, 'region': regions[0]}
+                              for theme in THEMES for companion in COMPANIONS)
+
+    unique = {}
+    for condition in conditions:
+        unique.setdefault((condition['companion'], condition['travel_type'], condition['region']), condition)
+    return list(unique.values())[:n]
+
+
+def _warm_courses(engine, timeout: float, courses: List[Dict]) -> Optional[Dict]:
+    """조건별 코스 생성 작업 등록 후 완료 대기 (완성된 코스는 courses에 추가)"""
+    from course_jobs import DONE as JOB_DONE, FINISHED, get_course_jobs
+
+    n = int(get_setting("WARMUP_COURSES", "0"))
+    if n <= 0:
+        return None
+    jobs = get_course_jobs()
+    job_ids = [jobs.submit(c['companion'], c['travel_type'], c['region'], record=False)
+               for c in warmup_conditions(engine, n)]
+
+    deadline = time.monotonic() + timeout
+    done = 0
+    for job_id in job_ids:
+        while True:
+            job = jobs.get(job_id)
+            if job is None or job['status'] in FINISHED or time.monotonic() > deadline:
+                break
+            time.sleep(0.2)
+        if job is not None and job['status'] == JOB_DONE:
+            done += 1
+            courses.extend(job['courses'])
+    if job_ids and done == 0:
+        raise RuntimeError(f"코스 미리 생성 실패 (작업 {len(job_ids)}개)")
+    return {'conditions': len(job_ids), 'done': done}
+
+
+def _warm_routes(courses: List[Dict]) -> Optional[Dict]:
+    from routes import course_coordinates, ors_api_key, walking_route
+
+    if not ors_api_key() or not courses:
+        return None
+    routes = failed = 0
+    for course in courses:
+        coordinates = course_coordinates(course)
+        if len(set(map(tuple, coordinates))) < 2:
+            continue
+        try:
+            walking_route(coordinates, page="warmup")
+            routes += 1
+        except Exception as e:
+            failed += 1
+            logger.warning("⚠️ 워밍업 경로 계산 실패: %s: %s", e.__class__.__name__, e)
+    return {'routes': routes, 'failed': failed}
+
+
+def _warm_tts() -> Optional[Dict]:
+    from voice_service import STATIC_PROMPTS, get_openai_client, get_tts_cache
+
+    if not get_flag("WARMUP_TTS", False):
+        return None
+    client = get_openai_client()
+    if client is None:
+        return None
+    created = get_tts_cache().prewarm(client)
+    return {'prompts': len(STATIC_PROMPTS), 'created': created}
+
+
+def _wait_for_service(remote, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        report = remote.readiness()
+        if report is not None and report.get('ready'):
+            return
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"엔진 서비스 준비 대기 시간 초과 ({timeout:.0f}초): {report}")
+        time.sleep(1.0)
+
+
+def run_warmup(engine_getter: Callable = get_recommender) -> Dict:
+    """워밍업 전체 실행 (호출한 스레드에서) → 준비 상태"""
+    _state.started_at = time.time()
+    _state.finished_at = None
+    timeout = float(get_setting("WARMUP_TIMEOUT", "300"))
+    with span("warmup"):
+        engine = None
+
+        def build_engine():
+            nonlocal engine
+            candidate = engine_getter()
+            if hasattr(candidate, 'readiness'):
+                # 엔진 서비스 클라이언트: 서비스 쪽 워밍업이 끝날 때까지 대기
+                _wait_for_service(candidate, timeout)
+                places = candidate.health()['places']
+            else:
+                places = sum(len(p) for p in (candidate.integrated_data or {}).values())
+            engine = candidate
+            return {'places': places}
+
+        _run_step("engine", build_engine)
+        if engine is None:
+            for name in STEPS[1:]:
+                _state.update(name, SKIPPED)
+        else:
+            def warm_candidates():
+                for companion in COMPANIONS:
+                    for theme in THEMES:
+                        for category in CATEGORIES:
+                            engine.retrieve_candidates(companion, theme, category)
+                return {'combinations': len(COMPANIONS) * len(THEMES) * len(CATEGORIES)}
+
+            courses = []
+            _run_step("candidates", warm_candidates)
+            _run_step("courses", lambda: _warm_courses(engine, timeout, courses))
+            _run_step("routes", lambda: _warm_routes(courses))
+            _run_step("tts", _warm_tts)
+    _state.finished_at = time.time()
+    report = readiness()
+    logger.info("🔥 워밍업 종료: %s (%s초)", '준비 완료' if report['ready'] else '준비 실패', report['elapsed_s'])
+    return report
+
+
+def start_warmup(engine_getter: Callable = get_recommender) -> bool:
+    """백그라운드 워밍업 시작 (프로세스당 1회) → 새로 시작했는지"""
+    global _thread
+    with _thread_lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(target=run_warmup, args=(engine_getter,), name="warmup", daemon=True)
+        _thread.start()
+    port = int(get_setting("READINESS_PORT", "0"))
+    if port:
+        serve_readiness(get_setting("READINESS_HOST", "127.0.0.1"), port)
+    return True
+
+
+def is_ready() -> bool:
+    return _state.is_ready()
+
+
+def readiness() -> Dict:
+    """{ready, elapsed_s, steps: {이름: {status, seconds, ...}}}"""
+    return _state.snapshot()
+
+
+class ReadinessHandler(BaseHTTPRequestHandler):
+    """GET /ready (준비 전 503) · GET /live"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/ready":
+            report = readiness()
+            self._send_json(report, 200 if report['ready'] else 503)
+        elif self.path == "/live":
+            self._send_json({'live': True})
+        else:
+            self._send_json({'error': f"unknown path: {self.path}"}, 404)
+
+    def _send_json(self, payload, status: int = 200) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_readiness(host: str = "127.0.0.1", port: int = 8766) -> Optional[ThreadingHTTPServer]:
+    """
+    준비 상태 엔드포인트를 백그라운드 스레드로 제공 (프로세스당 1개, 포트 사용 중이면 None)
+    기본은 로컬에서만 접근 가능, 외부 헬스 체크가 필요하면 READINESS_HOST=0.0.0.0
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), ReadinessHandler)
+        except OSError as e:
+            logger.warning("⚠️ 준비 상태 엔드포인트 시작 실패 (%s:%d): %s", host, port, e)
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="readiness", daemon=True).start()
+    logger.info("🔥 준비 상태 엔드포인트: http://%s:%d/ready", host, port)
+    return _server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배포 직후 워밍업")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    report = run_warmup()
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for name, step in report['steps'].items():
+            details = ", ".join(f"{k}={v}" for k, v in step.items() if k != 'status')
+            print(f"  {name:<11} {step['status']:<8} {details}")
+    sys.exit(0 if report['ready'] else 1)
+
+
+if __name__ == "__main__":
+    main()